@@ -0,0 +1,424 @@
+"""
+Price-drop alerts for PricePulse
+
+Users register a threshold on a product ("tell me when it drops to ₹50,000
+or below"). Thresholds are indexed per product key in a list sorted by
+price, and the engine remembers the last price seen for every alerted
+product on every platform. When a new price p arrives after a last price q, the alerts
+it crosses are exactly the thresholds in [p, q), found with two bisections,
+so evaluating a price costs O(log n + k) however many alerts exist. An alert
+added at or above a platform's last price has no crossing left to wait for;
+it is checked against that platform's next price instead.
+
+An alert that fired is held back for COOLDOWN seconds, so a price bouncing
+around its threshold does not notify again and again. The alerts table is
+the source of truth for every worker process: ids come from SQLite, and
+every add and removal appends the alert's id to a change log. Every
+SYNC_INTERVAL seconds each process applies only the changes logged since its
+last sync, so keeping up with other workers costs nothing while nobody
+changes anything. An alert fires only in the process whose update of its
+last_fired time wins, so it notifies once however many workers saw the
+price. Listing alerts pages through the table by id. Fired alerts are
+handed to a delivery thread that passes them to every sink (the log, a
+webhook, ...), so a slow receiver never holds up the history writer that
+feeds the engine.
+"""
+
+import bisect
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from history import HISTORY_DB, price_history, product_key
+
+logger = logging.getLogger('pricepulse.alerts')
+
+# SQLite file holding the alerts (the price history database by default)
+ALERTS_DB = os.environ.get('PRICEPULSE_ALERTS_DB', HISTORY_DB)
+
+# Seconds an alert stays quiet after firing
+COOLDOWN = float(os.environ.get('PRICEPULSE_ALERT_COOLDOWN', '3600'))
+
+# Seconds between reads of the change log for alerts other worker processes added or removed
+SYNC_INTERVAL = float(os.environ.get('PRICEPULSE_ALERT_SYNC', '5'))
+
+# Seconds changes stay in the log; a process that falls further behind reloads the whole table
+CHANGE_RETENTION = 86400
+
+# Alerts returned per page by alerts(), and the most a caller may ask for
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Comma-separated URLs that receive fired alerts as JSON POSTs
+WEBHOOK_URLS = [url.strip() for url in os.environ.get('PRICEPULSE_ALERT_WEBHOOK', '').split(',') if url.strip()]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS alerts (
+    id INTEGER PRIMARY KEY,
+    product TEXT NOT NULL,
+    product_key TEXT NOT NULL,
+    below_paise INTEGER NOT NULL,
+    owner TEXT,
+    created REAL NOT NULL,
+    last_fired REAL
+);
+CREATE INDEX IF NOT EXISTS idx_alerts_product ON alerts (product_key, id);
+CREATE TABLE IF NOT EXISTS alert_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    alert_id INTEGER NOT NULL,
+    ts REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_alert_changes_ts ON alert_changes (ts);
+"""
+
+COLUMNS = ('id', 'product', 'product_key', 'below_paise', 'owner', 'created', 'last_fired')
+SELECT_ALERTS = f"SELECT {', '.join(COLUMNS)} FROM alerts"
+
+class LogSink:
+    """Log fired alerts at INFO on the 'pricepulse.alerts' logger"""
+
+    name = 'log'
+
+    def deliver(self, events):
+        for event in events:
+            logger.info("Price alert %s: %s is %s on %s (alert at %s)", event['alert_id'], event['name'],
+                        f"{event['price_paise'] / 100:,.2f}", event['platform'], f"{event['below_paise'] / 100:,.2f}")
+
+class MemorySink:
+    """Keep the most recent fired alerts in memory"""
+
+    name = 'memory'
+
+    def __init__(self, limit=1000):
+        self.limit = limit
+        self.events = []
+        self._lock = threading.Lock()
+
+    def deliver(self, events):
+        with self._lock:
+            self.events.extend(events)
+            del self.events[:-self.limit]
+
+class WebhookSink:
+    """POST fired alerts as {"alerts": [...]} to a URL"""
+
+    def __init__(self, url, timeout=5):
+        self.url = url
+        self.name = f'webhook:{url}'
+        self.timeout = timeout
+
+    def deliver(self, events):
+        from http_pool import get_session
+        response = get_session(self.url).post(self.url, json={"alerts": events}, timeout=self.timeout)
+        response.raise_for_status()
+
+class AlertEngine:
+    """Sorted per-product threshold index with cool-down and pluggable delivery sinks"""
+
+    def __init__(self, path=ALERTS_DB, cooldown=COOLDOWN, sinks=None, sync_interval=SYNC_INTERVAL):
+        self.path = path
+        self.cooldown = cooldown
+        self.sync_interval = sync_interval
+        self.sinks = list(sinks) if sinks is not None else [LogSink()] + [WebhookSink(url) for url in WEBHOOK_URLS]
+        self._lock = threading.Lock()
+        self._alerts = {}  # id -> alert dict
+        self._index = {}  # product key -> sorted [(below_paise, id)]
+        self._last_price = {}  # product key -> {platform: paise}
+        self._pending = {}  # (product key, platform) -> ids of alerts already below its last price
+        self._synced_at = None
+        self._synced_seq = None  # last change log entry applied; None until the first full load
+        self._deliveries = queue.Queue()
+        self._db = None
+        self._db_lock = threading.Lock()
+        self._deliverer = None
+        self.evaluated = 0
+        self.fired = 0
+        self.suppressed = 0
+        self.delivered = 0
+        self.delivery_errors = {}
+        self.sync()
+
+    def _connection(self):
+        if self._db is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.executescript(SCHEMA)
+        return self._db
+
+    def sync(self):
+        """Apply the alerts other processes added or removed since the last sync"""
+        if not os.path.exists(self.path):
+            return
+        with self._db_lock:
+            connection = self._connection()
+            first_seq, last_seq = connection.execute('SELECT MIN(seq), MAX(seq) FROM alert_changes').fetchone()
+            # Changes between runs are applied again; doing so twice is harmless
+            full = self._synced_seq is None or (first_seq is not None and first_seq > self._synced_seq + 1)
+            if full:
+                rows = connection.execute(SELECT_ALERTS).fetchall()
+                changed = None
+            else:
+                changed = {alert_id for (alert_id,) in connection.execute(
+                    'SELECT alert_id FROM alert_changes WHERE seq > ?', (self._synced_seq,)
+                )}
+                rows = self._select_ids(connection, changed)
+        with self._lock:
+            if full:
+                stored = {row[0] for row in rows}
+                for alert_id in [alert_id for alert_id in self._alerts if alert_id not in stored]:
+                    self._discard(alert_id)
+            else:
+                for alert_id in changed - {row[0] for row in rows}:
+                    self._discard(alert_id)
+            for row in rows:
+                stored = dict(zip(COLUMNS, row))
+                alert = self._alerts.get(stored["id"])
+                if alert is None:
+                    self._insert(stored)
+                elif stored["last_fired"] is not None and (
+                        alert["last_fired"] is None or stored["last_fired"] > alert["last_fired"]):
+                    alert["last_fired"] = stored["last_fired"]
+            if last_seq is not None:
+                self._synced_seq = max(self._synced_seq or 0, last_seq)
+            elif self._synced_seq is None:
+                self._synced_seq = 0
+            self._synced_at = time.monotonic()
+
+    def _sync_if_due(self):
+        if self._synced_at is None or time.monotonic() - self._synced_at >= self.sync_interval:
+            try:
+                self.sync()
+            except sqlite3.Error:
+                pass
+
+    @staticmethod
+    def _select_ids(connection, ids, chunk=500):
+        ids = sorted(ids)
+        rows = []
+        for start in range(0, len(ids), chunk):
+            part = ids[start:start + chunk]
+            rows += connection.execute(
+                f"{SELECT_ALERTS} WHERE id IN ({', '.join('?' * len(part))})", part
+            ).fetchall()
+        return rows
+
+    @staticmethod
+    def _log_change(connection, alert_id, now):
+        connection.execute('INSERT INTO alert_changes (alert_id, ts) VALUES (?, ?)', (alert_id, now))
+
+    def _insert(self, alert):
+        key = alert["product_key"]
+        self._alerts[alert["id"]] = alert
+        bisect.insort(self._index.setdefault(key, []), (alert["below_paise"], alert["id"]))
+        # [p, q) can never contain a threshold at or above the last price q
+        for platform, last in self._last_price.get(key, {}).items():
+            if last <= alert["below_paise"]:
+                self._pending.setdefault((key, platform), set()).add(alert["id"])
+
+    def _discard(self, alert_id):
+        alert = self._alerts.pop(alert_id, None)
+        if alert is None:
+            return False
+        key = alert["product_key"]
+        entries = self._index[key]
+        del entries[bisect.bisect_left(entries, (alert["below_paise"], alert_id))]
+        if not entries:
+            del self._index[key]
+        for platform in self._last_price.get(key, {}):
+            self._pending.get((key, platform), set()).discard(alert_id)
+        return True
+
+    def add(self, product, below_paise, owner=None):
+        """Alert when the product's price on any platform drops to below_paise or lower"""
+        key = product_key(product)
+        if not key or not isinstance(below_paise, int) or below_paise <= 0:
+            raise ValueError("A product name and a positive price are required")
+        alert = {
+            "product": product.strip(), "product_key": key, "below_paise": below_paise,
+            "owner": owner, "created": time.time(), "last_fired": None
+        }
+        # SQLite assigns the id, so workers sharing the table never hand out the same one
+        with self._db_lock:
+            connection = self._connection()
+            with connection:
+                alert["id"] = connection.execute(
+                    'INSERT INTO alerts (product, product_key, below_paise, owner, created) VALUES (?, ?, ?, ?, ?)',
+                    (alert["product"], key, below_paise, owner, alert["created"])
+                ).lastrowid
+                self._log_change(connection, alert["id"], alert["created"])
+                # The newest entry stays, so a process that slept through the pruning can tell
+                connection.execute(
+                    'DELETE FROM alert_changes WHERE ts < ? AND seq < (SELECT MAX(seq) FROM alert_changes)',
+                    (alert["created"] - CHANGE_RETENTION,)
+                )
+        with self._lock:
+            self._insert(alert)
+        return dict(alert)
+
+    def remove(self, alert_id):
+        """Delete an alert; returns False if there is no such alert"""
+        with self._db_lock:
+            connection = self._connection()
+            with connection:
+                deleted = connection.execute('DELETE FROM alerts WHERE id = ?', (alert_id,)).rowcount
+                if deleted:
+                    self._log_change(connection, alert_id, time.time())
+        with self._lock:
+            discarded = self._discard(alert_id)
+        return bool(deleted) or discarded
+
+    def alerts(self, product=None, after=0, limit=PAGE_SIZE):
+        """
+        One page of registered alerts in id order, optionally only those on one
+        product: up to `limit` alerts with an id above `after`. Read from the
+        table, so every worker lists the same alerts.
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        if not os.path.exists(self.path):
+            return []
+        if product is None:
+            sql, args = f"{SELECT_ALERTS} WHERE id > ? ORDER BY id LIMIT ?", (after, limit)
+        else:
+            sql = f"{SELECT_ALERTS} WHERE product_key = ? AND id > ? ORDER BY id LIMIT ?"
+            args = (product_key(product), after, limit)
+        with self._db_lock:
+            rows = self._connection().execute(sql, args).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def observe(self, rows):
+        """
+        Evaluate a batch of price history rows and queue the alerts they fire.
+
+        Rows are (product_key, platform, ts, price_paise, query, name, link) as
+        committed by the history writer. Returns the fired alert events.
+        """
+        # Only the lowest price per product and platform in a batch can cross anything new
+        lowest = {}
+        for row in rows:
+            seen = lowest.get(row[:2])
+            if seen is None or row[3] < seen[3]:
+                lowest[row[:2]] = row
+
+        self._sync_if_due()
+
+        now = time.time()
+        candidates = []
+        with self._lock:
+            for (key, platform), (_, _, ts, price, query, name, link) in lowest.items():
+                self.evaluated += 1
+                entries = self._index.get(key)
+                if not entries:
+                    # Untracked products need no last price: a first observation checks every threshold
+                    continue
+                last_prices = self._last_price.setdefault(key, {})
+                last = last_prices.get(platform)
+                last_prices[platform] = price
+                low = bisect.bisect_left(entries, (price,))
+                high = len(entries) if last is None else bisect.bisect_left(entries, (last,))
+                crossed = [alert_id for _, alert_id in entries[low:high]]
+                # Alerts added below the last price are checked once against the next one
+                crossed += [alert_id for alert_id in self._pending.pop((key, platform), ())
+                            if alert_id in self._alerts and self._alerts[alert_id]["below_paise"] >= price]
+                for alert_id in crossed:
+                    alert = self._alerts[alert_id]
+                    below = alert["below_paise"]
+                    if alert["last_fired"] is not None and now - alert["last_fired"] < self.cooldown:
+                        self.suppressed += 1
+                        continue
+                    candidates.append({
+                        "alert_id": alert_id, "product": alert["product"], "owner": alert["owner"],
+                        "below_paise": below, "price_paise": price, "platform": platform,
+                        "name": name, "link": link, "query": query, "observed_at": ts, "fired_at": now
+                    })
+
+        events = []
+        for event in candidates:
+            claimed = self._claim(event["alert_id"], now)
+            with self._lock:
+                alert = self._alerts.get(event["alert_id"])
+                if claimed and alert is not None:
+                    alert["last_fired"] = now
+                    self.fired += 1
+                    events.append(event)
+                else:
+                    self.suppressed += 1
+        if events:
+            self._deliveries.put(events)
+            self._ensure_deliverer()
+        return events
+
+    def _claim(self, alert_id, now):
+        """
+        Record that the alert fires now, unless it fired within the cool-down or
+        was removed. Another worker seeing the same price loses the update.
+        """
+        try:
+            with self._db_lock:
+                connection = self._connection()
+                with connection:
+                    return connection.execute(
+                        'UPDATE alerts SET last_fired = ? WHERE id = ? AND (last_fired IS NULL OR last_fired <= ?)',
+                        (now, alert_id, now - self.cooldown)
+                    ).rowcount == 1
+        except sqlite3.Error:
+            return False
+
+    def _ensure_deliverer(self):
+        if self._deliverer is None:
+            with self._lock:
+                if self._deliverer is None:
+                    self._deliverer = threading.Thread(target=self._deliver_loop, name='pricepulse-alerts',
+                                                       daemon=True)
+                    self._deliverer.start()
+
+    def _deliver_loop(self):
+        while True:
+            events = self._deliveries.get()
+            try:
+                for sink in self.sinks:
+                    try:
+                        sink.deliver(events)
+                    except Exception:
+                        with self._lock:
+                            name = getattr(sink, 'name', type(sink).__name__)
+                            self.delivery_errors[name] = self.delivery_errors.get(name, 0) + 1
+                with self._lock:
+                    self.delivered += len(events)
+            finally:
+                self._deliveries.task_done()
+
+    def flush(self):
+        """Block until every queued alert has been handed to the sinks"""
+        self._deliveries.join()
+
+    def stats(self):
+        self._sync_if_due()
+        with self._lock:
+            return {
+                "alerts": len(self._alerts),
+                "products": len(self._index),
+                "evaluated": self.evaluated,
+                "fired": self.fired,
+                "suppressed": self.suppressed,
+                "delivered": self.delivered,
+                "queued": self._deliveries.qsize(),
+                "delivery_errors": dict(self.delivery_errors),
+                "sinks": [getattr(sink, 'name', type(sink).__name__) for sink in self.sinks]
+            }
+
+_alert_engine = None
+_alert_engine_lock = threading.Lock()
+
+def get_alert_engine():
+    """Process-wide alert engine fed by the price history, created on first use"""
+    global _alert_engine
+    if _alert_engine is None:
+        with _alert_engine_lock:
+            if _alert_engine is None:
+                _alert_engine = AlertEngine()
+                price_history.add_listener(_alert_engine.observe)
+    return _alert_engine
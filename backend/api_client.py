@@ -6,18 +6,29 @@ This is a conceptual implementation showing how it would work if APIs were avail
 """
 
 import requests
+import threading
 import time
 from typing import List, Dict, Any
 
+from http_pool import get_session
+from prices import with_price_paise
+
 class ECommerceAPI:
     """Base class for e-commerce APIs"""
     
+    base_url = ""
+    
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+        # Per-client headers; the connection pool itself is shared per host
+        self.headers = {
             'User-Agent': 'PricePulse/1.0 (https://pricepulse.example.com)',
             'Accept': 'application/json',
-        })
+        }
+    
+    @property
+    def session(self) -> requests.Session:
+        """Process-wide pooled session for this API's host"""
+        return get_session(self.base_url)
     
     def search_products(self, query: str) -> List[Dict[str, Any]]:
         """Search for products - to be implemented by subclasses"""
@@ -56,7 +67,7 @@ class AmazonAPI(ECommerceAPI):
             }
             
             # In reality, you would need to sign this request with AWS signature v4
-            # response = self.session.get(self.base_url, params=params)
+            # response = self.session.get(self.base_url, params=params, headers=self.headers)
             # return self.parse_amazon_response(response.json())
             
             # For now, simulate API response
@@ -81,7 +92,7 @@ class FlipkartAPI(ECommerceAPI):
         # 2. API credentials from Flipkart
         self.base_url = "https://affiliate-api.flipkart.net/affiliate/1.0/"
         self.access_token = "YOUR_FLIPKART_TOKEN"  # Replace with actual token
-        self.session.headers.update({
+        self.headers.update({
             'Fk-Affiliate-Token': self.access_token,
             'Fk-Affiliate-Id': 'YOUR_AFFILIATE_ID'  # Replace with actual ID
         })
@@ -99,7 +110,7 @@ class FlipkartAPI(ECommerceAPI):
                 'resultCount': 5
             }
             
-            # response = self.session.get(search_url, params=params)
+            # response = self.session.get(search_url, params=params, headers=self.headers)
             # return self.parse_flipkart_response(response.json())
             
             # For now, simulate API response
@@ -141,6 +152,22 @@ class RelianceDigitalAPI(ECommerceAPI):
         except Exception as e:
             return [{"error": f"Reliance Digital API error: {str(e)}"}]
 
+_api_clients = None
+_api_clients_lock = threading.Lock()
+
+def get_api_clients() -> Dict[str, ECommerceAPI]:
+    """Return the API clients, created once and shared by all requests"""
+    global _api_clients
+    if _api_clients is None:
+        with _api_clients_lock:
+            if _api_clients is None:
+                _api_clients = {
+                    "Amazon": AmazonAPI(),
+                    "Flipkart": FlipkartAPI(),
+                    "Reliance Digital": RelianceDigitalAPI()
+                }
+    return _api_clients
+
 def get_price_comparison_api(query: str) -> Dict[str, List[Dict[str, Any]]]:
     """
     Get price comparison using APIs instead of web scraping
@@ -148,12 +175,7 @@ def get_price_comparison_api(query: str) -> Dict[str, List[Dict[str, Any]]]:
     if not query:
         return {"error": "Query parameter is required"}
     
-    # Initialize API clients
-    apis = {
-        "Amazon": AmazonAPI(),
-        "Flipkart": FlipkartAPI(),
-        "Reliance Digital": RelianceDigitalAPI()
-    }
+    apis = get_api_clients()
     
     results = {}
     
@@ -161,7 +183,7 @@ def get_price_comparison_api(query: str) -> Dict[str, List[Dict[str, Any]]]:
     for platform_name, api_client in apis.items():
         try:
             products = api_client.search_products(query)
-            results[platform_name] = products
+            results[platform_name] = with_price_paise(products)
         except Exception as e:
             results[platform_name] = [{"error": f"Failed to fetch from {platform_name}: {str(e)}"}]
     
@@ -1,35 +1,113 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
+import json
+import logging
 import os
 import sys
+import threading
 import time
+from concurrent.futures import as_completed
+from functools import partial
+from importlib.util import find_spec
 
-# Add the current directory to sys.path to ensure imports work
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Let the backend modules import each other however this file is loaded
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+if BACKEND_DIR not in sys.path:
+    sys.path.append(BACKEND_DIR)
 
-from scraper import get_price_comparison
-try:
-    from api_client import get_price_comparison_api
-    API_AVAILABLE = True
-except ImportError:
-    API_AVAILABLE = False
+# The scrapers (requests, BeautifulSoup), the asyncio engine (aiohttp) and the API
+# clients are imported where they are first used, so starting the app loads none of them
+from http_pool import WARM_UP_CONNECTIONS, connection_stats, warm_up
+from result_cache import comparison_cache, is_error_list, normalize_query
+from singleflight import comparison_flights
+from selector_stats import selector_stats
+from rate_limiter import rate_limiter
+from circuit_breaker import platform_breakers
+from batch import BatchScheduler, MAX_BATCH_QUERIES, dedupe_queries
+from prices import parse_price_paise, rank_cheapest
+from matching import match_products
+from history import price_history
+from watchlist import WATCHLIST_ENABLED, get_watchlist
+from alerts import MAX_PAGE_SIZE as ALERTS_MAX_PAGE_SIZE, PAGE_SIZE as ALERTS_PAGE_SIZE, get_alert_engine
+from suggest import MAX_TERMS as SUGGEST_MAX_TERMS, suggestion_index
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, REQUEST_SECONDS, REQUESTS_IN_FLIGHT, metrics_registry
+from tracing import PROFILE_SLOWEST, end_trace, get_profiler, span, start_trace
+from static_assets import COMPRESS_RESPONSES, compress_response, frontend_assets
+
+# Whether the API clients import; None until a request first needs them (see api_available)
+API_AVAILABLE = None
+
+# Platforms reported by /health without importing the scrapers; keep in step with scraper.PLATFORM_SCRAPERS
+PLATFORMS = ("Flipkart", "Amazon", "Reliance Digital")
+
+# Level of PricePulse's own log records; fired price alerts are logged at INFO
+LOG_LEVEL = os.environ.get('PRICEPULSE_LOG_LEVEL', 'INFO').upper()
+
+# Flask needs asgiref to run async views
+ASYNC_AVAILABLE = find_spec('aiohttp') is not None and find_spec('asgiref') is not None
 
 app = Flask(__name__)
 CORS(app)
 
+@app.before_request
+def start_request_metrics():
+    g.request_started = time.perf_counter()
+    REQUESTS_IN_FLIGHT.inc()
+    g.trace = start_trace(f"{request.method} {request.full_path.rstrip('?')}")
+
+# Comparison endpoints whose JSON is compressed for clients that accept it
+COMPRESSED_ENDPOINTS = {'compare_prices', 'compare_prices_async'}
+
+# Registered before add_trace so it runs after it, on the final body
+@app.after_request
+def compress_comparison(response):
+    if COMPRESS_RESPONSES and request.endpoint in COMPRESSED_ENDPOINTS:
+        compress_response(response, request)
+    return response
+
+@app.after_request
+def add_trace(response):
+    """Report the request's phases in Server-Timing, and in the JSON body with ?debug=1"""
+    trace = g.get('trace')
+    if trace is None:
+        return response
+    # A streamed response only carries the phases finished before its first line
+    response.headers['Server-Timing'] = trace.server_timing()
+    if request.args.get('debug') == '1' and response.is_json and not response.is_streamed:
+        body = response.get_json()
+        if isinstance(body, dict):
+            body['_trace'] = trace.to_dict()
+            response.set_data(app.json.dumps(body))
+    return response
+
+@app.teardown_request
+def finish_request_metrics(error=None):
+    # Runs after a streamed response has been fully sent
+    started = g.pop('request_started', None)
+    if started is not None:
+        REQUESTS_IN_FLIGHT.dec()
+        REQUEST_SECONDS.observe(time.perf_counter() - started, request.endpoint or 'unknown')
+    trace = g.pop('trace', None)
+    if trace is not None:
+        end_trace(trace)
+
 @app.route('/')
 def home():
-    # Serve the frontend HTML file with cross-platform path handling
-    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    frontend_path = os.path.join(project_root, 'frontend', 'index.html')
-    
+    # Serve the frontend from memory, compressed and revalidated by ETag
     try:
-        with open(frontend_path, 'r', encoding='utf-8') as f:
-            return f.read()
-    except FileNotFoundError:
-        return jsonify({"error": "Frontend file not found"}), 404
+        page = frontend_assets.get('index.html', 'text/html; charset=utf-8')
     except Exception as e:
         return jsonify({"error": f"Error reading frontend file: {str(e)}"}), 500
+    if page is None:
+        return jsonify({"error": "Frontend file not found"}), 404
+    return page.response(request)
+
+@app.route('/favicon.ico')
+def favicon():
+    icon = frontend_assets.get('favicon.ico', 'image/x-icon')
+    if icon is None:
+        return jsonify({"error": "Not found"}), 404
+    return icon.response(request)
 
 @app.route('/compare', methods=['GET'])
 def compare_prices():
@@ -44,55 +122,656 @@ def compare_prices():
     if not query:
         return jsonify({"error": "Query parameter cannot be empty"}), 400
     
-    # Add a small delay to help with rate limiting
-    time.sleep(0.5)
+    # Optional merged ranking across platforms: rank=cheapest, top=<k>
+    rank = request.args.get('rank')
+    if rank not in (None, 'cheapest'):
+        return jsonify({"error": "rank must be 'cheapest'"}), 400
+    top = request.args.get('top')
+    if top is not None:
+        if not top.isdigit() or int(top) < 1:
+            return jsonify({"error": "top must be a positive integer"}), 400
+        top = int(top)
+    
+    # Optional grouping of the same product across platforms: group=products
+    group = request.args.get('group')
+    if group not in (None, 'products'):
+        return jsonify({"error": "group must be 'products'"}), 400
+    if group and rank:
+        return jsonify({"error": "Use either rank or group, not both"}), 400
+    
+    use_api = method == 'api' and api_available()
+    cache_key = ('api' if use_api else 'scrape', normalize_query(query))
     
     try:
-        if method == 'api' and API_AVAILABLE:
-            results = get_price_comparison_api(query)
-        else:
-            results = get_price_comparison(query)
+        # Stale results are served immediately and refreshed in the background;
+        # identical concurrent misses share a single scrape. Politeness towards
+        # each platform is enforced per host by the scrapers' rate limiter.
+        results, cache_status, age = comparison_cache.get_stale_while_revalidate(
+            cache_key,
+            lambda: comparison_flights.do(cache_key, lambda: fetch_comparison(query, use_api))
+        )
         
-        # Check if all scrapers failed
-        all_failed = True
-        if isinstance(results, dict):
-            for key, value in results.items():
-                if isinstance(value, list) and len(value) > 0:
-                    # Check if all items are errors
-                    all_errors = all(isinstance(item, dict) and 'error' in item for item in value)
-                    if not all_errors:
-                        all_failed = False
-                        break
-        
-        if all_failed:
-            error_msg = "Unable to fetch data from any e-commerce platform. "
-            if method == 'api' and API_AVAILABLE:
-                error_msg += "Try switching to scraping method."
-            else:
-                error_msg += "Please try again later or try a different search term."
-            return jsonify({"error": error_msg}), 503
-        
-        return jsonify(results)
+        if not all_platforms_failed(results):
+            suggestion_index.record_query(query)
+        if rank:
+            return ranked_response(results, method, top, cache_headers(cache_status, age))
+        if group:
+            return grouped_response(results, method, cache_headers(cache_status, age))
+        return comparison_response(results, method, cache_headers(cache_status, age))
     except ImportError as e:
         return jsonify({"error": "Internal server configuration error"}), 500
     except Exception as e:
         return jsonify({"error": f"Internal server error: {str(e)}"}), 500
 
+@app.route('/compare/stream', methods=['GET'])
+def compare_prices_stream():
+    """Same as /compare, but streams each platform's results as NDJSON as soon as they are ready"""
+    query = request.args.get('query')
+    method = request.args.get('method', 'scrape')
+    
+    if not query:
+        return jsonify({"error": "Missing query parameter"}), 400
+    
+    query = query.strip()
+    if not query:
+        return jsonify({"error": "Query parameter cannot be empty"}), 400
+    
+    use_api = method == 'api' and api_available()
+    cache_key = ('api' if use_api else 'scrape', normalize_query(query))
+    
+    return Response(
+        stream_with_context(stream_comparison(query, method, use_api, cache_key)),
+        mimetype='application/x-ndjson',
+        # Keep proxies from buffering the stream until it ends
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/compare/batch', methods=['POST'])
+def compare_batch():
+    """Compare many queries in one request, streaming one JSON line per unique query"""
+    payload = request.get_json(silent=True)
+    if isinstance(payload, dict):
+        queries = payload.get('queries')
+        method = payload.get('method') or request.args.get('method', 'scrape')
+    else:
+        queries = payload
+        method = request.args.get('method', 'scrape')
+    
+    if not isinstance(queries, list) or not all(isinstance(query, str) for query in queries):
+        return jsonify({"error": "Expected a JSON list of queries, or {\"queries\": [...]}"}), 400
+    if len(queries) > MAX_BATCH_QUERIES:
+        return jsonify({"error": f"At most {MAX_BATCH_QUERIES} queries per batch"}), 400
+    
+    unique = dedupe_queries(queries)
+    if not unique:
+        return jsonify({"error": "No non-empty queries in batch"}), 400
+    
+    use_api = method == 'api' and api_available()
+    return Response(
+        stream_with_context(stream_batch(unique, len(queries), method, use_api)),
+        mimetype='application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+if ASYNC_AVAILABLE:
+    @app.route('/compare/async', methods=['GET'])
+    async def compare_prices_async():
+        """
+        Same as /compare, but scrapes on the asyncio engine.
+        
+        Under a WSGI server each request still holds a request thread; asgi.py
+        serves this route natively on one event loop instead.
+        """
+        from async_scraper import close_session
+        try:
+            return await async_compare_response()
+        finally:
+            # Flask gives each async view an event loop that ends with the request
+            await close_session()
+
+async def async_compare_response():
+    """The /compare/async response for the current request, shared by Flask and asgi.py"""
+    query = request.args.get('query')
+    method = request.args.get('method', 'scrape')
+    
+    if not query:
+        return jsonify({"error": "Missing query parameter"}), 400
+    
+    query = query.strip()
+    if not query:
+        return jsonify({"error": "Query parameter cannot be empty"}), 400
+    
+    use_api = method == 'api' and api_available()
+    cache_key = ('api' if use_api else 'scrape', normalize_query(query))
+    
+    try:
+        results, cache_status, age = await async_comparison(query, use_api, cache_key)
+        return comparison_response(results, method, cache_headers(cache_status, age))
+    except Exception as e:
+        return jsonify({"error": f"Internal server error: {str(e)}"}), 500
+
+async def async_comparison(query, use_api, cache_key):
+    """(results, cache status, age) of a comparison run on the asyncio engine"""
+    results, age, fresh = comparison_cache.lookup(cache_key)
+    cache_status = 'HIT' if fresh else 'STALE'
+    if results is None:
+        cache_status = 'MISS'
+        
+        async def compute():
+            if use_api:
+                # The API clients block, so they run on the scraper pool
+                from async_scraper import run_blocking
+                return await run_blocking(get_price_comparison_api, query)
+            from async_scraper import get_price_comparison_async
+            results = await get_price_comparison_async(query)
+            record_comparison(query, results)
+            return results
+        
+        # Attach to an identical comparison already in flight on either engine
+        results = await comparison_flights.do_async(cache_key, compute)
+        comparison_cache.set(cache_key, results)
+    elif not fresh:
+        # The refresh runs on the threaded engine, outside this request
+        comparison_cache.refresh(
+            cache_key,
+            lambda: comparison_flights.do(cache_key, lambda: fetch_comparison(query, use_api))
+        )
+    
+    if not all_platforms_failed(results):
+        suggestion_index.record_query(query)
+    return results, cache_status, age
+
+def get_price_comparison(query):
+    """All platforms scraped on the thread pool"""
+    import scraper
+    return scraper.get_price_comparison(query)
+
+def api_available():
+    """Import the API clients on first use; False if they or their dependencies are missing"""
+    global API_AVAILABLE
+    if API_AVAILABLE is None:
+        try:
+            import api_client
+            API_AVAILABLE = True
+        except ImportError:
+            API_AVAILABLE = False
+    return API_AVAILABLE
+
+def get_price_comparison_api(query):
+    """All platforms fetched through the API clients"""
+    import api_client
+    return api_client.get_price_comparison_api(query)
+
+def fetch_comparison(query, use_api):
+    """Run a comparison with the threaded scrapers or the API clients"""
+    if use_api:
+        return get_price_comparison_api(query)
+    results = get_price_comparison(query)
+    record_comparison(query, results)
+    return results
+
+def record_comparison(query, results):
+    """Feed freshly scraped results to the price history and the suggestion index"""
+    # Queued for the history writer thread; never waits on the database
+    price_history.record(query, results)
+    suggestion_index.add_products(results)
+
+def cache_headers(cache_status, age):
+    """Response headers describing where a comparison came from and how old it is"""
+    return {'X-Cache': cache_status, 'Age': str(int(age))}
+
+def all_platforms_failed(results):
+    """True when no platform returned a single product"""
+    # Check if all scrapers failed
+    all_failed = True
+    if isinstance(results, dict):
+        for key, value in results.items():
+            if isinstance(value, list) and len(value) > 0:
+                # Check if all items are errors
+                all_errors = all(isinstance(item, dict) and 'error' in item for item in value)
+                if not all_errors:
+                    all_failed = False
+                    break
+    return all_failed
+
+def failure_message(method):
+    """Error shown when every platform failed"""
+    error_msg = "Unable to fetch data from any e-commerce platform. "
+    if method == 'api' and api_available():
+        error_msg += "Try switching to scraping method."
+    else:
+        error_msg += "Please try again later or try a different search term."
+    return error_msg
+
+def comparison_response(results, method, headers=None):
+    """Turn comparison results into a JSON response, or a 503 if every platform failed"""
+    if all_platforms_failed(results):
+        return jsonify({"error": failure_message(method)}), 503, headers or {}
+    
+    return jsonify(results), 200, headers or {}
+
+def ranked_response(results, method, top=None, headers=None):
+    """Products from every platform cheapest first, plus each failed platform's error"""
+    if all_platforms_failed(results):
+        return jsonify({"error": failure_message(method)}), 503, headers or {}
+    
+    with span('rank'):
+        ranking, errors = rank_cheapest(results, top)
+    return jsonify({"ranking": ranking, "errors": errors}), 200, headers or {}
+
+def grouped_response(results, method, headers=None):
+    """Listings grouped into products across platforms, plus each failed platform's error"""
+    if all_platforms_failed(results):
+        return jsonify({"error": failure_message(method)}), 503, headers or {}
+    
+    with span('group'):
+        products, errors = match_products(results)
+    return jsonify({"products": products, "errors": errors}), 200, headers or {}
+
+def stream_comparison(query, method, use_api, cache_key):
+    """NDJSON lines: one 'platform' event per platform as it finishes, then a 'summary' event"""
+    start = time.perf_counter()
+    
+    def compute():
+        results = fetch_comparison(query, use_api)
+        comparison_cache.set(cache_key, results)
+        return results
+    
+    def refresh():
+        # Cached by whichever request runs the comparison, before anyone waiting on it returns
+        return comparison_flights.do(cache_key, compute)
+    
+    results, age, fresh = comparison_cache.lookup(cache_key)
+    if results is not None:
+        cache_status = 'HIT' if fresh else 'STALE'
+        if not fresh:
+            comparison_cache.refresh(cache_key, refresh)
+        platforms = platform_items(results)
+    else:
+        cache_status = 'MISS'
+        # The API clients answer all at once; scraped platforms arrive fastest first
+        platforms = platform_items(refresh()) if use_api else coalesced_platforms(query, cache_key)
+    
+    collected = {}
+    for platform, items in platforms:
+        collected[platform] = items
+        yield ndjson_line({
+            "event": "platform",
+            "platform": platform,
+            "results": items,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000)
+        })
+    
+    summary = {
+        "event": "summary",
+        "platforms": len(collected),
+        "succeeded": sum(1 for items in collected.values() if not is_error_list(items)),
+        "cache": cache_status,
+        "age": int(age),
+        "elapsed_ms": round((time.perf_counter() - start) * 1000)
+    }
+    if all_platforms_failed(collected):
+        summary["error"] = failure_message(method)
+    else:
+        suggestion_index.record_query(query)
+    yield ndjson_line(summary)
+
+def coalesced_platforms(query, cache_key):
+    """
+    (platform, results) pairs of a scrape shared with every concurrent request
+    for the same query, each platform yielded as soon as it finishes
+    """
+    import scraper
+
+    def finish(platform_results):
+        # Runs once, when the last platform is done, whether or not anyone is still streaming
+        ordered = {platform: platform_results[platform] for platform in scraper.PLATFORM_SCRAPERS
+                   if platform in platform_results}
+        record_comparison(query, ordered)
+        results = scraper.combine_platform_results(ordered)
+        comparison_cache.set(cache_key, results)
+        return results
+
+    parts, flight, _ = comparison_flights.do_parts(
+        cache_key, lambda: scraper.start_price_comparison(query), finish
+    )
+    if parts is None:
+        # A /compare request for the same query is already scraping; share its whole result
+        with span('coalesced-wait'):
+            results = flight.result()
+        yield from platform_items(results)
+        return
+    for part in as_completed(parts):
+        yield parts[part], part.result()
+    # Cached and recorded before the summary goes out
+    flight.result()
+
+def stream_batch(queries, submitted, method, use_api):
+    """NDJSON lines: a 'result' event per query (cached ones first), then a 'summary' event"""
+    import scraper
+    start = time.perf_counter()
+    engine = 'api' if use_api else 'scrape'
+    
+    misses, cached, failed = [], 0, 0
+    for query in queries:
+        results = comparison_cache.get((engine, normalize_query(query)))
+        if results is None:
+            misses.append(query)
+            continue
+        cached += 1
+        failed += all_platforms_failed(results)
+        yield ndjson_line(batch_result(query, results, method, 'HIT'))
+    
+    if use_api:
+        lanes = {"api": get_price_comparison_api}
+    else:
+        # One lane per platform; its per-host concurrency limit is shared with every other batch
+        lanes = {
+            platform: partial(scraper.scrape_with_retry, scraper_func, platform=platform)
+            for platform, scraper_func in scraper.PLATFORM_SCRAPERS.items()
+        }
+    
+    for query, lane_results in BatchScheduler(lanes).run(misses):
+        results = lane_results["api"] if use_api else scraper.combine_platform_results(lane_results)
+        comparison_cache.set((engine, normalize_query(query)), results)
+        if not use_api:
+            record_comparison(query, results)
+        failed += all_platforms_failed(results)
+        yield ndjson_line(batch_result(query, results, method, 'MISS'))
+    
+    yield ndjson_line({
+        "event": "summary",
+        "submitted": submitted,
+        "unique": len(queries),
+        "cached": cached,
+        "fetched": len(misses),
+        "failed": failed,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000)
+    })
+
+def batch_result(query, results, method, cache_status):
+    event = {"event": "result", "query": query, "cache": cache_status}
+    if all_platforms_failed(results):
+        event["error"] = failure_message(method)
+    else:
+        event["results"] = results
+    return event
+
+def platform_items(results):
+    """(platform, results) pairs of a comparison, skipping a top-level error"""
+    if not isinstance(results, dict):
+        return []
+    return [(platform, items) for platform, items in results.items() if isinstance(items, list)]
+
+def ndjson_line(event):
+    return json.dumps(event, ensure_ascii=False) + "\n"
+
 @app.route('/health')
 def health_check():
     """Health check endpoint"""
     return jsonify({
         "status": "healthy",
+        # null until a comparison first asks for the API clients; /health itself never imports them
         "api_available": API_AVAILABLE,
+        "async_available": ASYNC_AVAILABLE,
+        "circuit_breakers": {platform: platform_breakers.get(platform).stats() for platform in PLATFORMS},
         "message": "PricePulse server is running"
     })
 
+@app.route('/metrics')
+def metrics_view():
+    """Scraping, request and cache metrics in the Prometheus text format"""
+    return Response(metrics_registry.render(), content_type=METRICS_CONTENT_TYPE)
+
+def runtime_metrics():
+    """Gauges and counters read from the cache and circuit breakers when /metrics is scraped"""
+    cache = comparison_cache.stats()
+    breakers = platform_breakers.stats()
+    return [
+        ('pricepulse_cache_lookups_total', 'counter', 'Result cache lookups by outcome',
+         [({'outcome': 'hit'}, cache['hits']), ({'outcome': 'stale'}, cache['stale_hits']),
+          ({'outcome': 'miss'}, cache['misses'])]),
+        ('pricepulse_cache_entries', 'gauge', 'Comparisons held in the result cache', [({}, cache['entries'])]),
+        ('pricepulse_circuit_open', 'gauge', "1 while a platform's circuit breaker is not closed",
+         [({'platform': name}, int(stats['state'] != 'closed')) for name, stats in sorted(breakers.items())]),
+    ]
+
+metrics_registry.add_collector(runtime_metrics)
+
+@app.route('/debug/profiles')
+def profiles_view():
+    """The slowest requests kept by the sampling profiler, slowest first"""
+    if PROFILE_SLOWEST <= 0:
+        return jsonify({"enabled": False, "profiles": []})
+    profiles = [
+        dict({key: value for key, value in profile.items() if key != 'folded'}, index=index)
+        for index, profile in enumerate(get_profiler().profiles())
+    ]
+    return jsonify({"enabled": True, "profiles": profiles})
+
+@app.route('/debug/profiles/<int:index>')
+def profile_view(index):
+    """One kept profile as folded stacks, ready for flamegraph.pl or speedscope"""
+    folded = get_profiler().folded(index) if PROFILE_SLOWEST > 0 else None
+    if folded is None:
+        return jsonify({"error": "No such profile"}), 404
+    return Response(folded, content_type='text/plain; charset=utf-8')
+
+# Bucket names accepted by /history, in seconds
+HISTORY_BUCKETS = {'hour': 3600, 'day': 86400, 'week': 7 * 86400}
+
+@app.route('/history')
+def price_history_view():
+    """Min, max and average prices of a product or search query over a time range"""
+    if not price_history.enabled:
+        return jsonify({"error": "Price history is disabled"}), 503
+    
+    product = request.args.get('product', '').strip() or None
+    query = request.args.get('query', '').strip() or None
+    if (product is None) == (query is None):
+        return jsonify({"error": "Give either a product or a query parameter"}), 400
+    
+    try:
+        since, until, days = (request.args.get(name) for name in ('since', 'until', 'days'))
+        since = float(since) if since is not None else None
+        until = float(until) if until is not None else None
+        if days is not None and since is None:
+            since = time.time() - float(days) * 86400
+        bucket = request.args.get('bucket')
+        if bucket is not None:
+            bucket = HISTORY_BUCKETS.get(bucket) or int(bucket)
+            if bucket <= 0:
+                raise ValueError(bucket)
+    except ValueError:
+        return jsonify({"error": "since, until and days must be numbers; bucket is hour, day, week or seconds"}), 400
+    
+    return jsonify(price_history.summary(
+        product=product, query=query, platform=request.args.get('platform'),
+        since=since, until=until, bucket=bucket
+    ))
+
+@app.route('/stats/history')
+def history_stats_view():
+    """Observations written, queued and dropped by the price history writer"""
+    return jsonify(price_history.stats())
+
+@app.route('/watchlist', methods=['GET'])
+def watchlist_view():
+    """Tracked queries with each platform's next scheduled scrape"""
+    return jsonify(get_watchlist().items())
+
+@app.route('/watchlist', methods=['POST'])
+def watchlist_add():
+    """Track a query: {"query": "iphone 15", "interval": 3600}"""
+    payload = request.get_json(silent=True) or {}
+    query = payload.get('query')
+    interval = payload.get('interval')
+    if not isinstance(query, str) or not query.strip():
+        return jsonify({"error": "Missing query"}), 400
+    if interval is not None and (not isinstance(interval, (int, float)) or interval <= 0):
+        return jsonify({"error": "interval must be a positive number of seconds"}), 400
+    return jsonify(get_watchlist().add(query, interval)), 201
+
+@app.route('/watchlist', methods=['DELETE'])
+def watchlist_remove():
+    """Stop tracking a query"""
+    query = request.args.get('query', '')
+    if not get_watchlist().remove(query):
+        return jsonify({"error": "Query is not tracked"}), 404
+    return jsonify({"removed": query})
+
+@app.route('/stats/watchlist')
+def watchlist_stats_view():
+    """Tracked items, backlog and schedule lag of the watchlist tracker"""
+    return jsonify(get_watchlist().stats())
+
+@app.route('/alerts', methods=['GET'])
+def alerts_view():
+    """One page of registered price-drop alerts, optionally for one product: ?after=<id>&limit=<n>"""
+    product = request.args.get('product', '').strip() or None
+    after = request.args.get('after', '0')
+    limit = request.args.get('limit', str(ALERTS_PAGE_SIZE))
+    if not after.isdigit():
+        return jsonify({"error": "after must be an alert id"}), 400
+    if not limit.isdigit() or not 1 <= int(limit) <= ALERTS_MAX_PAGE_SIZE:
+        return jsonify({"error": f"limit must be between 1 and {ALERTS_MAX_PAGE_SIZE}"}), 400
+    alerts = get_alert_engine().alerts(product, int(after), int(limit))
+    # A full page may have more after it; pass next_after back as ?after= to get it
+    next_after = alerts[-1]["id"] if len(alerts) == int(limit) else None
+    return jsonify({"alerts": alerts, "next_after": next_after})
+
+@app.route('/alerts', methods=['POST'])
+def alerts_add():
+    """Register a price-drop alert: {"product": "Apple iPhone 15", "below": "₹60,000", "owner": "..."}"""
+    payload = request.get_json(silent=True) or {}
+    product = payload.get('product')
+    below = payload.get('below')
+    owner = payload.get('owner')
+    if not isinstance(product, str) or not product.strip():
+        return jsonify({"error": "Missing product"}), 400
+    if isinstance(below, bool):
+        below = None
+    elif isinstance(below, (int, float)):
+        below = round(below * 100)
+    else:
+        below = parse_price_paise(below)
+    if not below or below <= 0:
+        return jsonify({"error": "below must be a positive price such as 59999 or \"₹59,999\""}), 400
+    if owner is not None and not isinstance(owner, str):
+        return jsonify({"error": "owner must be a string"}), 400
+    return jsonify(get_alert_engine().add(product, below, owner)), 201
+
+@app.route('/alerts', methods=['DELETE'])
+def alerts_remove():
+    """Delete a price-drop alert by id"""
+    try:
+        alert_id = int(request.args.get('id', ''))
+    except ValueError:
+        return jsonify({"error": "id must be an alert id"}), 400
+    if not get_alert_engine().remove(alert_id):
+        return jsonify({"error": "No such alert"}), 404
+    return jsonify({"removed": alert_id})
+
+@app.route('/stats/alerts')
+def alert_stats_view():
+    """Alerts registered, evaluated, fired, held back by the cool-down and delivered"""
+    return jsonify(get_alert_engine().stats())
+
+@app.route('/suggest')
+def suggest_view():
+    """Past queries and product names starting with a prefix; already cached ones first"""
+    prefix = request.args.get('prefix', '')
+    limit = request.args.get('limit', '10')
+    if not limit.isdigit() or not 1 <= int(limit) <= 10:
+        return jsonify({"error": "limit must be between 1 and 10"}), 400
+    
+    suggestions = suggestion_index.suggest(prefix, int(limit))
+    for suggestion in suggestions:
+        suggestion["cached"] = comparison_cache.peek(('scrape', suggestion["query"]))
+    # Cached queries open instantly, so steer towards them; popularity order is kept otherwise
+    suggestions.sort(key=lambda suggestion: not suggestion["cached"])
+    return jsonify({"prefix": prefix, "suggestions": suggestions})
+
+@app.route('/stats/suggest')
+def suggest_stats_view():
+    """Terms in the suggestion index and lookups served"""
+    return jsonify(suggestion_index.stats())
+
+@app.route('/stats/connections')
+def connection_stats_view():
+    """Per-host request and connection-reuse counters for the shared HTTP pool"""
+    return jsonify(connection_stats())
+
+@app.route('/stats/cache')
+def cache_stats_view():
+    """Hit, miss and eviction counters for the comparison result cache"""
+    return jsonify(comparison_cache.stats())
+
+@app.route('/stats/coalescing')
+def coalescing_stats_view():
+    """Comparisons in flight and how many callers shared another caller's scrape"""
+    return jsonify(comparison_flights.stats())
+
+@app.route('/stats/rate-limits')
+def rate_limit_stats_view():
+    """Requests, queue wait times and spare request budget per platform host"""
+    return jsonify(rate_limiter.stats())
+
+@app.route('/stats/selectors')
+def selector_stats_view():
+    """Hit and miss counters per scraper selector, to spot layout drift"""
+    return jsonify(selector_stats.stats())
+
+def seed_suggestions():
+    """Load past queries and product names from the price history into the suggestion index"""
+    if price_history.enabled:
+        queries, products = price_history.popular_terms(SUGGEST_MAX_TERMS)
+        suggestion_index.seed(queries, products)
+
+def configure_logging():
+    """Send PricePulse's log records to stderr, unless the server already set up a handler for them"""
+    logger = logging.getLogger('pricepulse')
+    logger.setLevel(LOG_LEVEL)
+    if not logger.handlers and not logging.getLogger().handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+        logger.addHandler(handler)
+
+def start_background_services(tracker=True):
+    """Seed suggestions and start alert evaluation; the watchlist tracker only where tracker is set"""
+    configure_logging()
+    threading.Thread(target=seed_suggestions, name='pricepulse-suggest-seed', daemon=True).start()
+    get_alert_engine()
+    if tracker and WATCHLIST_ENABLED:
+        get_watchlist().start()
+
+def stop_background_services(tracker=True):
+    """Finish tracked scrapes, then write out queued prices and deliver pending alerts"""
+    if tracker and WATCHLIST_ENABLED:
+        get_watchlist().stop()
+    price_history.flush()
+    get_alert_engine().flush()
+
+def warm_up_connections():
+    """Pre-connect to every platform in the background so startup is not delayed"""
+    import scraper
+    urls = [scraper.FLIPKART_URL, scraper.AMAZON_URL, scraper.RELIANCE_URL]
+    thread = threading.Thread(target=warm_up, args=(urls,), name='pricepulse-warm-up', daemon=True)
+    thread.start()
+    return thread
+
 if __name__ == '__main__':
     print("=========================================")
     print("  PricePulse - Price Comparison App")
     print("=========================================")
     print("Starting server on http://127.0.0.1:5000")
-    print("API support:", "Available" if API_AVAILABLE else "Not available (using web scraping)")
+    print("API support:", "Available" if api_available() else "Not available (using web scraping)")
+    print("Async engine:", "Available at /compare/async" if ASYNC_AVAILABLE else "Not available (pip install aiohttp asgiref)")
     print("Press CTRL+C to stop the server")
     print("")
+    if WARM_UP_CONNECTIONS:
+        warm_up_connections()
+    # The debug reloader serves from a child process; start the tracker and alerts only there
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background_services()
     app.run(debug=True, host='127.0.0.1', port=5000)
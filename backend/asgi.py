@@ -0,0 +1,106 @@
+"""
+ASGI entry point for PricePulse
+
+Serves /compare/async natively on the server's event loop, so a process can
+have hundreds of comparisons in flight without a thread for each, and every
+comparison on the loop shares one aiohttp session and its keep-alive
+connections. Every other route is passed to the Flask app through asgiref's
+WSGI adapter, which runs it on a thread as before.
+
+Needs aiohttp and asgiref, plus an ASGI server such as uvicorn:
+
+    uvicorn asgi:app --app-dir backend --host 0.0.0.0 --port 8000
+
+Set WEB_CONCURRENCY to run several worker processes; each then gets its part
+of every host's rate limit, and one of them runs the watchlist tracker.
+"""
+
+import io
+import os
+import sys
+
+from asgiref.wsgi import WsgiToAsgi
+
+import app as app_module
+from async_scraper import close_session
+from rate_limiter import rate_limiter
+from serve import claim_tracker
+
+# Worker processes started by the ASGI server; uvicorn reads the same variable
+WORKERS = int(os.environ.get('WEB_CONCURRENCY', '1'))
+
+# Routes served on the event loop instead of a WSGI thread
+NATIVE_ROUTES = {'/compare/async': app_module.async_compare_response}
+
+flask_app = app_module.app
+wsgi_app = WsgiToAsgi(flask_app)
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+        return
+    view = NATIVE_ROUTES.get(scope['path']) if scope['type'] == 'http' else None
+    if view is None or scope['method'] not in ('GET', 'HEAD'):
+        await wsgi_app(scope, receive, send)
+        return
+    await serve_native(view, scope, send)
+
+async def serve_native(view, scope, send):
+    """Run an async view inside a Flask request context, with the app's before/after hooks"""
+    environ = build_environ(scope)
+    with flask_app.request_context(environ):
+        response = flask_app.preprocess_request()
+        if response is None:
+            response = await view()
+        response = flask_app.finalize_request(response)
+        body = response.get_data()
+        headers = [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                   for name, value in response.headers.items()]
+    await send({'type': 'http.response.start', 'status': response.status_code, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': b'' if scope['method'] == 'HEAD' else body})
+
+def build_environ(scope):
+    """The WSGI environ Flask needs for a bodiless ASGI request"""
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf8').decode('latin-1'),
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'] = scope['client'][0]
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        key = name if name in ('CONTENT_TYPE', 'CONTENT_LENGTH') else 'HTTP_' + name
+        value = value.decode('latin-1')
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+async def lifespan(receive, send):
+    tracker = False
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            # Every worker scrapes the same hosts; split each host's budget between them
+            rate_limiter.share(WORKERS)
+            tracker = claim_tracker() if os.name == 'posix' else True
+            if app_module.WARM_UP_CONNECTIONS:
+                app_module.warm_up_connections()
+            app_module.start_background_services(tracker=tracker)
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await close_session()
+            app_module.stop_background_services(tracker=tracker)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
@@ -0,0 +1,155 @@
+"""
+Asyncio scraping engine for PricePulse
+
+Fetches all platforms on a single event loop with aiohttp, so waiting on the
+network and the per-host rate limit never blocks a thread.
+Page parsing is shared with the threaded scrapers in scraper.py.
+
+Each event loop keeps one aiohttp session, so comparisons on the same loop
+reuse its keep-alive connections like http_pool does for the threaded
+scrapers. Close it with close_session() before the loop stops.
+"""
+
+import asyncio
+import weakref
+from contextvars import copy_context
+
+import aiohttp
+
+import scraper
+from http_pool import POOL_MAXSIZE
+from circuit_breaker import platform_breakers, unavailable_result
+from metrics import FETCH_SECONDS, RESPONSE_BYTES, SCRAPE_RETRIES, SCRAPE_ERRORS, HTTP_STATUS, PLATFORM_IN_FLIGHT
+from tracing import span
+
+# Event loop -> its shared aiohttp session
+_sessions = weakref.WeakKeyDictionary()
+
+def get_session():
+    """The running event loop's aiohttp session, created on first use"""
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        # Same per-host keep-alive limit as the threaded scrapers' pools
+        connector = aiohttp.TCPConnector(limit_per_host=POOL_MAXSIZE, ttl_dns_cache=300)
+        session = _sessions[loop] = aiohttp.ClientSession(
+            connector=connector, timeout=aiohttp.ClientTimeout(total=scraper.REQUEST_TIMEOUT)
+        )
+    return session
+
+async def close_session():
+    """Close the running event loop's session and its connections, if it has one"""
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
+
+def is_outage(error):
+    """True if a request exception means the platform is unavailable, matching scraper.is_outage"""
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status >= 500 or error.status in scraper.OUTAGE_STATUSES
+    return isinstance(error, (aiohttp.ClientError, scraper.PlatformBlocked))
+
+def error_category(error):
+    """Metrics label for a failed platform request, matching scraper.error_category"""
+    if isinstance(error, scraper.PlatformBlocked):
+        return 'blocked'
+    if isinstance(error, asyncio.TimeoutError):
+        return 'timeout'
+    if isinstance(error, aiohttp.ClientResponseError):
+        return 'http_status'
+    if isinstance(error, aiohttp.ClientConnectionError):
+        return 'connection'
+    if isinstance(error, aiohttp.ClientError):
+        return 'network'
+    return 'other'
+
+async def run_blocking(fn, *args):
+    """Await a blocking call run on the shared scraper pool, keeping the event loop free"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(scraper.get_executor(), copy_context().run, fn, *args)
+
+async def fetch_platform_prices(platform, session, query):
+    """Fetch and parse one platform's search page without blocking the event loop"""
+    if not query:
+        return [{"error": "Query parameter is required"}]
+
+    search_url, headers = scraper.PLATFORM_REQUESTS[platform](query)
+
+    try:
+        # Wait only if this host's request budget is used up
+        with span('rate-limit', platform):
+            await scraper.rate_limiter.acquire_async(search_url)
+
+        try:
+            with span('fetch', platform), PLATFORM_IN_FLIGHT.track(platform), FETCH_SECONDS.time(platform):
+                async with session.get(search_url, headers=headers) as response:
+                    HTTP_STATUS.inc(platform, str(response.status))
+                    response.raise_for_status()
+                    content = await response.read()
+            RESPONSE_BYTES.observe(len(content), platform)
+            if scraper.looks_blocked(content):
+                raise scraper.PlatformBlocked(f"{platform} served a CAPTCHA page")
+        except Exception as e:
+            SCRAPE_ERRORS.inc(platform, error_category(e))
+            raise
+
+        # Parsing is CPU bound, so keep it off the event loop
+        return await run_blocking(scraper.parse_search_page, platform, content)
+
+    except scraper.PlatformBlocked:
+        return scraper.PlatformFailure([{"error": f"{platform} asked for a CAPTCHA. Please try again later."}])
+    except asyncio.TimeoutError:
+        return scraper.PlatformFailure([{"error": f"{platform} is taking too long to respond. Please try again later."}])
+    except aiohttp.ClientConnectionError:
+        return scraper.PlatformFailure([{"error": f"Unable to connect to {platform}. Check your internet connection."}])
+    except aiohttp.ClientError as e:
+        entries = [{"error": f"Network error with {platform}: {str(e)[:50]}..."}]
+        return scraper.PlatformFailure(entries) if is_outage(e) else entries
+    except Exception as e:
+        return [{"error": f"Error scraping {platform}: {str(e)[:50]}..."}]
+
+async def scrape_with_retry_async(platform, session, query, max_retries=2):
+    """Awaitable counterpart of scraper.scrape_with_retry, guarded by the platform's circuit breaker"""
+    breaker = platform_breakers.get(platform)
+    result = None
+    for attempt in range(max_retries + 1):
+        if not breaker.allow():
+            return result if result is not None else unavailable_result(platform, breaker)
+        if attempt:
+            SCRAPE_RETRIES.inc(platform)
+        try:
+            result = await fetch_platform_prices(platform, session, query)
+            outage = isinstance(result, scraper.PlatformFailure)
+            if outage:
+                breaker.record(False)
+            elif scraper.is_failed_result(result):
+                breaker.record_answered()
+            else:
+                breaker.record(True)
+            # Only an unavailable platform is worth asking again
+            if not outage or attempt == max_retries:
+                return result
+
+        except Exception as e:
+            breaker.record(False)
+            if attempt == max_retries:
+                return [{"error": f"Failed after {max_retries + 1} attempts: {str(e)[:100]}..."}]
+
+        if scraper.should_back_off(breaker):
+            with span('backoff', platform):
+                await asyncio.sleep(scraper.retry_delay(attempt))
+
+    return [{"error": "Max retries exceeded"}]
+
+async def get_price_comparison_async(query, session=None):
+    """Get price comparison from all websites concurrently on the running event loop"""
+    if not query:
+        return {"error": "Query parameter is required"}
+
+    session = session or get_session()
+    platforms = list(scraper.PLATFORM_REQUESTS)
+    results = await asyncio.gather(
+        *(scrape_with_retry_async(platform, session, query) for platform in platforms)
+    )
+
+    return scraper.combine_platform_results(dict(zip(platforms, results)))
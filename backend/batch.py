@@ -0,0 +1,118 @@
+"""
+Batch comparisons for PricePulse
+
+Runs many queries through the platform scrapers at once. Each platform is a
+lane with its own small pool of workers. Calls on a lane take one of its
+slots, which are shared by every batch in the process, so at most
+HOST_CONCURRENCY requests are in flight against any one site however many
+batches are running, while every site is kept busy. Results are handed back
+per query as soon as all of its platforms are done.
+"""
+
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from result_cache import normalize_query
+
+# Requests in flight at once against each platform, across all batches in the process
+HOST_CONCURRENCY = int(os.environ.get('PRICEPULSE_HOST_CONCURRENCY', '2'))
+
+# Largest number of queries accepted in one batch
+MAX_BATCH_QUERIES = int(os.environ.get('PRICEPULSE_BATCH_MAX', '5000'))
+
+def dedupe_queries(queries):
+    """Unique queries in first-seen order, comparing them like the result cache does"""
+    unique = {}
+    for query in queries:
+        query = query.strip()
+        key = normalize_query(query)
+        if key and key not in unique:
+            unique[key] = query
+    return list(unique.values())
+
+class LaneSlots:
+    """A semaphore per lane limiting its calls in flight, shared by every scheduler that uses it"""
+
+    def __init__(self, concurrency=HOST_CONCURRENCY):
+        self.concurrency = max(1, concurrency)
+        self._slots = {}
+        self._lock = threading.Lock()
+
+    def get(self, lane):
+        slots = self._slots.get(lane)
+        if slots is None:
+            with self._lock:
+                slots = self._slots.get(lane)
+                if slots is None:
+                    slots = self._slots[lane] = threading.BoundedSemaphore(self.concurrency)
+        return slots
+
+    def reset_after_fork(self):
+        """Slots held by threads of the parent are never released in a forked child"""
+        self._slots = {}
+        self._lock = threading.Lock()
+
+class BatchScheduler:
+    """Run every query on every lane, with at most `concurrency` calls in flight per lane"""
+
+    def __init__(self, lanes, concurrency=None, slots=None):
+        self.lanes = lanes  # name -> fn(query)
+        if slots is None:
+            # The process-wide slots, unless the caller asks for a limit of its own
+            slots = host_slots if concurrency is None else LaneSlots(concurrency)
+        self.slots = slots
+        self.concurrency = slots.concurrency
+
+    def _worker(self, lane, fn, work, done, cancelled):
+        slots = self.slots.get(lane)
+        while not cancelled.is_set():
+            try:
+                query = work.get_nowait()
+            except queue.Empty:
+                return
+            with slots:
+                if cancelled.is_set():
+                    return
+                try:
+                    result = fn(query)
+                except Exception as e:
+                    result = [{"error": f"Error scraping {lane}: {str(e)[:50]}..."}]
+            done.put((query, lane, result))
+
+    def run(self, queries):
+        """Yield (query, {lane: result}) for each query as soon as all its lanes finish"""
+        if not queries or not self.lanes:
+            return
+        done = queue.Queue()
+        cancelled = threading.Event()
+        pending = {query: {} for query in queries}
+        workers = min(self.concurrency, len(queries))
+        executor = ThreadPoolExecutor(max_workers=workers * len(self.lanes),
+                                      thread_name_prefix='pricepulse-batch')
+        try:
+            for lane, fn in self.lanes.items():
+                work = queue.Queue()
+                for query in queries:
+                    work.put(query)
+                for _ in range(workers):
+                    executor.submit(self._worker, lane, fn, work, done, cancelled)
+
+            for _ in range(len(queries) * len(self.lanes)):
+                query, lane, result = done.get()
+                pending[query][lane] = result
+                if len(pending[query]) == len(self.lanes):
+                    finished = pending.pop(query)
+                    # Keep the lanes' order rather than the order they finished in
+                    yield query, {name: finished[name] for name in self.lanes}
+        finally:
+            # Stop handing out work if the consumer went away early
+            cancelled.set()
+            executor.shutdown(wait=False)
+
+# Per-platform slots shared by every batch in this process
+host_slots = LaneSlots()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=host_slots.reset_after_fork)
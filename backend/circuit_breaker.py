@@ -0,0 +1,166 @@
+"""
+Circuit breakers for PricePulse platforms
+
+When a platform starts failing (503s, CAPTCHA pages, timeouts) there is no
+point in retrying it for every search. Each platform gets a breaker that
+watches the failure rate of its recent requests:
+
+  closed     requests go through; outcomes are recorded in a sliding window
+  open       the failure rate crossed the threshold; requests are rejected
+             at once until the cool-down ends
+  half-open  the cool-down ended; a single probe request is let through and
+             its outcome closes the breaker or opens it for another cool-down
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+# Recent outcomes per platform used to compute the failure rate
+WINDOW_SIZE = int(os.environ.get('PRICEPULSE_BREAKER_WINDOW', '10'))
+
+# Outcomes needed in the window before the breaker may open
+MIN_CALLS = int(os.environ.get('PRICEPULSE_BREAKER_MIN_CALLS', '4'))
+
+# Failure rate that opens the breaker
+FAILURE_THRESHOLD = float(os.environ.get('PRICEPULSE_BREAKER_THRESHOLD', '0.5'))
+
+# Seconds an open breaker rejects requests before letting a probe through
+COOLDOWN = float(os.environ.get('PRICEPULSE_BREAKER_COOLDOWN', '60'))
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker driven by a sliding window of outcomes"""
+
+    def __init__(self, name, window_size=WINDOW_SIZE, min_calls=MIN_CALLS,
+                 failure_threshold=FAILURE_THRESHOLD, cooldown=COOLDOWN):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._outcomes = deque(maxlen=window_size)  # True for success
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.times_opened = 0
+
+    def allow(self):
+        """True if a request may be sent now; in half-open state only the probe is allowed"""
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+                self._state = HALF_OPEN
+                self._probe_in_flight = False
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record(self, success):
+        """Record the outcome of an allowed request"""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probe_in_flight = False
+                if success:
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                else:
+                    self._open()
+                return
+
+            self._outcomes.append(success)
+            if self._state == CLOSED and len(self._outcomes) >= self.min_calls:
+                failures = self._outcomes.count(False)
+                if failures / len(self._outcomes) >= self.failure_threshold:
+                    self._open()
+
+    def record_answered(self):
+        """
+        Record an allowed request the platform answered without a usable
+        result, such as a search with no products. It says nothing about the
+        platform's health, so it stays out of the window; a half-open probe
+        that gets an answer still closes the breaker.
+        """
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probe_in_flight = False
+                self._state = CLOSED
+                self._outcomes.clear()
+
+    def _open(self):
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self.times_opened += 1
+
+    def retry_after(self):
+        """Seconds until an open breaker lets a probe through (0 otherwise)"""
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(0.0, self.cooldown - (time.monotonic() - self._opened_at))
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+                return HALF_OPEN
+            return self._state
+
+    def stats(self):
+        state = self.state
+        with self._lock:
+            calls = len(self._outcomes)
+            failures = self._outcomes.count(False)
+            return {
+                "state": state,
+                "failure_rate": round(failures / calls, 4) if calls else 0.0,
+                "window_calls": calls,
+                "rejected": self.rejected,
+                "times_opened": self.times_opened
+            }
+
+class BreakerRegistry:
+    """One lazily created breaker per platform"""
+
+    def __init__(self, **breaker_args):
+        self.breaker_args = breaker_args
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(name)
+                if breaker is None:
+                    breaker = self._breakers[name] = CircuitBreaker(name, **self.breaker_args)
+        return breaker
+
+    def reset(self):
+        with self._lock:
+            self._breakers.clear()
+
+    def stats(self):
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {name: breaker.stats() for name, breaker in breakers.items()}
+
+def unavailable_result(platform, breaker):
+    """Fast error entry returned while a platform's breaker is open"""
+    retry_after = int(breaker.retry_after()) + 1
+    return [{
+        "error": f"{platform} is temporarily unavailable after repeated failures. "
+                 f"Trying again in about {retry_after}s.",
+        "retry_after": retry_after
+    }]
+
+# Breakers for the scraped platforms, shared by the threaded and async engines
+platform_breakers = BreakerRegistry()
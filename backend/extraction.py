@@ -0,0 +1,158 @@
+"""
+Compiled extraction plans for PricePulse scrapers
+
+The scrapers used to call select_one once per name, price and link selector,
+walking each product container again for every selector. A plan compiles all
+of a platform's selectors up front, walks each container's subtree once to
+find the first match of every selector, and then picks the name, price and
+link exactly as the select_one loops would.
+"""
+
+import re
+from urllib.parse import urljoin
+
+import soupsieve
+from bs4.element import Tag
+
+from selector_stats import selector_stats
+
+_SIMPLE_SELECTOR = re.compile(r'([\w-]*)((?:\.[\w-]+)*)(?:\[([\w-]+)(?:="([^"]*)")?\])?')
+
+def simple_selector_matcher(pattern):
+    """
+    Compile a simple 'tag.class' or 'tag[attr="value"]' selector into a
+    (name, attrs) test, or return None if the selector is not that simple.
+    """
+    match = _SIMPLE_SELECTOR.fullmatch(pattern.strip())
+    if not match or not any(match.groups()):
+        return None
+    tag, classes, attr, value = match.groups()
+    classes = classes.split('.')[1:]
+
+    def matches(name, attrs):
+        if tag and name != tag:
+            return False
+        if classes:
+            tag_classes = attrs.get('class') or ''
+            if isinstance(tag_classes, str):
+                tag_classes = tag_classes.split()
+            if not all(cls in tag_classes for cls in classes):
+                return False
+        if attr:
+            if attr not in attrs:
+                return False
+            if value is not None and attrs[attr] != value:
+                return False
+        return True
+
+    return matches
+
+def _descendant_chain_matcher(compounds):
+    """Match 'a b c' (descendant combinators only): c itself, then the nearest matching ancestors"""
+    last, ancestors = compounds[-1], compounds[-2::-1]
+    if not ancestors:
+        return lambda tag: last(tag.name, tag.attrs)
+
+    def matches(tag):
+        if not last(tag.name, tag.attrs):
+            return False
+        node = tag.parent
+        for compound in ancestors:
+            # Taking the nearest matching ancestor is safe with descendant combinators
+            while node is not None and not (node.name and compound(node.name, node.attrs)):
+                node = node.parent
+            if node is None:
+                return False
+            node = node.parent
+        return True
+
+    return matches
+
+def compile_selector(selector):
+    """Return a fast tag -> bool test equivalent to soupsieve matching the selector"""
+    alternatives = []
+    for part in selector.split(','):
+        compounds = [simple_selector_matcher(compound) for compound in part.split()]
+        if all(compounds):
+            alternatives.append(_descendant_chain_matcher(compounds))
+        else:
+            alternatives.append(soupsieve.compile(part.strip()).match)
+
+    if len(alternatives) == 1:
+        return alternatives[0]
+    return lambda tag: any(match(tag) for match in alternatives)
+
+class ExtractionPlan:
+    """Name, price and link rules for one platform, compiled for a single pass per container"""
+
+    def __init__(self, platform, name_selectors, price_selectors, link_selector,
+                 accept_name, accept_price, max_products=3):
+        self.platform = platform
+        self.name_selectors = name_selectors
+        self.price_selectors = price_selectors
+        self.link_selector = link_selector
+        self.accept_name = accept_name
+        self.accept_price = accept_price
+        self.max_products = max_products
+        selectors = list(dict.fromkeys(name_selectors + price_selectors + [link_selector]))
+        self._compiled = [(selector, compile_selector(selector)) for selector in selectors]
+
+    def first_matches(self, container):
+        """Walk the container once and return the first descendant matching each selector"""
+        found = {}
+        pending = self._compiled
+        for element in container.descendants:
+            if not isinstance(element, Tag):
+                continue
+            matched = [selector for selector, matches in pending if matches(element)]
+            if matched:
+                for selector in matched:
+                    found[selector] = element
+                pending = [item for item in pending if item[0] not in found]
+                if not pending:
+                    break
+        return found
+
+    def _pick(self, group, selectors, accept, found):
+        """First value accepted in selector order, recording outcomes like the select_one loops"""
+        for selector in selector_stats.ordered(self.platform, group, selectors):
+            value = accept(found[selector]) if selector in found else None
+            selector_stats.record(self.platform, group, selector, value is not None, selectors)
+            if value is not None:
+                return value
+        return None
+
+    def extract(self, containers, base_url):
+        """Return up to max_products {"name", "price", "link"} dicts from the containers"""
+        products = []
+        for container in containers:
+            try:
+                found = self.first_matches(container)
+
+                name = self._pick("name", self.name_selectors, self.accept_name, found)
+                if name is None:
+                    continue
+
+                price = self._pick("price", self.price_selectors, self.accept_price, found)
+                if price is None:
+                    continue
+
+                link = base_url
+                link_elem = found.get(self.link_selector)
+                if link_elem is not None and link_elem.get('href'):
+                    link = urljoin(base_url, link_elem['href'])
+
+                products.append({
+                    "name": name[:100] + "..." if len(name) > 100 else name,
+                    "price": price,
+                    "link": link
+                })
+
+                if len(products) >= self.max_products:
+                    break
+
+            except Exception:
+                # Skip this product if we can't extract data
+                continue
+
+        return products
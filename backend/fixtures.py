@@ -0,0 +1,109 @@
+"""
+Recorded HTTP fixtures for PricePulse
+
+A FixtureStore keeps search responses as gzip-compressed JSON files, one per
+URL. RecordingAdapter saves every real response that passes through a
+session, and ReplayAdapter answers requests from the store without touching
+the network, so scrapers and benchmarks can run offline against real pages.
+"""
+
+import base64
+import glob
+import gzip
+import hashlib
+import json
+import os
+import time
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Headers that describe the wire encoding; stored bodies are already decoded
+_WIRE_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length', 'connection'}
+
+def normalize_url(url):
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', parts.query, ''))
+
+class FixtureStore:
+    """Directory of gzip-compressed JSON responses keyed by URL"""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def path_for(self, url):
+        digest = hashlib.sha1(normalize_url(url).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.directory, f"{digest}.json.gz")
+
+    def save(self, url, status, body, headers=None, reason="OK"):
+        """Store one response and return the fixture path"""
+        os.makedirs(self.directory, exist_ok=True)
+        fixture = {
+            "url": normalize_url(url),
+            "status": status,
+            "reason": reason,
+            "headers": {k: v for k, v in (headers or {}).items() if k.lower() not in _WIRE_HEADERS},
+            "recorded_at": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            "body": base64.b64encode(body).decode('ascii')
+        }
+        path = self.path_for(url)
+        # mtime=0 keeps the compressed bytes stable across re-recordings of the same page
+        with open(path, 'wb') as f:
+            f.write(gzip.compress(json.dumps(fixture).encode('utf-8'), mtime=0))
+        return path
+
+    def _read(self, path):
+        with open(path, 'rb') as f:
+            fixture = json.loads(gzip.decompress(f.read()))
+        fixture["body"] = base64.b64decode(fixture["body"])
+        return fixture
+
+    def load(self, url):
+        """Return the stored fixture for a URL, or None"""
+        path = self.path_for(url)
+        if not os.path.exists(path):
+            return None
+        return self._read(path)
+
+    def __iter__(self):
+        for path in sorted(glob.glob(os.path.join(self.directory, '*.json.gz'))):
+            yield self._read(path)
+
+class RecordingAdapter(HTTPAdapter):
+    """Transport adapter that saves every response it receives to a FixtureStore"""
+
+    def __init__(self, store, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        self.store.save(request.url, response.status_code, response.content,
+                        dict(response.headers), response.reason or "")
+        return response
+
+class ReplayAdapter(HTTPAdapter):
+    """Transport adapter that answers from a FixtureStore and never opens a connection"""
+
+    def __init__(self, store, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store
+
+    def send(self, request, **kwargs):
+        fixture = self.store.load(request.url)
+        if fixture is None:
+            raise requests.ConnectionError(f"No recorded fixture for {request.url}", request=request)
+
+        response = requests.Response()
+        response.status_code = fixture["status"]
+        response.reason = fixture["reason"]
+        response.headers = CaseInsensitiveDict(fixture["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = fixture["body"]
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
@@ -0,0 +1,293 @@
+"""
+Price history for PricePulse
+
+Every successful comparison is appended to an embedded SQLite database so
+trend questions can be answered without scraping again. Writes go through a
+bounded queue to a single writer thread that inserts them in batches, so
+recording a result never adds latency to a /compare response. The database
+runs in WAL mode, letting /history read while the writer appends, and a
+covering index on (product_key, platform, ts, price_paise) answers range
+aggregates from the index alone.
+"""
+
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+
+from prices import normalize_prices
+from result_cache import normalize_query
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Set to 0 to stop recording and serving price history
+HISTORY_ENABLED = os.environ.get('PRICEPULSE_HISTORY', '1') != '0'
+
+# SQLite database file for price observations
+HISTORY_DB = os.environ.get('PRICEPULSE_HISTORY_DB', os.path.join(PROJECT_ROOT, 'data', 'price_history.db'))
+
+# Observations written per transaction, and the longest a queued one waits
+FLUSH_BATCH = int(os.environ.get('PRICEPULSE_HISTORY_BATCH', '500'))
+FLUSH_INTERVAL = float(os.environ.get('PRICEPULSE_HISTORY_FLUSH', '1.0'))
+
+# Observations waiting for the writer; beyond this new ones are dropped rather than blocking
+MAX_QUEUED = int(os.environ.get('PRICEPULSE_HISTORY_QUEUE', '50000'))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS observations (
+    id INTEGER PRIMARY KEY,
+    product_key TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    ts REAL NOT NULL,
+    price_paise INTEGER NOT NULL,
+    query TEXT NOT NULL,
+    name TEXT NOT NULL,
+    link TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_observations_product
+    ON observations (product_key, platform, ts, price_paise);
+CREATE INDEX IF NOT EXISTS idx_observations_query
+    ON observations (query, platform, ts, price_paise);
+"""
+
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+
+def product_key(name):
+    """Stable key for a product name: lower-case words joined by single spaces"""
+    return _NON_WORD.sub(' ', name.lower()).strip()
+
+class HistoryStore:
+    """SQLite price history with a buffered, batched writer thread"""
+
+    def __init__(self, path=HISTORY_DB, enabled=HISTORY_ENABLED, flush_batch=FLUSH_BATCH,
+                 flush_interval=FLUSH_INTERVAL, max_queued=MAX_QUEUED):
+        self.path = path
+        self.enabled = enabled
+        self.flush_batch = flush_batch
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._writer = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._schema_ready = False
+        self._listeners = []
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.write_errors = 0
+        self.listener_errors = 0
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        connection.execute('PRAGMA journal_mode=WAL')
+        # WAL makes NORMAL durable enough: a crash can lose the last batch, never corrupt the file
+        connection.execute('PRAGMA synchronous=NORMAL')
+        if not self._schema_ready:
+            with self._lock:
+                if not self._schema_ready:
+                    connection.executescript(SCHEMA)
+                    self._schema_ready = True
+        return connection
+
+    def _reader(self):
+        """One read connection per thread; WAL lets them read while the writer appends"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = self._connect()
+        return connection
+
+    def record(self, query, results, ts=None):
+        """Queue every priced product of a comparison; returns how many were queued"""
+        if not self.enabled or not isinstance(results, dict):
+            return 0
+        ts = time.time() if ts is None else ts
+        query = normalize_query(query)
+
+        products = [
+            (platform, item)
+            for platform, items in results.items() if isinstance(items, list)
+            for item in items if isinstance(item, dict) and 'error' not in item and item.get('name')
+        ]
+        missing = [item.get('price') for _, item in products if item.get('price_paise') is None]
+        parsed = iter(normalize_prices(missing))
+
+        queued = 0
+        for platform, item in products:
+            paise = item.get('price_paise')
+            if paise is None:
+                paise = next(parsed)
+            if paise is None:
+                continue
+            row = (product_key(item['name']), platform, ts, paise, query, item['name'], item.get('link'))
+            try:
+                self._queue.put_nowait(row)
+                queued += 1
+            except queue.Full:
+                with self._lock:
+                    self.dropped += 1
+        if queued:
+            self._ensure_writer()
+        return queued
+
+    def add_listener(self, listener):
+        """Call listener(rows) from the writer thread with every batch it commits"""
+        self._listeners.append(listener)
+
+    def _ensure_writer(self):
+        if self._writer is None:
+            with self._lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._write_loop, name='pricepulse-history', daemon=True)
+                    self._writer.start()
+
+    def reset_after_fork(self):
+        """In a forked child the writer thread is gone; start over with an empty queue"""
+        self._queue = queue.Queue(maxsize=self._queue.maxsize)
+        self._writer = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _write_loop(self):
+        connection = None
+        while True:
+            rows = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(rows) < self.flush_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    rows.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                if connection is None:
+                    connection = self._connect()
+            except Exception:
+                # The database cannot be opened, e.g. an unwritable data directory: drop
+                # the batch rather than let flush() wait forever, and try again with the next
+                with self._lock:
+                    self.dropped += len(rows)
+                for _ in rows:
+                    self._queue.task_done()
+                continue
+            try:
+                with connection:
+                    connection.executemany(
+                        'INSERT INTO observations (product_key, platform, ts, price_paise, query, name, link) '
+                        'VALUES (?, ?, ?, ?, ?, ?, ?)', rows
+                    )
+                self.written += len(rows)
+                self.batches += 1
+            except sqlite3.Error:
+                self.write_errors += len(rows)
+            else:
+                for listener in self._listeners:
+                    try:
+                        listener(rows)
+                    except Exception:
+                        self.listener_errors += 1
+            finally:
+                for _ in rows:
+                    self._queue.task_done()
+
+    def flush(self):
+        """Block until everything queued so far has been written"""
+        self._queue.join()
+
+    def summary(self, product=None, query=None, platform=None, since=None, until=None, bucket=None):
+        """
+        Min, max and average price (in paise) per platform for a product key or
+        search query over [since, until], plus a time series when bucket (seconds)
+        is given.
+        """
+        if (product is None) == (query is None):
+            raise ValueError("Give exactly one of product or query")
+        if product is not None:
+            column, value = 'product_key', product_key(product)
+        else:
+            column, value = 'query', normalize_query(query)
+
+        conditions = [f"{column} = ?"]
+        params = [value]
+        if platform:
+            conditions.append("platform = ?")
+            params.append(platform)
+        if since is not None:
+            conditions.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("ts <= ?")
+            params.append(until)
+        where = " AND ".join(conditions)
+
+        connection = self._reader()
+        platforms = {}
+        total_paise = 0
+        for name, low, high, average, count, first, last in connection.execute(
+            f"SELECT platform, MIN(price_paise), MAX(price_paise), AVG(price_paise), COUNT(*), MIN(ts), MAX(ts) "
+            f"FROM observations WHERE {where} GROUP BY platform ORDER BY platform", params
+        ):
+            platforms[name] = {
+                "min_paise": low, "max_paise": high, "avg_paise": round(average), "count": count,
+                "first_seen": first, "last_seen": last
+            }
+            total_paise += average * count
+
+        report = {column: value, "since": since, "until": until, "platforms": platforms}
+        if platforms:
+            count = sum(stats["count"] for stats in platforms.values())
+            report["overall"] = {
+                "min_paise": min(stats["min_paise"] for stats in platforms.values()),
+                "max_paise": max(stats["max_paise"] for stats in platforms.values()),
+                "avg_paise": round(total_paise / count),
+                "count": count
+            }
+        if bucket:
+            report["bucket"] = bucket
+            report["series"] = [
+                {"start": start, "platform": name, "min_paise": low, "max_paise": high,
+                 "avg_paise": round(average), "count": count}
+                for start, name, low, high, average, count in connection.execute(
+                    f"SELECT CAST(ts / ? AS INTEGER) * ? AS start, platform, MIN(price_paise), "
+                    f"MAX(price_paise), AVG(price_paise), COUNT(*) FROM observations WHERE {where} "
+                    f"GROUP BY start, platform ORDER BY start, platform", [bucket, bucket] + params
+                )
+            ]
+        return report
+
+    def popular_terms(self, limit):
+        """
+        Up to `limit` recorded queries with how many comparisons ran for each,
+        and product names with how many times they were seen, most frequent first.
+        """
+        connection = self._reader()
+        queries = connection.execute(
+            "SELECT query, COUNT(DISTINCT ts) AS searches FROM observations "
+            "GROUP BY query ORDER BY searches DESC LIMIT ?", (limit,)
+        ).fetchall()
+        products = connection.execute(
+            "SELECT MAX(name), COUNT(*) AS sightings FROM observations "
+            "GROUP BY product_key ORDER BY sightings DESC LIMIT ?", (limit,)
+        ).fetchall()
+        return queries, products
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "write_errors": self.write_errors,
+            "listener_errors": self.listener_errors
+        }
+
+# History shared by every comparison route
+price_history = HistoryStore()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=price_history.reset_after_fork)
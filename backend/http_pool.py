@@ -0,0 +1,117 @@
+"""
+Shared HTTP sessions for PricePulse
+
+One requests.Session per host, created on first use and kept for the life of
+the process, so repeated searches reuse kept-alive connections instead of
+paying for a new TCP and TLS handshake every time. requests itself is
+imported with the first session, so importing this module is cheap.
+"""
+
+import os
+import threading
+from urllib.parse import urlsplit
+
+# Connections kept alive per host; should cover the scraper pool size
+POOL_MAXSIZE = int(os.environ.get('PRICEPULSE_POOL_MAXSIZE', '16'))
+
+# Number of per-host connection pools each session caches
+POOL_CONNECTIONS = int(os.environ.get('PRICEPULSE_POOL_CONNECTIONS', '4'))
+
+# Open connections to every platform when the server starts
+WARM_UP_CONNECTIONS = os.environ.get('PRICEPULSE_WARM_UP', '0') == '1'
+
+# Record responses to, or replay them from, a fixture directory: 'record:<dir>' or 'replay:<dir>'
+FIXTURES = os.environ.get('PRICEPULSE_FIXTURES', '')
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+def _host_key(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+def _new_adapter():
+    from requests.adapters import HTTPAdapter
+    pool_args = {"pool_connections": POOL_CONNECTIONS, "pool_maxsize": POOL_MAXSIZE}
+    if not FIXTURES:
+        return HTTPAdapter(**pool_args)
+
+    from fixtures import FixtureStore, RecordingAdapter, ReplayAdapter
+    mode, _, directory = FIXTURES.partition(':')
+    if mode == 'record':
+        return RecordingAdapter(FixtureStore(directory), **pool_args)
+    if mode == 'replay':
+        return ReplayAdapter(FixtureStore(directory), **pool_args)
+    raise ValueError(f"PRICEPULSE_FIXTURES must be 'record:<dir>' or 'replay:<dir>', not {FIXTURES!r}")
+
+def _new_session():
+    import requests
+    session = requests.Session()
+    adapter = _new_adapter()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def get_session(url):
+    """Return the shared session for the host of the given URL"""
+    key = _host_key(url)
+    session = _sessions.get(key)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = _sessions[key] = _new_session()
+    return session
+
+def _forget_sessions():
+    """In a forked worker, drop the parent's sessions so no socket is shared between processes"""
+    global _sessions_lock
+    _sessions.clear()
+    _sessions_lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_sessions)
+
+def use_fixtures(mode=None, directory=None):
+    """Record to or replay from a fixture directory (mode 'record' or 'replay'), or go back to the network"""
+    global FIXTURES
+    FIXTURES = f"{mode}:{directory}" if mode else ''
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+def warm_up(urls, timeout=5):
+    """Pre-connect to each URL's host so the first real search skips the handshake"""
+    import requests
+    status = {}
+    for url in urls:
+        try:
+            get_session(url).head(url, timeout=timeout, allow_redirects=False)
+            status[_host_key(url)] = "connected"
+        except requests.RequestException as e:
+            status[_host_key(url)] = f"failed: {str(e)[:50]}"
+    return status
+
+def connection_stats():
+    """Requests sent, connections opened and connections reused, per host"""
+    stats = {}
+    with _sessions_lock:
+        sessions = list(_sessions.items())
+    for key, session in sessions:
+        requests_sent = 0
+        connections_opened = 0
+        for adapter in set(session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for pool_key in pools.keys():
+                pool = pools.get(pool_key)
+                if pool is None:
+                    continue
+                requests_sent += pool.num_requests
+                connections_opened += pool.num_connections
+        stats[key] = {
+            "requests": requests_sent,
+            "connections_opened": connections_opened,
+            "connections_reused": requests_sent - connections_opened
+        }
+    return stats
@@ -0,0 +1,234 @@
+"""
+Cross-platform product matching for PricePulse
+
+Each platform names the same phone a little differently ("Apple iPhone 15
+(128 GB) - Black" on Flipkart, "Apple iPhone 15 128GB Black" on Amazon), and
+the scrapers cut names at 100 characters. Names are reduced to sets of
+normalized tokens and listings whose token sets are similar enough (Jaccard)
+are grouped with a union-find, so one product's offers can be shown side by
+side.
+
+Two ways of finding candidate pairs are used, picked by corpus size:
+
+  index   an inverted token index counts shared tokens for every pair that
+          has any in common; exact, and fast for the few dozen listings of
+          one comparison
+  lsh     MinHash signatures split into bands (locality-sensitive hashing);
+          only listings that share a band are compared, which keeps
+          deduplicating history-sized corpora close to linear
+
+Numbers and model variants are treated as hard evidence: listings whose
+numeric tokens (model numbers, storage, screen size) contradict each other,
+or that name different variants ("Pro", "Plus", "Max"), never match, however
+similar the rest of the name is.
+"""
+
+import os
+import random
+import re
+import zlib
+from collections import defaultdict
+
+from prices import parse_price_paise
+
+# Jaccard similarity of two names' token sets needed to call them the same product
+MATCH_THRESHOLD = float(os.environ.get('PRICEPULSE_MATCH_THRESHOLD', '0.5'))
+
+# Corpus size from which candidate pairs come from MinHash/LSH instead of the inverted index
+LSH_MIN_NAMES = 2000
+
+# 16 bands of 4 rows put the LSH detection curve's midpoint near a Jaccard of 0.5
+LSH_BANDS = 16
+LSH_ROWS = 4
+
+# Members of one LSH bucket compared with each newcomer, so a very common band stays linear
+LSH_MAX_BUCKET = 100
+
+# "128 GB", "6.1 inch", "5000 mAh" -> "128gb", "6.1inch", "5000mah"
+_UNIT = re.compile(r'(\d+(?:\.\d+)?)\s*(gb|tb|mb|mah|mp|hz|w|kg|g|l|cm|mm|inches|inch|")(?![a-z0-9])')
+_UNIT_ALIASES = {'inches': 'inch', '"': 'inch'}
+_TOKEN = re.compile(r'[a-z0-9]+(?:\.\d+[a-z]*)?')
+
+# Filler words that say nothing about which product a listing is
+STOP_WORDS = frozenset({
+    'a', 'an', 'and', 'by', 'for', 'from', 'in', 'of', 'on', 'the', 'to', 'with', 'new', 'latest',
+    'buy', 'online', 'best', 'price', 'india', 'edition'
+})
+
+# Words that make a different model out of the same base name
+VARIANT_WORDS = frozenset({'pro', 'plus', 'max', 'mini', 'ultra', 'lite', 'fe', 'neo', 'prime', 'air'})
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240501)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(_PRIME)) for _ in range(LSH_BANDS * LSH_ROWS)]
+_token_hashes = {}
+
+def _unit(match):
+    number, unit = match.groups()
+    return number + _UNIT_ALIASES.get(unit, unit)
+
+def tokenize(name):
+    """Normalized token set of a product name"""
+    if not isinstance(name, str):
+        return frozenset()
+    truncated = name.endswith('...')
+    text = _UNIT.sub(_unit, name.lower().rstrip('. '))
+    tokens = _TOKEN.findall(text)
+    if truncated and tokens:
+        # The scrapers cut long names mid-word; the last token may be a fragment
+        tokens.pop()
+    return frozenset(token for token in tokens if token not in STOP_WORDS)
+
+def _identifiers(tokens):
+    numbers = frozenset(token for token in tokens if any(ch.isdigit() for ch in token))
+    return numbers, tokens & VARIANT_WORDS
+
+def _conflict(identifiers_a, identifiers_b):
+    """
+    Numbers contradict unless one listing's numbers include the other's (a
+    listing may leave out the storage); variant words must be the same.
+    """
+    (numbers_a, variants_a), (numbers_b, variants_b) = identifiers_a, identifiers_b
+    return variants_a != variants_b or not (numbers_a <= numbers_b or numbers_b <= numbers_a)
+
+def similarity(name_a, name_b):
+    """Jaccard similarity of two names' tokens, 0 when their numbers or variants contradict"""
+    a, b = tokenize(name_a), tokenize(name_b)
+    if not a or not b or _conflict(_identifiers(a), _identifiers(b)):
+        return 0.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+class _Clusters:
+    """Union-find over listings that refuses merges whose identifiers contradict"""
+
+    def __init__(self, identifiers):
+        self.parent = list(range(len(identifiers)))
+        self.identifiers = list(identifiers)  # per root: numbers of every member, shared variants
+
+    def find(self, item):
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b or _conflict(self.identifiers[root_a], self.identifiers[root_b]):
+            # A listing without storage must not bridge the 128 GB and 256 GB models
+            return
+        root, child = min(root_a, root_b), max(root_a, root_b)
+        self.parent[child] = root
+        (numbers_a, variants), (numbers_b, _) = self.identifiers[root], self.identifiers[child]
+        self.identifiers[root] = (numbers_a | numbers_b, variants)
+
+def _index_candidates(token_sets):
+    """(i, {j: shared token count}) for every earlier j sharing a token with i, via an inverted index"""
+    postings = defaultdict(list)
+    for i, tokens in enumerate(token_sets):
+        shared = defaultdict(int)
+        for token in tokens:
+            for j in postings[token]:
+                shared[j] += 1
+            postings[token].append(i)
+        yield i, shared.items()
+
+def _signature(tokens):
+    columns = []
+    for token in tokens:
+        hashes = _token_hashes.get(token)
+        if hashes is None:
+            value = zlib.crc32(token.encode())
+            hashes = _token_hashes[token] = tuple((a * value + b) % _PRIME for a, b in _PERMUTATIONS)
+        columns.append(hashes)
+    return [min(values) for values in zip(*columns)]
+
+def _lsh_candidates(token_sets):
+    """(i, [(j, shared token count)]) for earlier j sharing at least one MinHash band with i"""
+    buckets = defaultdict(list)
+    for i, tokens in enumerate(token_sets):
+        if not tokens:
+            continue
+        signature = _signature(tokens)
+        candidates = set()
+        for band in range(LSH_BANDS):
+            bucket = buckets[(band, *signature[band * LSH_ROWS:(band + 1) * LSH_ROWS])]
+            candidates.update(bucket[-LSH_MAX_BUCKET:])
+            bucket.append(i)
+        yield i, [(j, len(tokens & token_sets[j])) for j in candidates]
+
+def cluster_names(names, threshold=MATCH_THRESHOLD, method=None):
+    """
+    Group names that describe the same product.
+
+    Returns a list of clusters, each a list of indices into names in
+    ascending order; clusters are ordered by their first index. method is
+    'index' or 'lsh', chosen by the number of names when not given.
+    """
+    token_sets = [tokenize(name) for name in names]
+    identifiers = [_identifiers(tokens) for tokens in token_sets]
+    if method is None:
+        method = 'lsh' if len(names) >= LSH_MIN_NAMES else 'index'
+    candidates = _lsh_candidates(token_sets) if method == 'lsh' else _index_candidates(token_sets)
+
+    sizes = [len(tokens) for tokens in token_sets]
+    matches = []
+    for i, shared_counts in candidates:
+        size, identifier = sizes[i], identifiers[i]
+        for j, shared in shared_counts:
+            score = shared / (size + sizes[j] - shared)
+            if score >= threshold and not _conflict(identifier, identifiers[j]):
+                matches.append((-score, j, i))
+    # Most similar pairs first, so each listing joins its closest group
+    matches.sort()
+
+    groups = _Clusters(identifiers)
+    for _, i, j in matches:
+        groups.union(i, j)
+
+    clusters = defaultdict(list)
+    for i in range(len(names)):
+        clusters[groups.find(i)].append(i)
+    return [clusters[root] for root in sorted(clusters)]
+
+def match_products(results, threshold=MATCH_THRESHOLD):
+    """
+    Listings from every platform of a comparison grouped into products.
+
+    Returns (products, errors). Each product has a display name, its listings
+    cheapest first, the platforms offering it and the cheapest listing;
+    products on more platforms come first, then cheaper ones. errors maps
+    failed platforms to their message.
+    """
+    listings = []
+    errors = {}
+    for platform, items in results.items():
+        if not isinstance(items, list):
+            continue
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            if 'error' in item:
+                errors.setdefault(platform, item['error'])
+            elif item.get('name'):
+                paise = item.get('price_paise')
+                if paise is None:
+                    paise = parse_price_paise(item.get('price'))
+                listings.append(dict(item, platform=platform, price_paise=paise))
+
+    no_price = float('inf')
+    price = lambda listing: no_price if listing['price_paise'] is None else listing['price_paise']
+    products = []
+    for cluster in cluster_names([listing['name'] for listing in listings], threshold):
+        members = sorted((listings[i] for i in cluster), key=price)
+        # The longest name that was not truncated says the most about the product
+        full_names = [member['name'] for member in members if not member['name'].endswith('...')]
+        products.append({
+            "name": max(full_names or [members[0]['name']], key=len),
+            "platforms": sorted({member['platform'] for member in members}),
+            "cheapest": members[0],
+            "listings": members
+        })
+    products.sort(key=lambda product: (-len(product['platforms']), price(product['cheapest'])))
+    return products, errors
@@ -0,0 +1,258 @@
+"""
+Prometheus metrics for PricePulse
+
+Counters, gauges and histograms rendered in the Prometheus text format at
+/metrics. Updates happen on the scraping hot path, so they take no lock:
+every thread writes to its own shard (a plain dict reached through a
+thread-local), and only a scrape of /metrics walks the shards and adds them
+up. Shards of threads that have exited are folded into a retired total so
+short-lived request threads do not pile up.
+"""
+
+import bisect
+import os
+import threading
+import time
+
+# Seconds; spans fast cache-side work up to a platform's request timeout
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0)
+
+# Bytes of a search results page
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Registered shards between sweeps for exited threads
+_SWEEP_EVERY = 64
+
+class MetricsRegistry:
+    """Per-thread metric shards, summed when the metrics are collected"""
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+        self._local = threading.local()
+        self._shards = []  # (thread, values)
+        self._retired = {}
+        self._registered = 0
+        self._lock = threading.Lock()
+
+    def shard(self):
+        """This thread's values: (metric, labels) -> number, or histogram list"""
+        values = getattr(self._local, 'values', None)
+        if values is None:
+            values = self._local.values = {}
+            with self._lock:
+                self._shards.append((threading.current_thread(), values))
+                self._registered += 1
+                if self._registered % _SWEEP_EVERY == 0:
+                    self._sweep()
+        return values
+
+    def _sweep(self):
+        """Fold the shards of exited threads into the retired totals; caller holds the lock"""
+        alive = []
+        for thread, values in self._shards:
+            if thread.is_alive():
+                alive.append((thread, values))
+            else:
+                _merge(self._retired, values)
+        self._shards = alive
+
+    def reset_after_fork(self):
+        """Start a forked worker from zero; it reports its own process's counts"""
+        self._local = threading.local()
+        self._shards = []
+        self._retired = {}
+        self._registered = 0
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector):
+        """Add a callable returning [(name, type, help, [(labels dict, value)])] read at collection time"""
+        self._collectors.append(collector)
+
+    def totals(self):
+        """Sum of every shard: (metric, labels) -> number or histogram list"""
+        with self._lock:
+            self._sweep()
+            totals = {}
+            _merge(totals, self._retired)
+            for _, values in self._shards:
+                # dict.copy() is atomic under the GIL, so the owning thread may keep writing
+                _merge(totals, values.copy())
+        return totals
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        totals = self.totals()
+        by_metric = {}
+        for (metric, labels), value in totals.items():
+            by_metric.setdefault(metric, []).append((labels, value))
+
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for labels, value in sorted(by_metric.get(metric, []), key=lambda item: item[0]):
+                lines.extend(metric.samples(labels, value))
+        for collector in self._collectors:
+            for name, kind, help_text, samples in collector():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_label_text(labels)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+def _merge(totals, values):
+    for key, value in values.items():
+        if isinstance(value, list):
+            total = totals.get(key)
+            if total is None:
+                totals[key] = list(value)
+            else:
+                for i, count in enumerate(value):
+                    total[i] += count
+        else:
+            totals[key] = totals.get(key, 0) + value
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _label_text(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+def _number(value):
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
+
+class _Metric:
+    kind = 'untyped'
+
+    def __init__(self, name, help_text, labelnames=(), registry=None):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.registry = registry or metrics_registry
+        self.registry.register(self)
+
+    def _labels(self, labels):
+        return dict(zip(self.labelnames, labels))
+
+class Counter(_Metric):
+    """Monotonic count, e.g. retries or errors"""
+
+    kind = 'counter'
+
+    def inc(self, *labels, amount=1):
+        values = self.registry.shard()
+        key = (self, labels)
+        values[key] = values.get(key, 0) + amount
+
+    def samples(self, labels, value):
+        return [f"{self.name}{_label_text(self._labels(labels))} {_number(value)}"]
+
+class Gauge(Counter):
+    """Value that goes up and down, e.g. requests in flight; each thread's shard holds its net change"""
+
+    kind = 'gauge'
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+    def track(self, *labels):
+        """Context manager that counts the block as in flight while it runs"""
+        return _InFlight(self, labels)
+
+class _InFlight:
+    __slots__ = ('gauge', 'labels')
+
+    def __init__(self, gauge, labels):
+        self.gauge = gauge
+        self.labels = labels
+
+    def __enter__(self):
+        self.gauge.inc(*self.labels)
+
+    def __exit__(self, *exc):
+        self.gauge.dec(*self.labels)
+
+class Histogram(_Metric):
+    """Distribution of observations over fixed buckets, with their sum and count"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS, registry=None):
+        super().__init__(name, help_text, labelnames, registry)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labels):
+        values = self.registry.shard()
+        key = (self, labels)
+        counts = values.get(key)
+        if counts is None:
+            # One slot per bucket plus +Inf, then the sum and the count
+            counts = values[key] = [0] * (len(self.buckets) + 3)
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        counts[-2] += value
+        counts[-1] += 1
+
+    def time(self, *labels):
+        """Context manager that observes the seconds its block takes"""
+        return _Timer(self, labels)
+
+    def samples(self, labels, counts):
+        base = self._labels(labels)
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else _number(float(bound))
+            lines.append(f"{self.name}_bucket{_label_text(dict(base, le=le))} {cumulative}")
+        lines.append(f"{self.name}_sum{_label_text(base)} {_number(float(counts[-2]))}")
+        lines.append(f"{self.name}_count{_label_text(base)} {counts[-1]}")
+        return lines
+
+class _Timer:
+    __slots__ = ('histogram', 'labels', 'start')
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, *self.labels)
+
+metrics_registry = MetricsRegistry()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=metrics_registry.reset_after_fork)
+
+# Scraping metrics, labelled by platform
+FETCH_SECONDS = Histogram('pricepulse_fetch_seconds', 'Time to download a search results page', ['platform'])
+PARSE_SECONDS = Histogram('pricepulse_parse_seconds', 'Time to build the parse tree of a results page', ['platform'])
+EXTRACT_SECONDS = Histogram('pricepulse_extract_seconds',
+                            'Time to find product containers and extract their fields', ['platform'])
+RESPONSE_BYTES = Histogram('pricepulse_response_bytes', 'Size of downloaded results pages', ['platform'],
+                           buckets=SIZE_BUCKETS)
+SCRAPE_RETRIES = Counter('pricepulse_scrape_retries_total', 'Scrape attempts after the first', ['platform'])
+SCRAPE_ERRORS = Counter('pricepulse_scrape_errors_total',
+                        'Failed scrapes by cause: timeout, connection, http_status, network, no_products, other',
+                        ['platform', 'category'])
+HTTP_STATUS = Counter('pricepulse_platform_responses_total', 'Responses from platforms by status code',
+                      ['platform', 'code'])
+PLATFORM_IN_FLIGHT = Gauge('pricepulse_platform_requests_in_flight', 'Requests to a platform awaiting a response',
+                           ['platform'])
+
+# Requests served by PricePulse itself
+REQUESTS_IN_FLIGHT = Gauge('pricepulse_requests_in_flight', 'HTTP requests being handled')
+REQUEST_SECONDS = Histogram('pricepulse_request_seconds', 'Time to handle an HTTP request', ['endpoint'])
@@ -0,0 +1,101 @@
+"""
+Price normalization and ranking for PricePulse
+
+Platforms return prices as display strings ("₹2,999", "2,999.", "₹1,29,999.00").
+This module turns them into integer paise once, when products are scraped,
+so sorting and comparing never has to re-parse strings, and ranks products
+from every platform cheapest first.
+"""
+
+import heapq
+import re
+
+# First amount in a price string: digits with Indian or Western grouping, optional paise
+PRICE_PATTERN = re.compile(r'(\d[\d,]*)(?:\.(\d{1,2}))?')
+
+# A bare number such as "2,999" or "1299.00"
+PLAIN_NUMBER = re.compile(r'[\d,.]*\d[\d,.]*')
+
+# One match per line of a newline-joined batch; lines without an amount match empty groups
+_PRICE_LINE = re.compile(r'^[^\d\n]*(?:(\d[\d,]*)(?:\.(\d{1,2}))?)?[^\n]*$', re.MULTILINE)
+
+_LINE_BREAKS = str.maketrans('\n', ' ')
+
+def _to_paise(whole, fraction):
+    if not whole:
+        return None
+    paise = int(whole.replace(',', '')) * 100
+    if fraction:
+        paise += int(fraction.ljust(2, '0'))
+    return paise
+
+def is_plain_number(text):
+    """True for digits with optional ',' and '.' separators"""
+    return PLAIN_NUMBER.fullmatch(text) is not None
+
+def parse_price_paise(text):
+    """Integer paise of the first amount in a price string, or None"""
+    if not isinstance(text, str):
+        return None
+    match = PRICE_PATTERN.search(text)
+    return _to_paise(*match.groups()) if match else None
+
+def normalize_prices(texts):
+    """
+    Paise for many price strings at once.
+
+    The strings are joined into one buffer and scanned by a single regex
+    pass instead of one search call per string, which keeps the per-price
+    Python overhead down for batch and history workloads.
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+    try:
+        joined = "\n".join(texts)
+    except TypeError:
+        texts = [text if isinstance(text, str) else "" for text in texts]
+        joined = "\n".join(texts)
+    if joined.count("\n") != len(texts) - 1:
+        # Some strings span lines; flatten them so each keeps exactly one line
+        joined = "\n".join(text.translate(_LINE_BREAKS) for text in texts)
+    return [_to_paise(whole, fraction) for whole, fraction in _PRICE_LINE.findall(joined)]
+
+def with_price_paise(products):
+    """Add a price_paise field to every product that has a price"""
+    priced = [product for product in products if isinstance(product, dict) and 'price' in product]
+    for product, paise in zip(priced, normalize_prices([product['price'] for product in priced])):
+        product['price_paise'] = paise
+    return products
+
+def rank_cheapest(results, top=None):
+    """
+    Products from every platform of a comparison, cheapest first.
+
+    Returns (ranking, errors) where ranking holds up to `top` products, each
+    tagged with its platform, and errors maps failed platforms to their message.
+    """
+    candidates = []
+    errors = {}
+    for platform, items in results.items():
+        if not isinstance(items, list):
+            continue
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            if 'error' in item:
+                errors.setdefault(platform, item['error'])
+                continue
+            paise = item.get('price_paise')
+            if paise is None:
+                paise = parse_price_paise(item.get('price'))
+            if paise is not None:
+                candidates.append(dict(item, platform=platform, price_paise=paise))
+
+    key = lambda item: item['price_paise']
+    if top is None or top >= len(candidates):
+        ranking = sorted(candidates, key=key)
+    else:
+        # Only the k cheapest are needed: O(n log k) instead of a full sort
+        ranking = heapq.nsmallest(top, candidates, key=key)
+    return ranking, errors
@@ -0,0 +1,162 @@
+"""
+Per-host rate limiting for PricePulse scrapers
+
+Every request to a platform host takes a token from that host's bucket.
+While tokens are left the request goes out immediately; once the burst is
+used up, callers are spaced out at the configured rate (plus a little
+jitter) no matter how many users are searching at once. Threads wait with
+acquire(), coroutines with acquire_async(); both share the same buckets.
+"""
+
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+# Sustained requests per second allowed to each host; 0 disables limiting
+DEFAULT_RATE = float(os.environ.get('PRICEPULSE_RATE', '1.0'))
+
+# Requests a host may receive back to back before the rate applies
+DEFAULT_BURST = int(os.environ.get('PRICEPULSE_BURST', '4'))
+
+# Up to this many extra seconds are added to a wait, so queued requests do not fire in lockstep
+JITTER = float(os.environ.get('PRICEPULSE_RATE_JITTER', '0.5'))
+
+# Per-host overrides: host -> (rate, burst)
+HOST_LIMITS = {}
+
+class TokenBucket:
+    """Token bucket that hands out reservations, so waiters are served in arrival order"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token and return how many seconds to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # The balance may go negative: each waiter owns a later slot
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def available(self):
+        with self._lock:
+            elapsed = time.monotonic() - self._updated
+            return min(self.burst, self._tokens + elapsed * self.rate)
+
+class RateLimiter:
+    """Token buckets per host, with wait-time statistics"""
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, jitter=JITTER, host_limits=None):
+        self.rate = rate
+        self.burst = burst
+        self.jitter = jitter
+        self.host_limits = HOST_LIMITS if host_limits is None else host_limits
+        self._buckets = {}
+        self._stats = {}  # host -> [requests, delayed, total_wait, max_wait, waiting]
+        self._lock = threading.Lock()
+
+    def _bucket(self, host):
+        """The host's bucket, or None when requests to it are not limited"""
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate, burst = self.host_limits.get(host, (self.rate, self.burst))
+            if rate <= 0:
+                return None
+            with self._lock:
+                bucket = self._buckets.get(host)
+                if bucket is None:
+                    bucket = self._buckets[host] = TokenBucket(rate, burst)
+        return bucket
+
+    def reserve(self, url):
+        """Reserve a request slot for the URL's host; returns (host, seconds to wait for it)"""
+        host = urlsplit(url).netloc
+        bucket = self._bucket(host)
+        delay = bucket.reserve() if bucket is not None else 0.0
+        if delay > 0 and self.jitter > 0:
+            delay += random.uniform(0, self.jitter)
+
+        with self._lock:
+            stats = self._stats.setdefault(host, [0, 0, 0.0, 0.0, 0])
+            stats[0] += 1
+            if delay > 0:
+                stats[1] += 1
+                stats[2] += delay
+                stats[3] = max(stats[3], delay)
+        return host, delay
+
+    def _waiting(self, host, change):
+        with self._lock:
+            self._stats[host][4] += change
+
+    def acquire(self, url):
+        """Block until a request to url may be sent; returns the seconds waited"""
+        host, delay = self.reserve(url)
+        if delay > 0:
+            self._waiting(host, 1)
+            try:
+                time.sleep(delay)
+            finally:
+                self._waiting(host, -1)
+        return delay
+
+    async def acquire_async(self, url):
+        """Wait without blocking the event loop until a request to url may be sent"""
+        import asyncio  # deferred until a coroutine actually has to wait
+        host, delay = self.reserve(url)
+        if delay > 0:
+            self._waiting(host, 1)
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self._waiting(host, -1)
+        return delay
+
+    def share(self, processes):
+        """
+        Limit this process to its part of every host's budget when `processes`
+        worker processes scrape the same hosts, so together they stay within it.
+        """
+        if processes <= 1:
+            return
+        part = lambda rate, burst: (rate / processes, max(1, -(-burst // processes)))
+        with self._lock:
+            self.rate, self.burst = part(self.rate, self.burst)
+            self.host_limits = {host: part(rate, burst) for host, (rate, burst) in self.host_limits.items()}
+            self._buckets.clear()
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+            self._stats.clear()
+
+    def stats(self):
+        """Requests, queue wait times and spare tokens per host"""
+        with self._lock:
+            hosts = {host: list(stats) for host, stats in self._stats.items()}
+            buckets = dict(self._buckets)
+        report = {}
+        for host, (requests, delayed, total_wait, max_wait, waiting) in hosts.items():
+            bucket = buckets.get(host)
+            report[host] = {
+                "requests": requests,
+                "delayed": delayed,
+                "waiting": waiting,
+                "avg_wait_ms": round(total_wait / requests * 1000, 1) if requests else 0.0,
+                "max_wait_ms": round(max_wait * 1000, 1),
+                "tokens_available": round(bucket.available(), 2) if bucket else None
+            }
+        return report
+
+# Limiter shared by the threaded and async scrapers
+rate_limiter = RateLimiter()
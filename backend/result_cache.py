@@ -0,0 +1,245 @@
+"""
+In-memory result cache for PricePulse
+
+Keeps recent comparison results keyed by method and normalized query, so
+repeated searches for the same product are answered without scraping again.
+Entries expire per platform, failures expire sooner, and the least recently
+used entries are evicted once the entry count or byte budget is exceeded.
+
+Expired results stay servable for a short grace period while a background
+worker refreshes them (stale-while-revalidate), so popular queries never make
+a user wait for a full scrape.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from tracing import span
+
+# Seconds a platform's successful results stay fresh
+PLATFORM_TTLS = {
+    "Flipkart": 600,
+    "Amazon": 300,
+    "Reliance Digital": 900
+}
+
+# Fresh time for platforms not listed above
+DEFAULT_TTL = int(os.environ.get('PRICEPULSE_CACHE_TTL', '300'))
+
+# Failures are kept briefly so a blocked platform is retried soon
+ERROR_TTL = int(os.environ.get('PRICEPULSE_CACHE_ERROR_TTL', '30'))
+
+# Seconds past expiry a result may still be served while it is refreshed
+STALE_TTL = int(os.environ.get('PRICEPULSE_CACHE_STALE_TTL', '300'))
+
+# Background threads refreshing stale entries
+REFRESH_WORKERS = int(os.environ.get('PRICEPULSE_REFRESH_WORKERS', '2'))
+
+MAX_ENTRIES = int(os.environ.get('PRICEPULSE_CACHE_ENTRIES', '1024'))
+MAX_BYTES = int(os.environ.get('PRICEPULSE_CACHE_BYTES', str(16 * 1024 * 1024)))
+
+def normalize_query(query):
+    """Lower-case and collapse whitespace so equivalent searches share a key"""
+    return " ".join(query.lower().split())
+
+def is_error_list(items):
+    """True when a platform's result list holds only error entries"""
+    return all(isinstance(item, dict) and 'error' in item for item in items)
+
+def result_ttl(results, platform_ttls=PLATFORM_TTLS, default_ttl=DEFAULT_TTL, error_ttl=ERROR_TTL):
+    """Lifetime of a comparison result: that of its shortest-lived platform"""
+    if not isinstance(results, dict) or 'error' in results:
+        return error_ttl
+
+    ttls = []
+    for platform, items in results.items():
+        if not isinstance(items, list) or not items or is_error_list(items):
+            ttls.append(error_ttl)
+        else:
+            ttls.append(platform_ttls.get(platform, default_ttl))
+    return min(ttls) if ttls else error_ttl
+
+class ResultCache:
+    """Thread-safe TTL cache with LRU eviction by entry count and size in bytes"""
+
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES, platform_ttls=None,
+                 default_ttl=DEFAULT_TTL, error_ttl=ERROR_TTL, stale_ttl=STALE_TTL,
+                 refresh_workers=REFRESH_WORKERS):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.platform_ttls = PLATFORM_TTLS if platform_ttls is None else platform_ttls
+        self.default_ttl = default_ttl
+        self.error_ttl = error_ttl
+        self.stale_ttl = stale_ttl
+        self.refresh_workers = refresh_workers
+        self._entries = OrderedDict()  # key -> (value, size, stored_at, expires_at, stale_until)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._refresh_executor = None
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+    def get(self, key):
+        """Return the cached value, or None if it is missing or expired"""
+        value, age, fresh = self.lookup(key, allow_stale=False)
+        return value
+
+    def lookup(self, key, allow_stale=True):
+        """Return (value, age in seconds, fresh) for a key, or (None, 0, False) on a miss"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, 0, False
+            value, size, stored_at, expires_at, stale_until = entry
+            fresh = now < expires_at
+            if not fresh and not (allow_stale and now < stale_until):
+                if now >= stale_until:
+                    self._remove(key)
+                    self.expirations += 1
+                self.misses += 1
+                return None, 0, False
+            self._entries.move_to_end(key)
+            if fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+            return value, now - stored_at, fresh
+
+    def peek(self, key):
+        """True if a servable entry (fresh or stale) exists; leaves counters and LRU order alone"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and time.monotonic() < entry[4]
+
+    def set(self, key, value):
+        """Store a value with the TTL of its shortest-lived platform"""
+        ttl = result_ttl(value, self.platform_ttls, self.default_ttl, self.error_ttl)
+        size = len(json.dumps(value, ensure_ascii=False).encode('utf-8'))
+        if ttl <= 0 or size > self.max_bytes:
+            return
+
+        # Only results that are not a total failure are worth serving stale
+        grace = 0 if isinstance(value, dict) and 'error' in value else self.stale_ttl
+
+        now = time.monotonic()
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, now, now + ttl, now + ttl + grace)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value, computing and storing it on a miss"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def get_stale_while_revalidate(self, key, compute, refresh_compute=None):
+        """
+        Return (value, status, age) where status is HIT, STALE or MISS.
+
+        A stale value is returned at once and refreshed in the background with
+        refresh_compute (compute by default); only a miss runs compute on the
+        caller's thread.
+        """
+        with span('cache'):
+            value, age, fresh = self.lookup(key)
+        if value is None:
+            value = compute()
+            with span('cache-store'):
+                self.set(key, value)
+            return value, 'MISS', 0
+        if not fresh:
+            self.refresh(key, refresh_compute or compute)
+            return value, 'STALE', age
+        return value, 'HIT', age
+
+    def refresh(self, key, compute):
+        """Recompute a key in the background unless a refresh for it is already running"""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            if self._refresh_executor is None:
+                self._refresh_executor = ThreadPoolExecutor(
+                    max_workers=self.refresh_workers,
+                    thread_name_prefix='pricepulse-refresh'
+                )
+        self._refresh_executor.submit(self._run_refresh, key, compute)
+        return True
+
+    def reset_after_fork(self):
+        """Forget the parent's refresh workers in a forked child; the entries stay valid"""
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._refresh_executor = None
+
+    def _run_refresh(self, key, compute):
+        try:
+            value = compute()
+            # Keep serving the stale result rather than replacing it with a total failure
+            if isinstance(value, dict) and 'error' in value:
+                with self._lock:
+                    self.refresh_failures += 1
+                return
+            self.set(key, value)
+            with self._lock:
+                self.refreshes += 1
+        except Exception:
+            with self._lock:
+                self.refresh_failures += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "refreshes": self.refreshes,
+                "refreshes_running": len(self._refreshing),
+                "refresh_failures": self.refresh_failures
+            }
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry[1]
+
+# Cache shared by the /compare routes
+comparison_cache = ResultCache()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=comparison_cache.reset_after_fork)
@@ -1,44 +1,339 @@
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.builder import builder_registry
+import os
 import time
 import re
+import threading
+from contextvars import copy_context
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urljoin, quote_plus
 import random
 
-def scrape_with_retry(scraper_func, query, max_retries=2):
-    """Helper function to retry scraping with exponential backoff"""
+from http_pool import get_session
+from selector_stats import selector_stats
+from rate_limiter import rate_limiter
+from circuit_breaker import OPEN, platform_breakers, unavailable_result
+from extraction import ExtractionPlan, simple_selector_matcher
+from prices import is_plain_number, with_price_paise
+from metrics import (FETCH_SECONDS, PARSE_SECONDS, EXTRACT_SECONDS, RESPONSE_BYTES, SCRAPE_RETRIES,
+                     SCRAPE_ERRORS, HTTP_STATUS, PLATFORM_IN_FLIGHT)
+from tracing import span
+
+# Base URL of each platform (can be pointed at a local stand-in server)
+FLIPKART_URL = "https://www.flipkart.com"
+AMAZON_URL = "https://www.amazon.in"
+RELIANCE_URL = "https://www.reliancedigital.in"
+
+# Seconds to wait for a platform to answer a search request
+REQUEST_TIMEOUT = 25
+
+# Seconds before the first retry of an unavailable platform; doubled per attempt up to the cap
+RETRY_BACKOFF = float(os.environ.get('PRICEPULSE_RETRY_BACKOFF', '0.5'))
+RETRY_MAX_BACKOFF = float(os.environ.get('PRICEPULSE_RETRY_MAX_BACKOFF', '4'))
+
+# BeautifulSoup tree builder: 'html.parser' (pure Python) or 'lxml' (C, if installed)
+PARSER_BACKEND = os.environ.get('PRICEPULSE_PARSER', 'html.parser')
+if builder_registry.lookup(PARSER_BACKEND) is None:
+    # Requested backend is not installed
+    PARSER_BACKEND = 'html.parser'
+
+# Build only the product-grid subtrees of each page instead of the whole document
+PARSE_PRODUCT_GRID_ONLY = os.environ.get('PRICEPULSE_PARSE_GRID_ONLY', '0') == '1'
+
+# Extract name, price and link with one walk per container instead of a select_one per selector
+COMPILED_EXTRACTION = os.environ.get('PRICEPULSE_EXTRACTION', 'compiled') != 'select'
+
+# Scrape all platforms at once instead of one after another
+PARALLEL_SCRAPING = os.environ.get('PRICEPULSE_PARALLEL', '1') != '0'
+
+# Upper bound on scraper threads shared by all in-flight comparisons
+MAX_SCRAPER_WORKERS = int(os.environ.get('PRICEPULSE_SCRAPER_WORKERS', '12'))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_executor():
+    """Return the process-wide thread pool used to fan out platform scrapes"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=MAX_SCRAPER_WORKERS,
+                    thread_name_prefix='pricepulse-scraper'
+                )
+    return _executor
+
+def _forget_executor():
+    """A forked worker inherits the pool object but none of its threads; start a new one on first use"""
+    global _executor, _executor_lock
+    _executor = None
+    _executor_lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_executor)
+
+# Status codes that mean the platform is down or refusing us, rather than answering the search
+OUTAGE_STATUSES = {403, 429}
+
+# Markers of a CAPTCHA or bot-check page served instead of search results
+BLOCK_PAGE_PATTERN = re.compile(
+    rb'validateCaptcha|<form[^>]*captcha|g-recaptcha|are you a human|robot check', re.IGNORECASE
+)
+
+class PlatformBlocked(Exception):
+    """The platform answered with a CAPTCHA or bot-check page"""
+
+class PlatformFailure(list):
+    """
+    Error entries for a search the platform could not answer: a timeout,
+    connection error, 5xx/403/429 status or block page. Only these count
+    against the platform's circuit breaker and are worth retrying; a page
+    without products loaded fine and would come back the same.
+    """
+
+def is_failed_result(result):
+    """True when a scraper returned only error entries"""
+    return isinstance(result, list) and all(isinstance(item, dict) and 'error' in item for item in result)
+
+def is_outage(error):
+    """True if a request exception means the platform is unavailable"""
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return status >= 500 or status in OUTAGE_STATUSES
+    return isinstance(error, (requests.RequestException, PlatformBlocked))
+
+def looks_blocked(content):
+    return BLOCK_PAGE_PATTERN.search(content) is not None
+
+def retry_delay(attempt):
+    """Seconds to wait after failed attempt number `attempt`: exponential, capped, with jitter so retries spread out"""
+    delay = min(RETRY_MAX_BACKOFF, RETRY_BACKOFF * 2 ** attempt)
+    return random.uniform(delay / 2, delay)
+
+def should_back_off(breaker):
+    """False once the platform's breaker is open: the next attempt fails fast, so waiting for it is pointless"""
+    return breaker is None or breaker.state != OPEN
+
+def scrape_with_retry(scraper_func, query, max_retries=2, platform=None):
+    """
+    Helper function to retry scraping.
+
+    Failed attempts are retried after a jittered exponential backoff. With a
+    platform, its circuit breaker is consulted too: once it opens, the wait is
+    skipped and a fast "temporarily unavailable" entry is returned without
+    contacting the site again.
+    """
+    breaker = platform_breakers.get(platform) if platform else None
+    result = None
     for attempt in range(max_retries + 1):
+        if breaker is not None and not breaker.allow():
+            return result if result is not None else unavailable_result(platform, breaker)
+        if attempt:
+            SCRAPE_RETRIES.inc(platform or scraper_func.__name__)
         try:
-            result = scraper_func(query)
-            # Check if result contains actual data (not just errors)
-            if isinstance(result, list):
-                # Check if all items are errors
-                all_errors = all(isinstance(item, dict) and 'error' in item for item in result)
-                if not all_errors or attempt == max_retries:
-                    return result
-            else:
+            with span('scrape', platform):
+                result = scraper_func(query)
+            outage = isinstance(result, PlatformFailure)
+            if breaker is not None:
+                if outage:
+                    breaker.record(False)
+                elif is_failed_result(result):
+                    # The site answered, it just had no products: no evidence either way
+                    breaker.record_answered()
+                else:
+                    breaker.record(True)
+            # Only an unavailable platform is worth asking again
+            if not outage or attempt == max_retries:
                 return result
                 
             # If we got here, all items were errors and we have retries left
-            if attempt < max_retries:
-                # Exponential backoff: 2s, 4s, 8s, etc.
-                wait_time = 2 ** (attempt + 1)
-                time.sleep(wait_time)
-                
+            if should_back_off(breaker):
+                with span('backoff', platform):
+                    time.sleep(retry_delay(attempt))
+
         except Exception as e:
+            if breaker is not None:
+                breaker.record(False)
             if attempt == max_retries:
                 return [{"error": f"Failed after {max_retries + 1} attempts: {str(e)[:100]}..."}]
-            # Wait before retry
-            wait_time = 2 ** (attempt + 1)
-            time.sleep(wait_time)
+            if should_back_off(breaker):
+                with span('backoff', platform):
+                    time.sleep(retry_delay(attempt))
     
     return [{"error": "Max retries exceeded"}]
 
-def scrape_flipkart_prices(query):
-    """Scrape product prices from Flipkart with improved error handling and retry logic"""
-    if not query:
-        return [{"error": "Query parameter is required"}]
-    
+# Product container selectors for each platform (current and fallback patterns)
+FLIPKART_CONTAINER_PATTERNS = [
+    'div._13oc-S',  # Current common pattern
+    'div._2kHMtA',  # Older pattern
+    '[data-id]',    # Generic data attribute
+    'div._1AtVbE',  # Another common pattern
+    'div.col'       # Fallback
+]
+
+AMAZON_CONTAINER_PATTERNS = [
+    'div[data-component-type="s-search-result"]',
+    'div.s-result-item',
+    'div.sg-col',
+    'div.a-section'
+]
+
+RELIANCE_CONTAINER_PATTERNS = [
+    'li.product-item',
+    'div.plp-product-details',
+    'div.product-item',
+    'div.col-md-3'
+]
+
+# Name and price selectors tried inside each product container
+FLIPKART_NAME_SELECTORS = [
+    'a[title]',
+    'div._4rR01T',
+    'a.s1Q9rs',
+    'div._2WkVRV',
+    'a.IRpwTa'
+]
+
+FLIPKART_PRICE_SELECTORS = [
+    'div._30jeq3',
+    'div._25b18c',
+    'div._30jeq3._1_WHN1',
+    'div._1vC4OE'
+]
+
+AMAZON_NAME_SELECTORS = [
+    'h2 a span',
+    'span.a-size-base-plus',
+    'h2 span.a-text-normal',
+    'div.a-row a span'
+]
+
+AMAZON_PRICE_SELECTORS = [
+    'span.a-price-whole',
+    'span.a-offscreen',
+    'span.a-price span.a-offscreen'
+]
+
+RELIANCE_NAME_SELECTORS = [
+    'p.sp__name',
+    'div.product-name',
+    'h3.product-title a'
+]
+
+RELIANCE_PRICE_SELECTORS = [
+    'span.sc__price--current',
+    'span.price',
+    'div.price'
+]
+
+def _accept_text(elem):
+    """Element text, or None if it is empty"""
+    return elem.get_text(strip=True) or None
+
+def _accept_any_text(elem):
+    return elem.get_text(strip=True)
+
+def _accept_amazon_name(elem):
+    name_text = elem.get_text(strip=True)
+    return name_text if name_text and len(name_text) > 2 else None
+
+def _accept_amazon_price(elem):
+    price_text = elem.get_text(strip=True)
+    if price_text and ('₹' in price_text or is_plain_number(price_text)):
+        return "₹" + price_text if not price_text.startswith("₹") else price_text
+    return None
+
+# Single-pass extraction plan for each platform, equivalent to the extract_*_products loops
+EXTRACTION_PLANS = {
+    "Flipkart": ExtractionPlan(
+        "Flipkart", FLIPKART_NAME_SELECTORS, FLIPKART_PRICE_SELECTORS, 'a',
+        accept_name=_accept_text, accept_price=_accept_text
+    ),
+    "Amazon": ExtractionPlan(
+        "Amazon", AMAZON_NAME_SELECTORS, AMAZON_PRICE_SELECTORS, 'h2 a, a.a-link-normal',
+        accept_name=_accept_amazon_name, accept_price=_accept_amazon_price
+    ),
+    "Reliance Digital": ExtractionPlan(
+        "Reliance Digital", RELIANCE_NAME_SELECTORS, RELIANCE_PRICE_SELECTORS, 'a',
+        accept_name=_accept_any_text, accept_price=_accept_any_text
+    )
+}
+
+# Container selectors used to build each platform's parse-only strainer
+PLATFORM_CONTAINER_PATTERNS = {
+    "Flipkart": FLIPKART_CONTAINER_PATTERNS,
+    "Amazon": AMAZON_CONTAINER_PATTERNS,
+    "Reliance Digital": RELIANCE_CONTAINER_PATTERNS
+}
+
+_grid_strainers = {}
+
+def product_grid_strainer(platform):
+    """SoupStrainer keeping only the subtrees that match a platform's container selectors"""
+    strainer = _grid_strainers.get(platform)
+    if strainer is None:
+        matchers = [simple_selector_matcher(pattern) for pattern in PLATFORM_CONTAINER_PATTERNS[platform]]
+        strainer = SoupStrainer(lambda name, attrs: any(match(name, attrs) for match in matchers))
+        _grid_strainers[platform] = strainer
+    return strainer
+
+def make_soup(content, platform=None, backend=None, grid_only=None):
+    """Parse a page with the configured backend, optionally keeping only the product grid"""
+    if grid_only is None:
+        grid_only = PARSE_PRODUCT_GRID_ONLY
+    parse_only = product_grid_strainer(platform) if grid_only and platform else None
+    if platform is None:
+        return BeautifulSoup(content, backend or PARSER_BACKEND, parse_only=parse_only)
+    with span('parse', platform), PARSE_SECONDS.time(platform):
+        return BeautifulSoup(content, backend or PARSER_BACKEND, parse_only=parse_only)
+
+def error_category(error):
+    """Metrics label for a failed platform request"""
+    if isinstance(error, PlatformBlocked):
+        return 'blocked'
+    if isinstance(error, requests.Timeout):
+        return 'timeout'
+    if isinstance(error, requests.HTTPError):
+        return 'http_status'
+    if isinstance(error, requests.ConnectionError):
+        return 'connection'
+    if isinstance(error, requests.RequestException):
+        return 'network'
+    return 'other'
+
+def fetch_search_page(platform, search_url, headers):
+    """Download a platform's results page, recording its latency, size, status code and any failure"""
+    # Wait only if this host's request budget is used up
+    with span('rate-limit', platform):
+        rate_limiter.acquire(search_url)
+    try:
+        with span('fetch', platform), PLATFORM_IN_FLIGHT.track(platform), FETCH_SECONDS.time(platform):
+            response = get_session(search_url).get(search_url, headers=headers, timeout=REQUEST_TIMEOUT)
+        HTTP_STATUS.inc(platform, str(response.status_code))
+        RESPONSE_BYTES.observe(len(response.content), platform)
+        response.raise_for_status()
+        if looks_blocked(response.content):
+            raise PlatformBlocked(f"{platform} served a CAPTCHA page")
+    except Exception as e:
+        SCRAPE_ERRORS.inc(platform, error_category(e))
+        raise
+    return response.content
+
+def parse_search_page(platform, content):
+    """Parse a downloaded results page, counting pages without products"""
+    try:
+        result = PLATFORM_PARSERS[platform](content)
+    except Exception:
+        SCRAPE_ERRORS.inc(platform, 'other')
+        raise
+    if is_failed_result(result):
+        SCRAPE_ERRORS.inc(platform, 'no_products')
+    return result
+
+def build_flipkart_request(query):
+    """Return the search URL and browser-like headers for a Flipkart search"""
     # More realistic headers to avoid detection
     headers = {
         'User-Agent': random.choice([
@@ -57,127 +352,125 @@ def scrape_flipkart_prices(query):
         'Cache-Control': 'max-age=0'
     }
     
-    try:
-        search_url = f"https://www.flipkart.com/search?q={quote_plus(query)}"
-        
-        # Add a random delay to mimic human behavior
-        time.sleep(random.uniform(1, 3))
-        
-        response = requests.get(search_url, headers=headers, timeout=25)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        products = []
-        
-        # Try multiple container selectors (current and fallback patterns)
-        container_patterns = [
-            'div._13oc-S',  # Current common pattern
-            'div._2kHMtA',  # Older pattern
-            '[data-id]',    # Generic data attribute
-            'div._1AtVbE',  # Another common pattern
-            'div.col'       # Fallback
-        ]
-        
+    search_url = f"{FLIPKART_URL}/search?q={quote_plus(query)}"
+    return search_url, headers
+
+def extract_flipkart_products(product_containers):
+    """Extract products from Flipkart containers with one select_one call per selector"""
+    products = []
+
+    # Try multiple selectors for product details
+    for container in product_containers:
+        try:
+            # Try multiple name selectors
+            name = None
+            for selector in selector_stats.ordered("Flipkart", "name", FLIPKART_NAME_SELECTORS):
+                try:
+                    name_elem = container.select_one(selector)
+                    if name_elem:
+                        name = name_elem.get_text(strip=True)
+                    selector_stats.record("Flipkart", "name", selector, bool(name), FLIPKART_NAME_SELECTORS)
+                    if name:
+                        break
+                except:
+                    continue
+
+            if not name:
+                continue
+
+            # Try multiple price selectors
+            price = None
+            for selector in selector_stats.ordered("Flipkart", "price", FLIPKART_PRICE_SELECTORS):
+                try:
+                    price_elem = container.select_one(selector)
+                    if price_elem:
+                        price_text = price_elem.get_text(strip=True)
+                        if price_text:
+                            price = price_text
+                    selector_stats.record("Flipkart", "price", selector, bool(price), FLIPKART_PRICE_SELECTORS)
+                    if price:
+                        break
+                except:
+                    continue
+
+            if not price:
+                continue
+
+            # Try to get link
+            link = FLIPKART_URL
+            try:
+                link_elem = container.find('a')
+                if link_elem and link_elem.get('href'):
+                    link = urljoin(FLIPKART_URL, link_elem['href'])
+            except:
+                pass
+
+            products.append({
+                "name": name[:100] + "..." if len(name) > 100 else name,
+                "price": price,
+                "link": link
+            })
+
+            if len(products) >= 3:
+                break
+
+        except Exception:
+            # Skip this product if we can't extract data
+            continue
+
+    return products
+
+def parse_flipkart_html(content):
+    """Extract up to 3 products from a Flipkart search results page"""
+    soup = make_soup(content, "Flipkart")
+    with span('extract', "Flipkart"), EXTRACT_SECONDS.time("Flipkart"):
+        # Try multiple container selectors, best recent performer first
         product_containers = []
-        for pattern in container_patterns:
+        for pattern in selector_stats.ordered("Flipkart", "container", FLIPKART_CONTAINER_PATTERNS):
             try:
                 containers = soup.select(pattern)
+                selector_stats.record("Flipkart", "container", pattern, len(containers) > 0, FLIPKART_CONTAINER_PATTERNS)
                 if len(containers) > 0:
                     product_containers = containers[:5]  # Limit to 5 products
                     break
             except:
                 continue
-        
+
         if not product_containers:
             return [{"error": "No products found on Flipkart. Website structure may have changed."}]
+
+        if COMPILED_EXTRACTION:
+            products = EXTRACTION_PLANS["Flipkart"].extract(product_containers, FLIPKART_URL)
+        else:
+            products = extract_flipkart_products(product_containers)
+
+        return with_price_paise(products) if products else [{"error": "No products found on Flipkart"}]
+
+def scrape_flipkart_prices(query):
+    """Scrape product prices from Flipkart with improved error handling and retry logic"""
+    if not query:
+        return [{"error": "Query parameter is required"}]
+    
+    search_url, headers = build_flipkart_request(query)
+    
+    try:
+        content = fetch_search_page("Flipkart", search_url, headers)
+        return parse_search_page("Flipkart", content)
         
-        # Try multiple selectors for product details
-        for container in product_containers:
-            try:
-                # Try multiple name selectors
-                name = None
-                name_selectors = [
-                    'a[title]',
-                    'div._4rR01T',
-                    'a.s1Q9rs',
-                    'div._2WkVRV',
-                    'a.IRpwTa'
-                ]
-                
-                for selector in name_selectors:
-                    try:
-                        name_elem = container.select_one(selector)
-                        if name_elem:
-                            name = name_elem.get_text(strip=True)
-                            if name:
-                                break
-                    except:
-                        continue
-                
-                if not name:
-                    continue
-                
-                # Try multiple price selectors
-                price = None
-                price_selectors = [
-                    'div._30jeq3',
-                    'div._25b18c',
-                    'div._30jeq3._1_WHN1',
-                    'div._1vC4OE'
-                ]
-                
-                for selector in price_selectors:
-                    try:
-                        price_elem = container.select_one(selector)
-                        if price_elem:
-                            price_text = price_elem.get_text(strip=True)
-                            if price_text:
-                                price = price_text
-                                break
-                    except:
-                        continue
-                
-                if not price:
-                    continue
-                
-                # Try to get link
-                link = "https://www.flipkart.com"
-                try:
-                    link_elem = container.find('a')
-                    if link_elem and link_elem.get('href'):
-                        link = urljoin("https://www.flipkart.com", link_elem['href'])
-                except:
-                    pass
-                
-                products.append({
-                    "name": name[:100] + "..." if len(name) > 100 else name,
-                    "price": price,
-                    "link": link
-                })
-                
-                if len(products) >= 3:
-                    break
-                    
-            except Exception:
-                # Skip this product if we can't extract data
-                continue
-        
-        return products if products else [{"error": "No products found on Flipkart"}]
-        
+    except PlatformBlocked:
+        return PlatformFailure([{"error": "Flipkart asked for a CAPTCHA. Please try again later."}])
     except requests.Timeout:
-        return [{"error": "Flipkart is taking too long to respond. Please try again later."}]
+        return PlatformFailure([{"error": "Flipkart is taking too long to respond. Please try again later."}])
     except requests.ConnectionError:
-        return [{"error": "Unable to connect to Flipkart. Check your internet connection."}]
+        return PlatformFailure([{"error": "Unable to connect to Flipkart. Check your internet connection."}])
     except requests.RequestException as e:
-        return [{"error": f"Network error with Flipkart: {str(e)[:50]}..."}]
+        entries = [{"error": f"Network error with Flipkart: {str(e)[:50]}..."}]
+        return PlatformFailure(entries) if is_outage(e) else entries
     except Exception as e:
         return [{"error": f"Error scraping Flipkart: {str(e)[:50]}..."}]
 
-def scrape_amazon_prices(query):
-    """Scrape product prices from Amazon with improved error handling and retry logic"""
-    if not query:
-        return [{"error": "Query parameter is required"}]
-    
+def build_amazon_request(query):
+    """Return the search URL and browser-like headers for an Amazon search"""
     # More realistic headers
     headers = {
         'User-Agent': random.choice([
@@ -196,125 +489,127 @@ def scrape_amazon_prices(query):
         'Cache-Control': 'max-age=0'
     }
     
-    try:
-        search_url = f"https://www.amazon.in/s?k={quote_plus(query)}"
-        
-        # Add delay to mimic human behavior
-        time.sleep(random.uniform(1, 3))
-        
-        response = requests.get(search_url, headers=headers, timeout=25)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        products = []
-        
-        # Try multiple container selectors
-        container_patterns = [
-            'div[data-component-type="s-search-result"]',
-            'div.s-result-item',
-            'div.sg-col',
-            'div.a-section'
-        ]
-        
+    search_url = f"{AMAZON_URL}/s?k={quote_plus(query)}"
+    return search_url, headers
+
+def extract_amazon_products(product_containers):
+    """Extract products from Amazon containers with one select_one call per selector"""
+    products = []
+
+    # Try to extract product details
+    for container in product_containers:
+        try:
+            # Try multiple name selectors
+            name = None
+            for selector in selector_stats.ordered("Amazon", "name", AMAZON_NAME_SELECTORS):
+                try:
+                    name_elem = container.select_one(selector)
+                    if name_elem:
+                        name_text = name_elem.get_text(strip=True)
+                        if name_text and len(name_text) > 2:
+                            name = name_text
+                    selector_stats.record("Amazon", "name", selector, bool(name), AMAZON_NAME_SELECTORS)
+                    if name:
+                        break
+                except:
+                    continue
+
+            if not name:
+                continue
+
+            # Try multiple price selectors
+            price = None
+            for selector in selector_stats.ordered("Amazon", "price", AMAZON_PRICE_SELECTORS):
+                try:
+                    price_elem = container.select_one(selector)
+                    if price_elem:
+                        price_text = price_elem.get_text(strip=True)
+                        if price_text and ('₹' in price_text or is_plain_number(price_text)):
+                            price = "₹" + price_text if not price_text.startswith("₹") else price_text
+                    selector_stats.record("Amazon", "price", selector, bool(price), AMAZON_PRICE_SELECTORS)
+                    if price:
+                        break
+                except:
+                    continue
+
+            if not price:
+                continue
+
+            # Try to get link
+            link = AMAZON_URL
+            try:
+                link_elem = container.select_one('h2 a, a.a-link-normal')
+                if link_elem and link_elem.get('href'):
+                    link = urljoin(AMAZON_URL, link_elem['href'])
+            except:
+                pass
+
+            products.append({
+                "name": name[:100] + "..." if len(name) > 100 else name,
+                "price": price,
+                "link": link
+            })
+
+            if len(products) >= 3:
+                break
+
+        except Exception:
+            # Skip this product if we can't extract data
+            continue
+
+    return products
+
+def parse_amazon_html(content):
+    """Extract up to 3 products from an Amazon search results page"""
+    soup = make_soup(content, "Amazon")
+    with span('extract', "Amazon"), EXTRACT_SECONDS.time("Amazon"):
+        # Try multiple container selectors, best recent performer first
         product_containers = []
-        for pattern in container_patterns:
+        for pattern in selector_stats.ordered("Amazon", "container", AMAZON_CONTAINER_PATTERNS):
             try:
                 containers = soup.select(pattern)
+                selector_stats.record("Amazon", "container", pattern, len(containers) > 0, AMAZON_CONTAINER_PATTERNS)
                 if len(containers) > 0:
                     product_containers = containers[:5]
                     break
             except:
                 continue
-        
+
         if not product_containers:
             return [{"error": "No products found on Amazon. Website structure may have changed."}]
+
+        if COMPILED_EXTRACTION:
+            products = EXTRACTION_PLANS["Amazon"].extract(product_containers, AMAZON_URL)
+        else:
+            products = extract_amazon_products(product_containers)
+
+        return with_price_paise(products) if products else [{"error": "No products found on Amazon"}]
+
+def scrape_amazon_prices(query):
+    """Scrape product prices from Amazon with improved error handling and retry logic"""
+    if not query:
+        return [{"error": "Query parameter is required"}]
+    
+    search_url, headers = build_amazon_request(query)
+    
+    try:
+        content = fetch_search_page("Amazon", search_url, headers)
+        return parse_search_page("Amazon", content)
         
-        # Try to extract product details
-        for container in product_containers:
-            try:
-                # Try multiple name selectors
-                name = None
-                name_selectors = [
-                    'h2 a span',
-                    'span.a-size-base-plus',
-                    'h2 span.a-text-normal',
-                    'div.a-row a span'
-                ]
-                
-                for selector in name_selectors:
-                    try:
-                        name_elem = container.select_one(selector)
-                        if name_elem:
-                            name_text = name_elem.get_text(strip=True)
-                            if name_text and len(name_text) > 2:
-                                name = name_text
-                                break
-                    except:
-                        continue
-                
-                if not name:
-                    continue
-                
-                # Try multiple price selectors
-                price = None
-                price_selectors = [
-                    'span.a-price-whole',
-                    'span.a-offscreen',
-                    'span.a-price span.a-offscreen'
-                ]
-                
-                for selector in price_selectors:
-                    try:
-                        price_elem = container.select_one(selector)
-                        if price_elem:
-                            price_text = price_elem.get_text(strip=True)
-                            if price_text and ('₹' in price_text or price_text.replace(',', '').replace('.', '').isdigit()):
-                                price = "₹" + price_text if not price_text.startswith("₹") else price_text
-                                break
-                    except:
-                        continue
-                
-                if not price:
-                    continue
-                
-                # Try to get link
-                link = "https://www.amazon.in"
-                try:
-                    link_elem = container.select_one('h2 a, a.a-link-normal')
-                    if link_elem and link_elem.get('href'):
-                        link = urljoin("https://www.amazon.in", link_elem['href'])
-                except:
-                    pass
-                
-                products.append({
-                    "name": name[:100] + "..." if len(name) > 100 else name,
-                    "price": price,
-                    "link": link
-                })
-                
-                if len(products) >= 3:
-                    break
-                    
-            except Exception:
-                # Skip this product if we can't extract data
-                continue
-        
-        return products if products else [{"error": "No products found on Amazon"}]
-        
+    except PlatformBlocked:
+        return PlatformFailure([{"error": "Amazon asked for a CAPTCHA. Please try again later."}])
     except requests.Timeout:
-        return [{"error": "Amazon is taking too long to respond. Please try again later."}]
+        return PlatformFailure([{"error": "Amazon is taking too long to respond. Please try again later."}])
     except requests.ConnectionError:
-        return [{"error": "Unable to connect to Amazon. Check your internet connection."}]
+        return PlatformFailure([{"error": "Unable to connect to Amazon. Check your internet connection."}])
     except requests.RequestException as e:
-        return [{"error": f"Network error with Amazon: {str(e)[:50]}..."}]
+        entries = [{"error": f"Network error with Amazon: {str(e)[:50]}..."}]
+        return PlatformFailure(entries) if is_outage(e) else entries
     except Exception as e:
         return [{"error": f"Error scraping Amazon: {str(e)[:50]}..."}]
 
-def scrape_reliance_prices(query):
-    """Scrape product prices from Reliance Digital with improved error handling and retry logic"""
-    if not query:
-        return [{"error": "Query parameter is required"}]
-    
+def build_reliance_request(query):
+    """Return the search URL and browser-like headers for a Reliance Digital search"""
     headers = {
         'User-Agent': random.choice([
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -327,133 +622,147 @@ def scrape_reliance_prices(query):
         'Upgrade-Insecure-Requests': '1'
     }
     
-    try:
-        search_url = f"https://www.reliancedigital.in/search?q={quote_plus(query)}:relevance"
-        
-        # Add delay
-        time.sleep(random.uniform(1, 3))
-        
-        response = requests.get(search_url, headers=headers, timeout=25)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        products = []
-        
-        # Try multiple container selectors
-        container_patterns = [
-            'li.product-item',
-            'div.plp-product-details',
-            'div.product-item',
-            'div.col-md-3'
-        ]
-        
+    search_url = f"{RELIANCE_URL}/search?q={quote_plus(query)}:relevance"
+    return search_url, headers
+
+def extract_reliance_products(product_containers):
+    """Extract products from Reliance Digital containers with one select_one call per selector"""
+    products = []
+
+    # Extract product details
+    for container in product_containers:
+        try:
+            # Try to get name
+            name_elem = None
+            for selector in selector_stats.ordered("Reliance Digital", "name", RELIANCE_NAME_SELECTORS):
+                try:
+                    name_elem = container.select_one(selector)
+                    selector_stats.record("Reliance Digital", "name", selector, bool(name_elem), RELIANCE_NAME_SELECTORS)
+                    if name_elem:
+                        break
+                except:
+                    continue
+
+            if not name_elem:
+                continue
+
+            name = name_elem.get_text(strip=True)
+
+            # Try to get price
+            price_elem = None
+            for selector in selector_stats.ordered("Reliance Digital", "price", RELIANCE_PRICE_SELECTORS):
+                try:
+                    price_elem = container.select_one(selector)
+                    selector_stats.record("Reliance Digital", "price", selector, bool(price_elem), RELIANCE_PRICE_SELECTORS)
+                    if price_elem:
+                        break
+                except:
+                    continue
+
+            if not price_elem:
+                continue
+
+            price = price_elem.get_text(strip=True)
+
+            # Try to get link
+            link = RELIANCE_URL
+            try:
+                link_elem = container.find('a')
+                if link_elem and link_elem.get('href'):
+                    link = urljoin(RELIANCE_URL, link_elem['href'])
+            except:
+                pass
+
+            products.append({
+                "name": name[:100] + "..." if len(name) > 100 else name,
+                "price": price,
+                "link": link
+            })
+
+            if len(products) >= 3:
+                break
+
+        except Exception:
+            # Skip this product if we can't extract data
+            continue
+
+    return products
+
+def parse_reliance_html(content):
+    """Extract up to 3 products from a Reliance Digital search results page"""
+    soup = make_soup(content, "Reliance Digital")
+    with span('extract', "Reliance Digital"), EXTRACT_SECONDS.time("Reliance Digital"):
+        # Try multiple container selectors, best recent performer first
         product_containers = []
-        for pattern in container_patterns:
+        for pattern in selector_stats.ordered("Reliance Digital", "container", RELIANCE_CONTAINER_PATTERNS):
             try:
                 containers = soup.select(pattern)
+                selector_stats.record("Reliance Digital", "container", pattern, len(containers) > 0, RELIANCE_CONTAINER_PATTERNS)
                 if len(containers) > 0:
                     product_containers = containers[:5]
                     break
             except:
                 continue
-        
+
         if not product_containers:
             return [{"error": "No products found on Reliance Digital. Website structure may have changed."}]
+
+        if COMPILED_EXTRACTION:
+            products = EXTRACTION_PLANS["Reliance Digital"].extract(product_containers, RELIANCE_URL)
+        else:
+            products = extract_reliance_products(product_containers)
+
+        return with_price_paise(products) if products else [{"error": "No products found on Reliance Digital"}]
+
+def scrape_reliance_prices(query):
+    """Scrape product prices from Reliance Digital with improved error handling and retry logic"""
+    if not query:
+        return [{"error": "Query parameter is required"}]
+    
+    search_url, headers = build_reliance_request(query)
+    
+    try:
+        content = fetch_search_page("Reliance Digital", search_url, headers)
+        return parse_search_page("Reliance Digital", content)
         
-        # Extract product details
-        for container in product_containers:
-            try:
-                # Try to get name
-                name_elem = None
-                name_selectors = [
-                    'p.sp__name',
-                    'div.product-name',
-                    'h3.product-title a'
-                ]
-                
-                for selector in name_selectors:
-                    try:
-                        elem = container.select_one(selector)
-                        if elem:
-                            name_elem = elem
-                            break
-                    except:
-                        continue
-                
-                if not name_elem:
-                    continue
-                    
-                name = name_elem.get_text(strip=True)
-                
-                # Try to get price
-                price_elem = None
-                price_selectors = [
-                    'span.sc__price--current',
-                    'span.price',
-                    'div.price'
-                ]
-                
-                for selector in price_selectors:
-                    try:
-                        elem = container.select_one(selector)
-                        if elem:
-                            price_elem = elem
-                            break
-                    except:
-                        continue
-                
-                if not price_elem:
-                    continue
-                    
-                price = price_elem.get_text(strip=True)
-                
-                # Try to get link
-                link = "https://www.reliancedigital.in"
-                try:
-                    link_elem = container.find('a')
-                    if link_elem and link_elem.get('href'):
-                        link = urljoin("https://www.reliancedigital.in", link_elem['href'])
-                except:
-                    pass
-                
-                products.append({
-                    "name": name[:100] + "..." if len(name) > 100 else name,
-                    "price": price,
-                    "link": link
-                })
-                
-                if len(products) >= 3:
-                    break
-                    
-            except Exception:
-                # Skip this product if we can't extract data
-                continue
-        
-        return products if products else [{"error": "No products found on Reliance Digital"}]
-        
+    except PlatformBlocked:
+        return PlatformFailure([{"error": "Reliance Digital asked for a CAPTCHA. Please try again later."}])
     except requests.Timeout:
-        return [{"error": "Reliance Digital is taking too long to respond. Please try again later."}]
+        return PlatformFailure([{"error": "Reliance Digital is taking too long to respond. Please try again later."}])
     except requests.ConnectionError:
-        return [{"error": "Unable to connect to Reliance Digital. Check your internet connection."}]
+        return PlatformFailure([{"error": "Unable to connect to Reliance Digital. Check your internet connection."}])
     except requests.RequestException as e:
-        return [{"error": f"Network error with Reliance Digital: {str(e)[:50]}..."}]
+        entries = [{"error": f"Network error with Reliance Digital: {str(e)[:50]}..."}]
+        return PlatformFailure(entries) if is_outage(e) else entries
     except Exception as e:
         return [{"error": f"Error scraping Reliance Digital: {str(e)[:50]}..."}]
 
-def get_price_comparison(query):
-    """Get price comparison from all websites with improved error handling and retry logic"""
-    if not query:
-        return {"error": "Query parameter is required"}
-    
-    # Get results from all scrapers with retry logic
-    flipkart_results = scrape_with_retry(scrape_flipkart_prices, query)
-    amazon_results = scrape_with_retry(scrape_amazon_prices, query)
-    reliance_results = scrape_with_retry(scrape_reliance_prices, query)
-    
+# Scraper for each platform, in the order results are reported
+PLATFORM_SCRAPERS = {
+    "Flipkart": scrape_flipkart_prices,
+    "Amazon": scrape_amazon_prices,
+    "Reliance Digital": scrape_reliance_prices
+}
+
+# Request builder and page parser for each platform, used by engines that do their own fetching
+PLATFORM_REQUESTS = {
+    "Flipkart": build_flipkart_request,
+    "Amazon": build_amazon_request,
+    "Reliance Digital": build_reliance_request
+}
+
+PLATFORM_PARSERS = {
+    "Flipkart": parse_flipkart_html,
+    "Amazon": parse_amazon_html,
+    "Reliance Digital": parse_reliance_html
+}
+
+def combine_platform_results(platform_results):
+    """Return the per-platform results, or a single error if every platform failed"""
     # Check if all scrapers failed with errors
     all_failed = True
     
-    for results in [flipkart_results, amazon_results, reliance_results]:
+    for results in platform_results.values():
         if isinstance(results, list) and len(results) > 0:
             # Check if all items are errors
             all_errors = all(isinstance(item, dict) and 'error' in item for item in results)
@@ -476,8 +785,44 @@ def get_price_comparison(query):
                      "- Restart the application"
         }
     
+    return platform_results
+
+def get_price_comparison(query, parallel=None):
+    """Get price comparison from all websites with improved error handling and retry logic"""
+    if not query:
+        return {"error": "Query parameter is required"}
+    
+    if parallel is None:
+        parallel = PARALLEL_SCRAPING
+    
+    # Get results from all scrapers with retry logic
+    if parallel:
+        # Fan out on the shared pool so the wait is the slowest platform, not the sum;
+        # each task runs in a copy of this context so its spans join the request's trace
+        futures = {
+            platform: get_executor().submit(copy_context().run, scrape_with_retry, scraper_func, query,
+                                            platform=platform)
+            for platform, scraper_func in PLATFORM_SCRAPERS.items()
+        }
+        platform_results = {platform: future.result() for platform, future in futures.items()}
+    else:
+        platform_results = {
+            platform: scrape_with_retry(scraper_func, query, platform=platform)
+            for platform, scraper_func in PLATFORM_SCRAPERS.items()
+        }
+    
+    return combine_platform_results(platform_results)
+
+def start_price_comparison(query):
+    """Submit every platform's scrape to the pool; returns {future: platform}"""
     return {
-        "Flipkart": flipkart_results,
-        "Amazon": amazon_results,
-        "Reliance Digital": reliance_results
+        get_executor().submit(copy_context().run, scrape_with_retry, scraper_func, query,
+                              platform=platform): platform
+        for platform, scraper_func in PLATFORM_SCRAPERS.items()
     }
+
+def iter_price_comparison(query):
+    """Yield (platform, results) for each platform as soon as it finishes, fastest first"""
+    futures = start_price_comparison(query)
+    for future in as_completed(futures):
+        yield futures[future], future.result()
@@ -0,0 +1,77 @@
+"""
+Selector statistics for PricePulse scrapers
+
+Each scraper tries lists of CSS selectors (containers, names, prices) until
+one matches. This module remembers how often each candidate currently works
+and hands the lists back best-first, so the selector that matches today is
+tried before the dead patterns of older layouts. Miss and fallback counters
+show when a platform's layout starts drifting.
+"""
+
+import threading
+
+# Weight of the latest outcome in each selector's hit-rate score
+SCORE_ALPHA = 0.1
+
+# Score of a selector that has never been tried; ties keep the listed order
+INITIAL_SCORE = 0.5
+
+class SelectorStats:
+    """Thread-safe hit/miss counters and hit-rate scores per platform and selector group"""
+
+    def __init__(self, alpha=SCORE_ALPHA, initial_score=INITIAL_SCORE):
+        self.alpha = alpha
+        self.initial_score = initial_score
+        self._groups = {}  # (platform, group) -> {selector: [hits, misses, score]}
+        self._fallbacks = {}  # (platform, group) -> hits by a selector other than the first listed
+        self._lock = threading.Lock()
+
+    def _counters(self, platform, group, selector):
+        selectors = self._groups.setdefault((platform, group), {})
+        counters = selectors.get(selector)
+        if counters is None:
+            counters = selectors[selector] = [0, 0, self.initial_score]
+        return counters
+
+    def ordered(self, platform, group, candidates):
+        """Return candidates sorted by recent hit rate, keeping the listed order on ties"""
+        selectors = self._groups.get((platform, group))
+        if not selectors:
+            return list(candidates)
+        initial = self.initial_score
+        scores = [selectors[c][2] if c in selectors else initial for c in candidates]
+        order = sorted(range(len(candidates)), key=lambda i: (-scores[i], i))
+        return [candidates[i] for i in order]
+
+    def record(self, platform, group, selector, hit, candidates=None):
+        """Record whether a selector matched; candidates is the original list, for fallback counting"""
+        with self._lock:
+            counters = self._counters(platform, group, selector)
+            counters[0 if hit else 1] += 1
+            counters[2] += self.alpha * ((1.0 if hit else 0.0) - counters[2])
+            if hit and candidates and selector != candidates[0]:
+                key = (platform, group)
+                self._fallbacks[key] = self._fallbacks.get(key, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self._groups.clear()
+            self._fallbacks.clear()
+
+    def stats(self):
+        """Counters per platform and group, best selector first"""
+        with self._lock:
+            report = {}
+            for (platform, group), selectors in self._groups.items():
+                ranked = sorted(selectors.items(), key=lambda item: -item[1][2])
+                report.setdefault(platform, {})[group] = {
+                    "fallback_hits": self._fallbacks.get((platform, group), 0),
+                    "selectors": [
+                        {"selector": selector, "hits": hits, "misses": misses, "score": round(score, 4)}
+                        for selector, (hits, misses, score) in ranked
+                    ]
+                }
+            return report
+
+# Statistics shared by all scrapers in the process
+selector_stats = SelectorStats()
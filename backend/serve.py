@@ -0,0 +1,180 @@
+"""
+Production server for PricePulse
+
+Serves the Flask app with several worker processes instead of the single
+debug process of `python app.py`. On Linux and macOS it runs gunicorn with
+threaded workers; the app is imported once in the master before forking, so
+workers share its memory copy-on-write. Elsewhere (or with --server waitress)
+it runs waitress, one process with a thread pool.
+
+On SIGTERM or Ctrl+C the server stops accepting connections, lets in-flight
+comparisons finish for up to the graceful timeout, then writes out queued
+price history and alerts before exiting.
+
+Usage: python backend/serve.py [--bind HOST:PORT] [--workers N] [--threads N]
+                               [--graceful-timeout SECONDS] [--server auto|gunicorn|waitress]
+"""
+
+import argparse
+import os
+import signal
+import sys
+import time
+
+# Address to listen on
+BIND = os.environ.get('PRICEPULSE_BIND', '127.0.0.1:5000')
+
+# Worker processes (gunicorn only). One per CPU rather than the usual 2 x CPUs + 1: parsing
+# is the CPU-bound part and a process uses one core for it, while every extra worker splits
+# each host's rate limit further and warms its own result cache
+WORKERS = int(os.environ.get('PRICEPULSE_WORKERS', str(os.cpu_count() or 1)))
+
+# Request threads per worker, not scaled with CPUs: a comparison mostly waits on the network,
+# and the scraper pool and per-host concurrency limits bound the work behind the threads
+THREADS = int(os.environ.get('PRICEPULSE_THREADS', '8'))
+
+# Seconds in-flight requests get to finish after a shutdown signal
+GRACEFUL_TIMEOUT = int(os.environ.get('PRICEPULSE_GRACEFUL_TIMEOUT', '30'))
+
+# Lock file held by the one worker that runs the watchlist tracker
+TRACKER_LOCK = os.environ.get('PRICEPULSE_TRACKER_LOCK', os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'watchlist.lock'
+))
+
+_tracker_lock = None
+
+def claim_tracker(path=TRACKER_LOCK):
+    """
+    True if this process may run the watchlist tracker.
+
+    Each worker tries a non-blocking exclusive lock on the same file; exactly
+    one gets it. The lock is released when that worker exits, so the worker
+    gunicorn starts in its place takes the tracker over.
+    """
+    global _tracker_lock
+    import fcntl
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    handle = open(path, 'a')
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return False
+    _tracker_lock = handle
+    return True
+
+def available_server():
+    """'gunicorn' where it can run, else 'waitress', else None"""
+    if os.name == 'posix':
+        try:
+            import gunicorn  # noqa: F401
+            return 'gunicorn'
+        except ImportError:
+            pass
+    try:
+        import waitress  # noqa: F401
+        return 'waitress'
+    except ImportError:
+        return None
+
+def run_gunicorn(bind=BIND, workers=WORKERS, threads=THREADS, graceful_timeout=GRACEFUL_TIMEOUT):
+    from gunicorn.app.base import BaseApplication
+
+    def post_fork(server, worker):
+        import app
+        from rate_limiter import rate_limiter
+        # Every worker scrapes the same hosts; split each host's budget between them
+        rate_limiter.share(workers)
+        worker.tracker = claim_tracker()
+        if app.WARM_UP_CONNECTIONS:
+            app.warm_up_connections()
+        app.start_background_services(tracker=worker.tracker)
+
+    def worker_exit(server, worker):
+        # Runs in the worker once its in-flight requests are done
+        import app
+        app.stop_background_services(tracker=getattr(worker, 'tracker', False))
+
+    class PricePulseApplication(BaseApplication):
+        def load_config(self):
+            for key, value in {
+                'bind': bind,
+                'workers': workers,
+                'worker_class': 'gthread',
+                'threads': threads,
+                'preload_app': True,
+                'graceful_timeout': graceful_timeout,
+                'post_fork': post_fork,
+                'worker_exit': worker_exit,
+            }.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            # Called once in the master when preloading. The app defers its scrapers to
+            # first use; load them here so every worker shares them instead of importing its own
+            import scraper  # noqa: F401
+            from app import app
+            return app
+
+    PricePulseApplication().run()
+
+def _waitress_busy(dispatcher, socket_map):
+    from waitress.channel import HTTPChannel
+    if dispatcher.active_count > 0 or dispatcher.queue:
+        return True
+    return any(channel.requests or channel.total_outbufs_len
+               for channel in list(socket_map.values()) if isinstance(channel, HTTPChannel))
+
+def run_waitress(bind=BIND, threads=THREADS, graceful_timeout=GRACEFUL_TIMEOUT):
+    from waitress import create_server, wasyncore
+    from waitress.server import BaseWSGIServer
+    import app
+
+    socket_map = {}
+    server = create_server(app.app, map=socket_map, listen=bind, threads=threads)
+    listeners = [channel for channel in socket_map.values() if isinstance(channel, BaseWSGIServer)]
+    deadline = []
+
+    def request_stop(signum, frame):
+        # Stop accepting; connections already open are served until the deadline
+        for listener in listeners:
+            listener.accepting = False
+        if not deadline:
+            deadline.append(time.monotonic() + graceful_timeout)
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+    if app.WARM_UP_CONNECTIONS:
+        app.warm_up_connections()
+    app.start_background_services()
+    server.print_listen("Serving on http://{}:{}")
+    sys.stdout.flush()
+
+    while not deadline or (_waitress_busy(server.task_dispatcher, socket_map) and time.monotonic() < deadline[0]):
+        wasyncore.loop(timeout=0.1, map=socket_map, use_poll=server.adj.asyncore_use_poll, count=1)
+    server.task_dispatcher.shutdown()
+    wasyncore.close_all(socket_map)
+    app.stop_background_services()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run PricePulse with a production server")
+    parser.add_argument('--bind', default=BIND, help="host:port to listen on")
+    parser.add_argument('--workers', type=int, default=WORKERS, help="worker processes (gunicorn)")
+    parser.add_argument('--threads', type=int, default=THREADS, help="request threads per worker")
+    parser.add_argument('--graceful-timeout', type=int, default=GRACEFUL_TIMEOUT,
+                        help="seconds in-flight requests may take to finish on shutdown")
+    parser.add_argument('--server', choices=['auto', 'gunicorn', 'waitress'], default='auto')
+    args = parser.parse_args(argv)
+
+    server = available_server() if args.server == 'auto' else args.server
+    if server is None:
+        sys.exit("No production server installed: pip install -r requirements-prod.txt")
+    if server == 'gunicorn':
+        # gunicorn parses sys.argv itself; give it none of ours
+        sys.argv = sys.argv[:1]
+        run_gunicorn(args.bind, args.workers, args.threads, args.graceful_timeout)
+    else:
+        run_waitress(args.bind, args.threads, args.graceful_timeout)
+
+if __name__ == '__main__':
+    main()
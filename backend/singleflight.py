@@ -0,0 +1,138 @@
+"""
+Request coalescing for PricePulse
+
+When several callers ask for the same key at once, only the first one (the
+leader) does the work; the others wait for and share its result. Works for
+threads and for coroutines on any event loop, since every call in flight is
+tracked by a concurrent.futures.Future.
+
+Work made of parts that finish separately (one scrape per platform) can be
+shared part by part with do_parts(): every caller waits on the leader's part
+futures, so a streamed comparison reaches each follower as soon as it
+reaches the leader.
+"""
+
+import threading
+from concurrent.futures import Future
+
+from tracing import span
+
+class SingleFlight:
+    """Deduplicate concurrent calls that share a key"""
+
+    def __init__(self):
+        self._calls = {}
+        self._parts = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.followers = 0
+
+    def _join(self, key):
+        """Return (future, is_leader) for the call in flight under key"""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.followers += 1
+                return future, False
+            future = self._calls[key] = Future()
+            self.leaders += 1
+            return future, True
+
+    def _finish(self, key):
+        with self._lock:
+            self._calls.pop(key, None)
+            self._parts.pop(key, None)
+
+    def do(self, key, fn):
+        """Run fn() once for all threads asking for key concurrently"""
+        future, leader = self._join(key)
+        if not leader:
+            with span('coalesced-wait'):
+                return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._finish(key)
+
+    def do_parts(self, key, start, combine):
+        """
+        Coalesce a call whose parts finish separately.
+
+        The leader calls start(), which submits the parts and returns
+        {part future: name}. Callers joining meanwhile get the same parts to
+        wait on. When the last part is done, combine({name: result}) runs
+        once and becomes the call's result, shared with callers of do() for
+        the same key. Returns (parts, future, leader); parts is None when the
+        call in flight was started by do().
+        """
+        future, leader = self._join(key)
+        if not leader:
+            with self._lock:
+                return self._parts.get(key), future, False
+
+        try:
+            parts = start()
+        except BaseException as e:
+            future.set_exception(e)
+            self._finish(key)
+            raise
+        with self._lock:
+            self._parts[key] = parts
+
+        remaining = [len(parts)]
+        remaining_lock = threading.Lock()
+
+        def part_done(_):
+            with remaining_lock:
+                remaining[0] -= 1
+                if remaining[0] > 0:
+                    return
+            try:
+                future.set_result(combine({name: part.result() for part, name in parts.items()}))
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                self._finish(key)
+
+        if not parts:
+            remaining[0] = 1
+            part_done(None)
+        for part in parts:
+            part.add_done_callback(part_done)
+        return parts, future, True
+
+    async def do_async(self, key, coro_fn):
+        """Await coro_fn() once for all callers asking for key concurrently"""
+        import asyncio  # only the async engine calls this
+        future, leader = self._join(key)
+        if not leader:
+            return await asyncio.wrap_future(future)
+
+        try:
+            result = await coro_fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._finish(key)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "leaders": self.leaders,
+                "followers": self.followers
+            }
+
+# Comparisons in flight, keyed like the result cache: (method, normalized query)
+comparison_flights = SingleFlight()
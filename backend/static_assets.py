@@ -0,0 +1,121 @@
+"""
+Static assets and response compression for PricePulse
+
+The frontend is read from disk once per process and kept in memory next to
+its gzip (and, when the brotli package is installed, brotli) encodings, each
+compressed at the highest level since it only happens once. Responses carry
+a strong ETag per encoding and Cache-Control, and a request whose
+If-None-Match still matches gets an empty 304.
+
+JSON comparison results are compressed per response instead, at a lower
+level, when the client accepts it and the body is large enough to gain.
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+from importlib.util import find_spec
+
+from flask import Response
+
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'frontend')
+
+BROTLI_AVAILABLE = find_spec('brotli') is not None
+
+# Preferred first when a client accepts both equally
+ENCODINGS = ('br', 'gzip') if BROTLI_AVAILABLE else ('gzip',)
+
+# Seconds browsers may reuse the frontend before revalidating it with its ETag
+STATIC_MAX_AGE = int(os.environ.get('PRICEPULSE_STATIC_MAX_AGE', '3600'))
+
+# Set to 0 to leave compressing JSON responses to a proxy in front of the app
+COMPRESS_RESPONSES = os.environ.get('PRICEPULSE_COMPRESS', '1') != '0'
+
+# Smaller bodies are sent as they are; compressing them saves less than it costs
+COMPRESS_MIN_BYTES = int(os.environ.get('PRICEPULSE_COMPRESS_MIN_BYTES', '1024'))
+
+# Compression levels for per-response bodies, traded towards speed
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+def compress(data, encoding, level=None):
+    """data compressed with 'gzip' or 'br'; level None means the highest"""
+    if encoding == 'br':
+        import brotli
+        return brotli.compress(data, quality=11 if level is None else level)
+    return gzip.compress(data, compresslevel=9 if level is None else level, mtime=0)
+
+def choose_encoding(accept_encodings, available=ENCODINGS):
+    """The encoding in `available` the client prefers, or None to send the body as it is"""
+    return accept_encodings.best_match(available)
+
+class StaticAsset:
+    """One file's bytes, precompressed encodings and their ETags"""
+
+    def __init__(self, body, content_type):
+        self.content_type = content_type
+        self.bodies = {None: body}
+        for encoding in ENCODINGS:
+            compressed = compress(body, encoding)
+            # Not worth it for files that do not shrink, like most images
+            if len(compressed) < len(body):
+                self.bodies[encoding] = compressed
+        digest = hashlib.sha256(body).hexdigest()[:20]
+        self.etags = {encoding: f'"{digest}-{encoding}"' if encoding else f'"{digest}"'
+                      for encoding in self.bodies}
+
+    def response(self, request, max_age=STATIC_MAX_AGE):
+        """200 with the best encoding the client accepts, or 304 when its cached copy is current"""
+        encoding = choose_encoding(request.accept_encodings, [e for e in ENCODINGS if e in self.bodies])
+        headers = {
+            'ETag': self.etags[encoding],
+            'Cache-Control': f'public, max-age={max_age}',
+            'Vary': 'Accept-Encoding',
+        }
+        # A browser holding any encoding of the same file already has its current contents
+        if any(request.if_none_match.contains_weak(tag.strip('"')) for tag in self.etags.values()):
+            return Response(status=304, headers=headers)
+        if encoding:
+            headers['Content-Encoding'] = encoding
+        return Response(self.bodies[encoding], content_type=self.content_type, headers=headers)
+
+class StaticAssets:
+    """Files under a directory, each loaded and compressed on first request"""
+
+    def __init__(self, root=FRONTEND_DIR):
+        self.root = root
+        self._assets = {}
+        self._lock = threading.Lock()
+
+    def get(self, name, content_type):
+        """The StaticAsset for name, or None if the file does not exist"""
+        asset = self._assets.get(name)
+        if asset is None:
+            with self._lock:
+                asset = self._assets.get(name)
+                if asset is None:
+                    try:
+                        with open(os.path.join(self.root, name), 'rb') as f:
+                            body = f.read()
+                    except FileNotFoundError:
+                        return None
+                    asset = self._assets[name] = StaticAsset(body, content_type)
+        return asset
+
+def compress_response(response, request, min_bytes=COMPRESS_MIN_BYTES):
+    """Compress a buffered response in place when the client accepts it and it is big enough"""
+    response.vary.add('Accept-Encoding')
+    if response.is_streamed or 'Content-Encoding' in response.headers:
+        return response
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+    body = response.get_data()
+    if len(body) < min_bytes:
+        return response
+    response.set_data(compress(body, encoding, BROTLI_QUALITY if encoding == 'br' else GZIP_LEVEL))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+frontend_assets = StaticAssets()
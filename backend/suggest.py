@@ -0,0 +1,156 @@
+"""
+Search suggestions for PricePulse
+
+Answers search-as-you-type lookups from an in-memory prefix index of past
+queries and scraped product names, most popular first. Terms live in one
+sorted list, so the terms starting with a prefix are a contiguous slice
+found with two bisections. Short prefixes match too many terms to rank on
+every keystroke; their top suggestions are computed once and kept up to
+date as popularity changes, which is cheap because scores only ever grow.
+"""
+
+import bisect
+import heapq
+import os
+import threading
+from collections import OrderedDict
+
+from result_cache import normalize_query
+
+# Distinct terms kept; new terms beyond this are ignored
+MAX_TERMS = int(os.environ.get('PRICEPULSE_SUGGEST_MAX_TERMS', '100000'))
+
+# Popularity added per search for a query, and per scrape that listed a product
+QUERY_WEIGHT = 1.0
+PRODUCT_WEIGHT = float(os.environ.get('PRICEPULSE_SUGGEST_PRODUCT_WEIGHT', '0.2'))
+
+# Suggestions returned at most, and kept per cached prefix
+TOP_K = 10
+
+# Prefixes matching more terms than this get their top suggestions cached
+SCAN_LIMIT = 256
+
+# Cached prefixes kept, least recently used dropped first
+MAX_CACHED_PREFIXES = 10000
+
+def _rank(entry_key):
+    key, entry = entry_key
+    return -entry["score"], key
+
+class SuggestionIndex:
+    """Sorted-array prefix index with cached top-k lists for broad prefixes"""
+
+    def __init__(self, max_terms=MAX_TERMS, query_weight=QUERY_WEIGHT, product_weight=PRODUCT_WEIGHT,
+                 top_k=TOP_K, scan_limit=SCAN_LIMIT, max_cached_prefixes=MAX_CACHED_PREFIXES):
+        self.max_terms = max_terms
+        self.query_weight = query_weight
+        self.product_weight = product_weight
+        self.top_k = top_k
+        self.scan_limit = scan_limit
+        self.max_cached_prefixes = max_cached_prefixes
+        self._keys = []  # sorted normalized terms
+        self._terms = {}  # normalized term -> {"text", "score", "searched"}
+        self._top = OrderedDict()  # prefix -> [normalized term], best first
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.dropped = 0
+
+    def _bump(self, key, text, weight, searched):
+        entry = self._terms.get(key)
+        if entry is None:
+            if len(self._terms) >= self.max_terms:
+                self.dropped += 1
+                return
+            entry = self._terms[key] = {"text": text, "score": 0.0, "searched": False}
+            bisect.insort(self._keys, key)
+        entry["score"] += weight
+        if searched and not entry["searched"]:
+            # Show the term the way someone typed it rather than a product title
+            entry["searched"] = True
+            entry["text"] = text
+
+        rank = (-entry["score"], key)
+        for length in range(1, len(key) + 1):
+            top = self._top.get(key[:length])
+            if top is None:
+                continue
+            if key in top:
+                top.remove(key)
+            elif len(top) >= self.top_k and rank > _rank((top[-1], self._terms[top[-1]])):
+                continue
+            ranks = [_rank((other, self._terms[other])) for other in top]
+            top.insert(bisect.bisect_left(ranks, rank), key)
+            del top[self.top_k:]
+
+    def record_query(self, query):
+        """Count a search for a query"""
+        key = normalize_query(query)
+        if key:
+            with self._lock:
+                self._bump(key, query.strip(), self.query_weight, searched=True)
+
+    def add_products(self, results):
+        """Count every product name listed in a comparison's results"""
+        names = [
+            item['name'] for items in results.values() if isinstance(items, list)
+            for item in items if isinstance(item, dict) and 'error' not in item and item.get('name')
+        ] if isinstance(results, dict) else []
+        with self._lock:
+            for name in names:
+                # Drop the scrapers' truncation marker; a suggestion is something to search for
+                text = name[:-3].rstrip() if name.endswith('...') else name
+                key = normalize_query(text)
+                if key:
+                    self._bump(key, text, self.product_weight, searched=False)
+
+    def seed(self, queries=(), products=()):
+        """Load (text, count) pairs of past queries and product names, e.g. from the price history"""
+        with self._lock:
+            for text, count in queries:
+                key = normalize_query(text)
+                if key:
+                    self._bump(key, text.strip(), self.query_weight * count, searched=True)
+            for text, count in products:
+                key = normalize_query(text)
+                if key:
+                    self._bump(key, text, self.product_weight * count, searched=False)
+
+    def suggest(self, prefix, limit=TOP_K):
+        """Up to `limit` terms starting with prefix, most popular first"""
+        prefix = normalize_query(prefix)
+        limit = min(limit, self.top_k)
+        if not prefix or limit <= 0:
+            return []
+        with self._lock:
+            self.lookups += 1
+            keys = self._top.get(prefix)
+            if keys is not None:
+                self._top.move_to_end(prefix)
+            else:
+                low = bisect.bisect_left(self._keys, prefix)
+                high = bisect.bisect_left(self._keys, prefix + '\U0010ffff', low)
+                matches = ((key, self._terms[key]) for key in self._keys[low:high])
+                if high - low <= self.scan_limit:
+                    keys = [key for key, _ in heapq.nsmallest(limit, matches, key=_rank)]
+                else:
+                    keys = self._top[prefix] = [key for key, _ in heapq.nsmallest(self.top_k, matches, key=_rank)]
+                    if len(self._top) > self.max_cached_prefixes:
+                        self._top.popitem(last=False)
+            return [
+                {"query": key, "text": self._terms[key]["text"], "score": round(self._terms[key]["score"], 2),
+                 "searched": self._terms[key]["searched"]}
+                for key in keys[:limit]
+            ]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "terms": len(self._terms),
+                "max_terms": self.max_terms,
+                "cached_prefixes": len(self._top),
+                "lookups": self.lookups,
+                "dropped": self.dropped
+            }
+
+# Index shared by the /compare routes and /suggest
+suggestion_index = SuggestionIndex()
@@ -0,0 +1,232 @@
+"""
+Per-request tracing for PricePulse
+
+Times the phases of a request (cache lookup, rate-limit wait, fetch, parse,
+extraction, retry backoff) as spans. The current trace lives in a context
+variable, so spans opened on the scraper pool land in the right request as
+long as work is submitted with contextvars.copy_context().run. Spans are
+reported in the Server-Timing header and, with ?debug=1, as JSON.
+
+An optional sampling profiler records the stacks of the threads working for
+each traced request and keeps folded stacks (the input format of
+flamegraph.pl and speedscope) for the slowest few requests.
+"""
+
+import contextvars
+import heapq
+import itertools
+import os
+import sys
+import threading
+import time
+
+# Keep stack profiles of this many slowest requests; 0 disables the profiler
+PROFILE_SLOWEST = int(os.environ.get('PRICEPULSE_PROFILE_SLOWEST', '0'))
+
+# Milliseconds between stack samples while the profiler is on
+PROFILE_INTERVAL_MS = float(os.environ.get('PRICEPULSE_PROFILE_INTERVAL_MS', '5'))
+
+_current_trace = contextvars.ContextVar('pricepulse_trace', default=None)
+
+class Trace:
+    """Spans of one request, added from any thread working on it"""
+
+    def __init__(self, label=""):
+        self.label = label
+        self.started = time.perf_counter()
+        self.duration = None
+        self.spans = []  # (name, detail, start, duration, thread name); list.append is atomic
+        self.threads = {threading.get_ident(): 1}  # thread id -> open spans; the request thread stays
+        self.samples = {}  # folded stack -> count, filled by the profiler
+
+    def span(self, name, detail=None):
+        return _Span(self, name, detail)
+
+    def finish(self):
+        if self.duration is None:
+            self.duration = time.perf_counter() - self.started
+        return self.duration
+
+    def elapsed(self):
+        return self.duration if self.duration is not None else time.perf_counter() - self.started
+
+    def server_timing(self):
+        """Server-Timing header value: total time per phase and platform, plus the whole request"""
+        totals = {}
+        for name, detail, _, duration, _ in self.spans:
+            key = (name, detail)
+            totals[key] = totals.get(key, 0.0) + duration
+        entries = []
+        for (name, detail), duration in totals.items():
+            desc = f';desc="{detail}"' if detail else ""
+            entries.append(f"{name}{desc};dur={duration * 1000:.1f}")
+        entries.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(entries)
+
+    def to_dict(self):
+        """Every span in start order, in milliseconds from the start of the request"""
+        return {
+            "total_ms": round(self.elapsed() * 1000, 2),
+            "spans": [
+                {"name": name, "detail": detail, "start_ms": round(start * 1000, 2),
+                 "duration_ms": round(duration * 1000, 2), "thread": thread}
+                for name, detail, start, duration, thread in sorted(self.spans, key=lambda span: span[2])
+            ]
+        }
+
+class _Span:
+    __slots__ = ('trace', 'name', 'detail', 'start', 'thread')
+
+    def __init__(self, trace, name, detail):
+        self.trace = trace
+        self.name = name
+        self.detail = detail
+
+    def __enter__(self):
+        self.thread = threading.get_ident()
+        threads = self.trace.threads
+        threads[self.thread] = threads.get(self.thread, 0) + 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        trace = self.trace
+        trace.spans.append((self.name, self.detail, self.start - trace.started, end - self.start,
+                            threading.current_thread().name))
+        threads = trace.threads
+        if threads[self.thread] <= 1:
+            del threads[self.thread]
+        else:
+            threads[self.thread] -= 1
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+_NO_SPAN = _NoSpan()
+
+def span(name, detail=None):
+    """Context manager timing a phase of the current request; free when nothing is traced"""
+    trace = _current_trace.get()
+    if trace is None:
+        return _NO_SPAN
+    return _Span(trace, name, detail)
+
+def current_trace():
+    return _current_trace.get()
+
+def start_trace(label=""):
+    """Begin tracing the request running in this context"""
+    trace = Trace(label)
+    _current_trace.set(trace)
+    if PROFILE_SLOWEST > 0:
+        get_profiler().watch(trace)
+    return trace
+
+def end_trace(trace):
+    """Stop tracing; the profiler keeps the trace if it is among the slowest"""
+    _current_trace.set(None)
+    trace.finish()
+    if PROFILE_SLOWEST > 0:
+        get_profiler().done(trace)
+
+def _frame_name(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class SamplingProfiler:
+    """Samples the stacks of traced threads and keeps the slowest requests' profiles"""
+
+    def __init__(self, slowest=PROFILE_SLOWEST, interval=PROFILE_INTERVAL_MS / 1000):
+        self.slowest = slowest
+        self.interval = interval
+        self._active = set()
+        self._profiles = []  # min-heap of (duration, seq, profile)
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._thread = None
+        self.sample_count = 0
+
+    def watch(self, trace):
+        with self._lock:
+            self._active.add(trace)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='pricepulse-profiler', daemon=True)
+                self._thread.start()
+            self._wake.notify()
+
+    def done(self, trace):
+        with self._lock:
+            self._active.discard(trace)
+            samples = dict(trace.samples)
+            profile = {
+                "request": trace.label,
+                "duration_ms": round(trace.duration * 1000, 2),
+                "samples": sum(samples.values()),
+                "folded": samples,
+            }
+            entry = (trace.duration, next(self._seq), profile)
+            if len(self._profiles) < self.slowest:
+                heapq.heappush(self._profiles, entry)
+            elif entry > self._profiles[0]:
+                heapq.heapreplace(self._profiles, entry)
+
+    def sample(self):
+        """Record one stack per thread currently working for a traced request"""
+        with self._lock:
+            traces = list(self._active)
+        if not traces:
+            return
+        frames = sys._current_frames()
+        for trace in traces:
+            for ident in list(trace.threads):
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_name(frame))
+                    frame = frame.f_back
+                folded = ";".join(reversed(stack))
+                trace.samples[folded] = trace.samples.get(folded, 0) + 1
+        self.sample_count += 1
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._active:
+                    self._wake.wait()
+            self.sample()
+            time.sleep(self.interval)
+
+    def profiles(self):
+        """Kept profiles, slowest first"""
+        with self._lock:
+            return [profile for _, _, profile in sorted(self._profiles, reverse=True)]
+
+    def folded(self, index):
+        """One profile as folded stack lines ("frame;frame;frame count"), or None"""
+        profiles = self.profiles()
+        if not 0 <= index < len(profiles):
+            return None
+        samples = profiles[index]["folded"]
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(samples.items()))
+
+_profiler = None
+_profiler_lock = threading.Lock()
+
+def get_profiler():
+    """Return the shared sampling profiler, creating it on first use"""
+    global _profiler
+    if _profiler is None:
+        with _profiler_lock:
+            if _profiler is None:
+                _profiler = SamplingProfiler()
+    return _profiler
@@ -0,0 +1,423 @@
+"""
+Watchlist tracker for PricePulse
+
+Scrapes tracked queries on a schedule instead of on user demand. Every
+(query, platform) pair is an item with its own next-due time, kept in a
+min-heap per platform. One dispatcher thread per platform waits for a free
+slot (at most PLATFORM_CONCURRENCY scrapes in flight per platform) and for
+the earliest due item, then hands it to a worker pool that runs the normal
+scraper. Successful runs are rescheduled one interval later with jitter;
+failures back off exponentially. The schedule lives in SQLite, so tracking
+resumes where it left off after a restart.
+
+Under serve.py several worker processes share the table but only one runs
+the tracker. Any worker may add or remove queries; the table is written
+first and the tracker re-reads it every SYNC_INTERVAL seconds.
+"""
+
+import heapq
+import itertools
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from history import HISTORY_DB, price_history
+from result_cache import normalize_query
+
+# Set to 0 to keep the tracker from starting with the server
+WATCHLIST_ENABLED = os.environ.get('PRICEPULSE_WATCHLIST', '1') != '0'
+
+# SQLite file holding the schedule (the price history database by default)
+WATCHLIST_DB = os.environ.get('PRICEPULSE_WATCHLIST_DB', HISTORY_DB)
+
+# Seconds between scrapes of a tracked query when no interval is given
+DEFAULT_INTERVAL = float(os.environ.get('PRICEPULSE_WATCH_INTERVAL', '3600'))
+
+# Scrapes in flight at once per platform
+PLATFORM_CONCURRENCY = int(os.environ.get('PRICEPULSE_WATCH_CONCURRENCY', '2'))
+
+# Fraction of the interval added or removed at random, so items drift apart instead of firing together
+JITTER = float(os.environ.get('PRICEPULSE_WATCH_JITTER', '0.1'))
+
+# First retry delay after a failure, doubled per consecutive failure up to the maximum
+BACKOFF_BASE = float(os.environ.get('PRICEPULSE_WATCH_BACKOFF', '60'))
+MAX_BACKOFF = float(os.environ.get('PRICEPULSE_WATCH_MAX_BACKOFF', '3600'))
+
+# Seconds between re-reads of the table for changes made by other worker processes
+SYNC_INTERVAL = float(os.environ.get('PRICEPULSE_WATCH_SYNC', '5'))
+
+# Recent dispatches kept for the lag percentiles
+LAG_SAMPLES = 2000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS watchlist (
+    query TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    display_query TEXT NOT NULL,
+    interval REAL NOT NULL,
+    next_due REAL NOT NULL,
+    failures INTEGER NOT NULL DEFAULT 0,
+    last_run REAL,
+    last_ok INTEGER,
+    PRIMARY KEY (query, platform)
+);
+"""
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(pct / 100 * len(sorted_values)))]
+
+class Watchlist:
+    """Persistent per-platform min-heap scheduler for tracked queries"""
+
+    def __init__(self, path=WATCHLIST_DB, platforms=None, concurrency=PLATFORM_CONCURRENCY,
+                 default_interval=DEFAULT_INTERVAL, jitter=JITTER, backoff_base=BACKOFF_BASE,
+                 max_backoff=MAX_BACKOFF, history=None, sync_interval=SYNC_INTERVAL):
+        import scraper  # requests and BeautifulSoup load with the first watchlist, not with the app
+        self.path = path
+        self.platforms = list(platforms or scraper.PLATFORM_SCRAPERS)
+        self.concurrency = max(1, concurrency)
+        self.default_interval = default_interval
+        self.jitter = jitter
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.history = price_history if history is None else history
+        self.sync_interval = sync_interval
+
+        self._cond = threading.Condition()
+        self._items = {}  # (query, platform) -> item dict
+        self._heaps = {platform: [] for platform in self.platforms}  # (due, seq, key, version)
+        self._slots = {platform: threading.BoundedSemaphore(self.concurrency) for platform in self.platforms}
+        self._in_flight = {platform: 0 for platform in self.platforms}
+        self._running = set()  # keys of items being scraped
+        self._seq = itertools.count()
+        self._lags = deque(maxlen=LAG_SAMPLES)
+        self._db_lock = threading.Lock()
+        self._db = None
+        self._threads = []
+        self._executor = None
+        self._stopping = False
+        self._synced_at = None
+        self.runs = 0
+        self.failures = 0
+        self.sync()
+
+    def _connection(self):
+        if self._db is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.executescript(SCHEMA)
+        return self._db
+
+    def sync(self):
+        """
+        Bring the schedule in line with the table: pick up queries other
+        processes added, re-added or ran, and drop the ones they removed.
+        Every change this process makes is written under _cond, so its own
+        items already match their rows and are left alone.
+        """
+        if not os.path.exists(self.path):
+            return
+        with self._cond:
+            with self._db_lock:
+                rows = self._connection().execute(
+                    'SELECT query, platform, display_query, interval, next_due, failures, last_run, last_ok '
+                    'FROM watchlist'
+                ).fetchall()
+            stored = set()
+            for query, platform, display, interval, next_due, failures, last_run, last_ok in rows:
+                if platform not in self._heaps:
+                    continue
+                key = (query, platform)
+                stored.add(key)
+                row = {
+                    "query": query, "platform": platform, "display_query": display,
+                    "interval": interval, "next_due": next_due, "failures": failures,
+                    "last_run": last_run, "last_ok": None if last_ok is None else bool(last_ok)
+                }
+                item = self._items.get(key)
+                if item is None:
+                    self._schedule(dict(row, version=0))
+                elif key not in self._running and any(item[field] != value for field, value in row.items()):
+                    rescheduled = item["next_due"] != next_due
+                    item.update(row)
+                    if rescheduled:
+                        self._schedule(item)
+            for key in list(self._items):
+                if key not in stored:
+                    del self._items[key]
+            self._synced_at = time.monotonic()
+
+    def _sync_if_due(self):
+        """Sync when the last one is SYNC_INTERVAL old; the tracker's sync thread keeps it fresh there"""
+        if self._synced_at is None or time.monotonic() - self._synced_at >= self.sync_interval:
+            try:
+                self.sync()
+            except sqlite3.Error:
+                pass
+
+    def _persist(self, items):
+        """
+        Write newly added items; callers hold _cond, so a concurrent remove cannot be undone.
+        A row that exists keeps its run history and only takes the new interval and due time.
+        """
+        with self._db_lock:
+            connection = self._connection()
+            with connection:
+                connection.executemany(
+                    'INSERT INTO watchlist (query, platform, display_query, interval, next_due, '
+                    'failures, last_run, last_ok) VALUES (?, ?, ?, ?, ?, ?, ?, ?) '
+                    'ON CONFLICT (query, platform) DO UPDATE SET display_query = excluded.display_query, '
+                    'interval = excluded.interval, next_due = excluded.next_due',
+                    [(item["query"], item["platform"], item["display_query"], item["interval"], item["next_due"],
+                      item["failures"], item["last_run"], item["last_ok"]) for item in items]
+                )
+
+    def _save_run(self, item):
+        """Write a finished run's outcome; a row another process removed is not brought back"""
+        with self._db_lock:
+            connection = self._connection()
+            with connection:
+                connection.execute(
+                    'UPDATE watchlist SET next_due = ?, failures = ?, last_run = ?, last_ok = ? '
+                    'WHERE query = ? AND platform = ?',
+                    (item["next_due"], item["failures"], item["last_run"], item["last_ok"],
+                     item["query"], item["platform"])
+                )
+
+    def _schedule(self, item):
+        """Push an item onto its platform's heap; older heap entries for it become stale"""
+        item["version"] += 1
+        key = (item["query"], item["platform"])
+        self._items[key] = item
+        heapq.heappush(self._heaps[item["platform"]], (item["next_due"], next(self._seq), key, item["version"]))
+        self._cond.notify_all()
+
+    def add(self, query, interval=None):
+        """Track a query on every platform; the first scrape is due at once"""
+        interval = float(interval or self.default_interval)
+        key = normalize_query(query)
+        if not key or interval <= 0:
+            raise ValueError("A non-empty query and a positive interval are required")
+        now = time.time()
+        with self._cond:
+            items = []
+            for platform in self.platforms:
+                item = dict(self._items.get((key, platform)) or {
+                    "query": key, "platform": platform, "display_query": query.strip(),
+                    "failures": 0, "last_run": None, "last_ok": None, "version": 0
+                })
+                item["interval"] = interval
+                item["next_due"] = now
+                items.append(item)
+            # Saved before it is scheduled, so a failed write leaves nothing half tracked
+            self._persist(items)
+            for item in items:
+                tracked = self._items.get((key, item["platform"]))
+                if tracked is not None:
+                    # Update in place, so a run in flight still reschedules it
+                    tracked.update(interval=interval, next_due=now)
+                    item = tracked
+                self._schedule(item)
+        return {"query": key, "interval": interval, "platforms": self.platforms}
+
+    def remove(self, query):
+        """Stop tracking a query; returns False if it was not tracked"""
+        key = normalize_query(query)
+        with self._cond:
+            with self._db_lock:
+                connection = self._connection()
+                with connection:
+                    connection.execute('DELETE FROM watchlist WHERE query = ?', (key,))
+            removed = [self._items.pop((key, platform), None) for platform in self.platforms]
+        return any(removed)
+
+    def items(self):
+        """Tracked queries with each platform's next run and last outcome"""
+        self._sync_if_due()
+        with self._cond:
+            tracked = {}
+            for (query, platform), item in sorted(self._items.items()):
+                entry = tracked.setdefault(query, {"query": item["display_query"], "interval": item["interval"],
+                                                   "platforms": {}})
+                entry["platforms"][platform] = {
+                    "next_due": item["next_due"], "failures": item["failures"],
+                    "last_run": item["last_run"], "last_ok": item["last_ok"]
+                }
+            return list(tracked.values())
+
+    def start(self):
+        """Start one dispatcher thread per platform"""
+        with self._cond:
+            if self._threads:
+                return
+            self._stopping = False
+            self._executor = ThreadPoolExecutor(max_workers=self.concurrency * len(self.platforms),
+                                                thread_name_prefix='pricepulse-watchlist')
+            for platform in self.platforms:
+                thread = threading.Thread(target=self._dispatch, args=(platform,),
+                                          name=f'pricepulse-watch-{platform}', daemon=True)
+                self._threads.append(thread)
+                thread.start()
+            thread = threading.Thread(target=self._sync_loop, name='pricepulse-watch-sync', daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def stop(self, timeout=5):
+        """Stop dispatching and wait for running scrapes to finish"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            threads, self._threads = self._threads, []
+        for thread in threads:
+            thread.join(timeout)
+        # Dropped under the lock, so a dispatcher that outlived the join cannot submit to it
+        with self._cond:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _sync_loop(self):
+        while True:
+            with self._cond:
+                if self._stopping:
+                    return
+                self._cond.wait(self.sync_interval)
+                if self._stopping:
+                    return
+            try:
+                self.sync()
+            except sqlite3.Error:
+                pass
+
+    def _next_due(self, platform):
+        """Pop the platform's earliest item once it is due; None when stopping"""
+        heap = self._heaps[platform]
+        with self._cond:
+            while not self._stopping:
+                if not heap:
+                    self._cond.wait()
+                    continue
+                due, _, key, version = heap[0]
+                item = self._items.get(key)
+                if item is None or item["version"] != version:
+                    heapq.heappop(heap)
+                    continue
+                wait = due - time.time()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                heapq.heappop(heap)
+                self._in_flight[platform] += 1
+                self._running.add(key)
+                return item
+            return None
+
+    def _dispatch(self, platform):
+        slots = self._slots[platform]
+        while True:
+            slots.acquire()
+            item = self._next_due(platform)
+            if item is None:
+                slots.release()
+                return
+            self._lags.append(max(0.0, time.time() - item["next_due"]))
+            with self._cond:
+                if self._executor is None:
+                    # Stopped meanwhile: leave the item due for the next start()
+                    self._in_flight[platform] -= 1
+                    self._running.discard((item["query"], platform))
+                    if self._items.get((item["query"], platform)) is item:
+                        self._schedule(item)
+                    slots.release()
+                    return
+                self._executor.submit(self._run, item)
+
+    def _run(self, item):
+        import scraper
+        platform = item["platform"]
+        ok = False
+        try:
+            result = scraper.scrape_with_retry(
+                scraper.PLATFORM_SCRAPERS[platform], item["display_query"], max_retries=0, platform=platform
+            )
+            ok = not scraper.is_failed_result(result)
+            if ok:
+                self.history.record(item["query"], {platform: result})
+        except Exception:
+            ok = False
+        finally:
+            self._reschedule(item, ok)
+            self._slots[platform].release()
+
+    def _reschedule(self, item, ok):
+        now = time.time()
+        key = (item["query"], item["platform"])
+        with self._cond:
+            self._in_flight[item["platform"]] -= 1
+            self._running.discard(key)
+            self.runs += 1
+            if ok:
+                item["failures"] = 0
+                delay = item["interval"] * (1 + random.uniform(-self.jitter, self.jitter))
+            else:
+                self.failures += 1
+                item["failures"] += 1
+                backoff = min(self.max_backoff, self.backoff_base * 2 ** (item["failures"] - 1))
+                delay = min(backoff, item["interval"]) * (1 + random.uniform(0, self.jitter))
+            item["last_run"] = now
+            item["last_ok"] = ok
+            item["next_due"] = now + delay
+            if self._items.get(key) is not item:
+                # Removed while it was running
+                return
+            self._schedule(item)
+            # Written under the lock: a remove() between scheduling and writing would be undone
+            self._save_run(item)
+
+    def stats(self):
+        """Schedule size, backlog and dispatch lag, for sizing the tracker"""
+        self._sync_if_due()
+        now = time.time()
+        with self._cond:
+            items = list(self._items.values())
+            lags = sorted(self._lags)
+            in_flight = dict(self._in_flight)
+        per_platform = {}
+        for platform in self.platforms:
+            platform_items = [item for item in items if item["platform"] == platform]
+            per_platform[platform] = {
+                "tracked": len(platform_items),
+                "overdue": sum(1 for item in platform_items if item["next_due"] <= now),
+                "in_flight": in_flight[platform],
+                # Scrapes per second this platform must sustain to keep up with the schedule
+                "required_rate": round(sum(1 / item["interval"] for item in platform_items), 4)
+            }
+        return {
+            "running": bool(self._threads),
+            "queries": len({item["query"] for item in items}),
+            "runs": self.runs,
+            "failures": self.failures,
+            "lag_p50_s": round(_percentile(lags, 50), 3),
+            "lag_p95_s": round(_percentile(lags, 95), 3),
+            "lag_max_s": round(lags[-1], 3) if lags else 0.0,
+            "platforms": per_platform
+        }
+
+_watchlist = None
+_watchlist_lock = threading.Lock()
+
+def get_watchlist():
+    """Process-wide watchlist, created on first use"""
+    global _watchlist
+    if _watchlist is None:
+        with _watchlist_lock:
+            if _watchlist is None:
+                _watchlist = Watchlist()
+    return _watchlist
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Benchmark price-drop alert evaluation with many thresholds.
+
+Registers N alerts spread over a set of products, then replays random price
+observations through the engine and reports evaluation time per price.
+
+Usage: python benchmarks/bench_alerts.py [--alerts N] [--products N] [--prices N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(os.path.dirname(ROOT), 'backend'))
+
+from alerts import AlertEngine, MemorySink
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--alerts', type=int, default=200000)
+    parser.add_argument('--products', type=int, default=1000)
+    parser.add_argument('--prices', type=int, default=100000)
+    args = parser.parse_args()
+    rng = random.Random(42)
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = AlertEngine(os.path.join(directory, "alerts.db"), cooldown=0, sinks=[MemorySink(limit=1)])
+        start = time.perf_counter()
+        for _ in range(args.alerts):
+            engine.add(f"product {rng.randrange(args.products)}", rng.randrange(10000, 100000) * 100)
+        print(f"Registered {args.alerts:,} alerts on {args.products:,} products in {time.perf_counter() - start:.1f}s")
+
+        rows = [
+            (f"product {rng.randrange(args.products)}", rng.choice(("Amazon", "Flipkart", "Reliance Digital")),
+             0.0, rng.randrange(10000, 100000) * 100, "query", "name", None)
+            for _ in range(args.prices)
+        ]
+        start = time.perf_counter()
+        for row in rows:
+            engine.observe([row])
+        elapsed = time.perf_counter() - start
+        engine.flush()
+        stats = engine.stats()
+
+    print(f"Evaluated {args.prices:,} prices in {elapsed:.2f}s ({elapsed / args.prices * 1e6:.1f} us per price)")
+    print(f"Fired {stats['fired']:,} alerts ({stats['fired'] / args.prices:.1f} per price)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark compiled extraction plans against the select_one loops.
+
+For each platform the page is parsed once, the product containers are
+selected once, and only the name/price/link extraction is timed: the
+extract_*_products select_one loops versus the single-pass plans.
+
+Usage: python benchmarks/bench_extraction.py [--rounds N] [--products N]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(os.path.dirname(ROOT), 'backend'))
+sys.path.append(ROOT)
+
+import scraper
+from standin import PAGE_BUILDERS
+
+SELECT_EXTRACTORS = {
+    "Flipkart": scraper.extract_flipkart_products,
+    "Amazon": scraper.extract_amazon_products,
+    "Reliance Digital": scraper.extract_reliance_products,
+}
+
+BASE_URLS = {
+    "Flipkart": scraper.FLIPKART_URL,
+    "Amazon": scraper.AMAZON_URL,
+    "Reliance Digital": scraper.RELIANCE_URL,
+}
+
+def time_it(fn, rounds):
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=200)
+    parser.add_argument('--products', type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'platform':<18}{'select_one us':>14}{'compiled us':>13}{'speedup':>9}  output")
+    print("-" * 62)
+    for platform, build_page in PAGE_BUILDERS.items():
+        page = build_page("iphone", products=args.products, noise_blocks=5)
+        soup = scraper.make_soup(page, platform)
+        containers = []
+        for pattern in scraper.PLATFORM_CONTAINER_PATTERNS[platform]:
+            containers = soup.select(pattern)[:5]
+            if containers:
+                break
+
+        plan = scraper.EXTRACTION_PLANS[platform]
+        select = SELECT_EXTRACTORS[platform]
+        base_url = BASE_URLS[platform]
+        same = "same" if select(containers) == plan.extract(containers, base_url) else "DIFFERENT"
+
+        select_time = time_it(lambda: select(containers), args.rounds)
+        compiled_time = time_it(lambda: plan.extract(containers, base_url), args.rounds)
+        print(f"{platform:<18}{select_time * 1e6:>14.1f}{compiled_time * 1e6:>13.1f}"
+              f"{select_time / compiled_time:>8.1f}x  {same}")
+
+if __name__ == "__main__":
+    main()
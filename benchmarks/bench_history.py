@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark the price history store over millions of observations.
+
+Fills a temporary database through the batched writer, then times /history
+style range aggregates (per-platform min/max/avg, and a daily series) for
+random products over a 30-day window.
+
+Usage: python benchmarks/bench_history.py [--rows N] [--products N] [--queries N]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(os.path.dirname(ROOT), 'backend'))
+
+from history import HistoryStore
+
+PLATFORMS = ["Flipkart", "Amazon", "Reliance Digital"]
+
+def fill(store, rows, products, rng):
+    """Record rows observations spread over 90 days, three platforms per comparison"""
+    now = time.time()
+    per_call = len(PLATFORMS)
+    for _ in range(rows // per_call):
+        product = rng.randrange(products)
+        price = f"₹{rng.randint(1000, 150000):,}"
+        results = {
+            platform: [{"name": f"Product {product}", "price": price, "link": "https://example.com"}]
+            for platform in PLATFORMS
+        }
+        store.record(f"query {product}", results, ts=now - rng.random() * 90 * 86400)
+    store.flush()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--products', type=int, default=5000)
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = HistoryStore(os.path.join(directory, "history.db"), flush_batch=5000,
+                             max_queued=args.rows + 1)
+        start = time.perf_counter()
+        fill(store, args.rows, args.products, rng)
+        elapsed = time.perf_counter() - start
+        stats = store.stats()
+        print(f"Wrote {stats['written']:,} observations in {elapsed:.1f}s "
+              f"({stats['written'] / elapsed:,.0f}/s, {stats['batches']} batches)")
+
+        since = time.time() - 30 * 86400
+        for label, bucket in (("summary", None), ("daily series", 86400)):
+            timings = []
+            for _ in range(args.queries):
+                product = f"Product {rng.randrange(args.products)}"
+                begin = time.perf_counter()
+                store.summary(product=product, since=since, bucket=bucket)
+                timings.append(time.perf_counter() - begin)
+            timings.sort()
+            print(f"{label:<13} p50 {statistics.median(timings) * 1000:.2f} ms  "
+                  f"p99 {timings[int(len(timings) * 0.99) - 1] * 1000:.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark the cold import of backend/app.py with `python -X importtime`.
+
+Imports the app in a fresh interpreter several times and reports the median
+cumulative import time of `app` and of its heaviest dependencies. With
+--budget, exits non-zero when the import takes longer than budgeted or loads
+a module that should only be imported on first use, so CI catches startup
+regressions.
+
+Usage: python benchmarks/bench_importtime.py [--runs N] [--top N] [--budget FILE]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND = os.path.join(ROOT, 'backend')
+
+def import_times(module='app'):
+    """
+    ({module name: cumulative microseconds}, [modules module imports directly])
+    for one cold import of module
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], cwd=BACKEND,
+                            capture_output=True, text=True, check=True)
+    times = {}
+    lines = []
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package, indented by nesting depth
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        times[name.strip()] = int(cumulative)
+        lines.append((depth, name.strip()))
+
+    # A module's imports are logged before it, one level deeper
+    direct = []
+    end = max(i for i, (depth, name) in enumerate(lines) if depth == 0 and name == module)
+    for depth, name in reversed(lines[:end]):
+        if depth == 0:
+            break
+        if depth == 1:
+            direct.append(name)
+    return times, direct
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--budget', help="JSON file with app_ms and a list of lazy modules")
+    args = parser.parse_args()
+
+    runs = [import_times() for _ in range(args.runs)]
+    loaded, direct = runs[-1]
+    median = {name: statistics.median(times.get(name, 0) for times, _ in runs) for name in loaded}
+    app_ms = median['app'] / 1000
+
+    print(f"import app: median {app_ms:.1f} ms over {args.runs} cold imports")
+    print("-" * 50)
+    print("Heaviest imports made by app.py:")
+    for name in sorted(direct, key=median.get, reverse=True)[:args.top]:
+        print(f"  {name:<28} {median[name] / 1000:8.1f} ms")
+
+    if args.budget:
+        with open(args.budget) as f:
+            budget = json.load(f)
+        failures = []
+        if app_ms > budget['app_ms']:
+            failures.append(f"import app took {app_ms:.1f} ms, budget {budget['app_ms']} ms")
+        eager = sorted(name for name in budget.get('lazy', []) if name in loaded)
+        if eager:
+            failures.append(f"imported at startup but meant to load on first use: {', '.join(eager)}")
+        print("-" * 50)
+        for failure in failures:
+            print(f"OVER BUDGET: {failure}")
+        if failures:
+            sys.exit(1)
+        print("Within budget")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark cross-platform product matching.
+
+Generates a synthetic catalogue where every product is listed under a few
+platform-style names, then times grouping one comparison's listings (the
+/compare?group=products path) and deduplicating a history-sized corpus, and
+reports how many listings ended up with their true product.
+
+Usage: python benchmarks/bench_matching.py [--corpus N] [--runs N]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(os.path.dirname(ROOT), 'backend'))
+
+from matching import cluster_names, match_products
+
+BRANDS = {
+    "Apple": ["iPhone 13", "iPhone 14", "iPhone 15", "iPhone 15 Plus", "iPhone 15 Pro", "iPhone 15 Pro Max"],
+    "Samsung": ["Galaxy S23", "Galaxy S24", "Galaxy S24 Ultra", "Galaxy A55", "Galaxy M34", "Galaxy Z Flip5"],
+    "OnePlus": ["11R", "12", "12R", "Nord CE 3", "Nord 4"],
+    "Xiaomi": ["Redmi Note 13", "Redmi Note 13 Pro", "Redmi 13C", "14"],
+    "Vivo": ["V29", "V30", "T2x", "Y200"],
+}
+COLORS = ["Black", "Blue", "Green", "Silver", "Titanium Gray", "Lavender"]
+STORAGE = [64, 128, 256, 512]
+
+def listing_names(brand, model, storage, color, product_id):
+    series = product_id  # makes every generated product distinct, like a model code
+    return [
+        f"{brand} {model} ({storage} GB) - {color} [M{series}]",
+        f"{brand} {model} {storage}GB {color} 5G Smartphone M{series}",
+        f"{brand.upper()} {model} ({color}, {storage} GB) M{series}",
+        f"{brand} {model} 5G ({color}, {storage}GB Storage) with AI features M{series}",
+    ]
+
+def catalogue(products, rng):
+    names, truth = [], []
+    for product_id in range(products):
+        brand = rng.choice(list(BRANDS))
+        variants = listing_names(brand, rng.choice(BRANDS[brand]), rng.choice(STORAGE), rng.choice(COLORS),
+                                 product_id)
+        for name in rng.sample(variants, rng.randint(2, 4)):
+            names.append(name)
+            truth.append(product_id)
+    order = list(range(len(names)))
+    rng.shuffle(order)
+    return [names[i] for i in order], [truth[i] for i in order]
+
+def purity(clusters, truth):
+    """Share of listings whose cluster's majority product is their own"""
+    correct = 0
+    for cluster in clusters:
+        correct += Counter(truth[i] for i in cluster).most_common(1)[0][1]
+    return correct / len(truth)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--corpus', type=int, default=100000, help="names in the deduplication corpus")
+    parser.add_argument('--runs', type=int, default=200)
+    args = parser.parse_args()
+    rng = random.Random(42)
+
+    # One comparison: ~20 listings per platform
+    timings = []
+    for _ in range(args.runs):
+        names, _ = catalogue(20, rng)
+        results = {"Flipkart": [], "Amazon": [], "Reliance Digital": []}
+        for name in names:
+            results[rng.choice(list(results))].append({"name": name, "price": f"₹{rng.randint(5, 150)},999"})
+        start = time.perf_counter()
+        match_products(results)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    print(f"Comparison ({len(names)} listings): p50 {statistics.median(timings):.2f} ms, "
+          f"p95 {timings[int(0.95 * len(timings))]:.2f} ms")
+
+    names, truth = catalogue(args.corpus // 3, rng)
+    for method in ('lsh', 'index'):
+        if method == 'index' and args.corpus > 30000:
+            print(f"index: skipped for {len(names):,} names (pass --corpus 30000 or less to compare)")
+            continue
+        start = time.perf_counter()
+        clusters = cluster_names(names, method=method)
+        elapsed = time.perf_counter() - start
+        print(f"{method}: {len(names):,} names -> {len(clusters):,} products in {elapsed:.2f}s, "
+              f"purity {purity(clusters, truth):.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Benchmark sequential vs parallel get_price_comparison against a local stand-in server.
+
+Usage: python benchmarks/bench_parallel_compare.py [--rounds N] [--rate-limit]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, 'backend'))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import scraper
+from rate_limiter import RateLimiter
+from standin import StandInServer
+
+# Simulated response time of each platform, in seconds
+DELAYS = {"Flipkart": 0.6, "Amazon": 0.9, "Reliance Digital": 0.4}
+
+def run(parallel, rounds):
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        results = scraper.get_price_comparison("iphone", parallel=parallel)
+        timings.append(time.perf_counter() - start)
+        assert "error" not in results, results
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--rate-limit', action='store_true', help="keep the scrapers' per-host rate limiter")
+    args = parser.parse_args()
+
+    if not args.rate_limit:
+        scraper.rate_limiter = RateLimiter(rate=0)
+
+    with StandInServer(delays=DELAYS) as server:
+        server.point_scraper(scraper)
+        print(f"Platform delays: {DELAYS}")
+        print(f"Expected: sequential ~{sum(DELAYS.values()):.2f}s, parallel ~{max(DELAYS.values()):.2f}s")
+        print("-" * 50)
+        for label, parallel in (("sequential", False), ("parallel", True)):
+            timings = run(parallel, args.rounds)
+            print(f"{label:<11} median {statistics.median(timings):.3f}s  "
+                  f"min {min(timings):.3f}s  max {max(timings):.3f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark parse + extract time and peak memory for each parser backend.
+
+Uses saved search pages from benchmarks/pages/<platform>.html when present
+(flipkart.html, amazon.html, reliance.html) and synthetic stand-in pages
+otherwise. Each backend is measured on the full document and in grid-only
+mode, which builds just the product-grid subtrees.
+
+Usage: python benchmarks/bench_parsers.py [--rounds N] [--pages DIR]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(os.path.dirname(ROOT), 'backend'))
+sys.path.append(ROOT)
+
+from bs4.builder import builder_registry
+
+import scraper
+from standin import PAGE_BUILDERS
+
+PAGE_FILES = {
+    "Flipkart": "flipkart.html",
+    "Amazon": "amazon.html",
+    "Reliance Digital": "reliance.html",
+}
+
+BACKENDS = [backend for backend in ('html.parser', 'lxml', 'html5lib') if builder_registry.lookup(backend)]
+
+def load_pages(pages_dir):
+    pages = {}
+    for platform, filename in PAGE_FILES.items():
+        path = os.path.join(pages_dir, filename)
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                pages[platform] = (f.read(), "saved")
+        else:
+            pages[platform] = (PAGE_BUILDERS[platform]("iphone", noise_blocks=600).encode('utf-8'), "synthetic")
+    return pages
+
+def measure(platform, content, backend, grid_only, rounds):
+    scraper.PARSER_BACKEND = backend
+    scraper.PARSE_PRODUCT_GRID_ONLY = grid_only
+    parse = scraper.PLATFORM_PARSERS[platform]
+
+    products = parse(content)
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        parse(content)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    parse(content)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(timings), peak, products
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=10)
+    parser.add_argument('--pages', default=os.path.join(ROOT, 'pages'))
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages)
+    print(f"Backends: {', '.join(BACKENDS)}")
+    print(f"{'platform':<18}{'backend':<13}{'mode':<7}{'median ms':>10}{'peak MB':>9}  output")
+    print("-" * 72)
+    for platform, (content, source) in pages.items():
+        reference = None
+        for backend in BACKENDS:
+            for grid_only in (False, True):
+                median, peak, products = measure(platform, content, backend, grid_only, args.rounds)
+                if reference is None:
+                    reference = products
+                same = "same" if products == reference else "DIFFERENT"
+                mode = "grid" if grid_only else "full"
+                print(f"{platform:<18}{backend:<13}{mode:<7}{median * 1000:>10.2f}{peak / 2**20:>9.2f}  {same}")
+        print(f"  ({source} page, {len(content) / 1024:.0f} KB)")
+
+if __name__ == "__main__":
+    main()
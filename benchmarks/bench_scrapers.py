@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Benchmark each platform scraper's parse and extract stages on recorded fixtures.
+
+Every response in the fixture store (see record_fixtures.py) is matched to
+its platform by host and run through three stages: parse (make_soup),
+extract (container selection plus the extraction plan, on a parsed soup) and
+the full parse_*_html. Reports p50/p95/p99 latency and allocated/peak memory
+per platform. With --budget, exits non-zero when a platform exceeds its
+budgeted full-stage p95 or peak memory, so CI catches parser regressions.
+
+Usage: python benchmarks/bench_scrapers.py [--fixtures DIR] [--rounds N] [--budget FILE]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(os.path.dirname(ROOT), 'backend'))
+sys.path.append(ROOT)
+
+import scraper
+from fixtures import FixtureStore
+from selector_stats import selector_stats
+
+PLATFORM_HOSTS = {
+    urlsplit(scraper.FLIPKART_URL).netloc: "Flipkart",
+    urlsplit(scraper.AMAZON_URL).netloc: "Amazon",
+    urlsplit(scraper.RELIANCE_URL).netloc: "Reliance Digital",
+}
+
+BASE_URLS = {
+    "Flipkart": scraper.FLIPKART_URL,
+    "Amazon": scraper.AMAZON_URL,
+    "Reliance Digital": scraper.RELIANCE_URL,
+}
+
+def load_fixtures(directory):
+    """Successful fixture bodies grouped by platform"""
+    pages = {}
+    for fixture in FixtureStore(directory):
+        platform = PLATFORM_HOSTS.get(urlsplit(fixture["url"]).netloc)
+        if platform and fixture["status"] == 200:
+            pages.setdefault(platform, []).append(fixture["body"])
+    return pages
+
+def select_containers(soup, platform):
+    for pattern in scraper.PLATFORM_CONTAINER_PATTERNS[platform]:
+        containers = soup.select(pattern)
+        if containers:
+            return containers[:5]
+    return []
+
+def percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def time_stage(fn, inputs, rounds):
+    timings = []
+    for _ in range(rounds):
+        for item in inputs:
+            start = time.perf_counter()
+            fn(item)
+            timings.append(time.perf_counter() - start)
+    timings.sort()
+    return {f"p{pct}_ms": percentile(timings, pct) * 1000 for pct in (50, 95, 99)}
+
+def measure_memory(fn, inputs):
+    """(KiB allocated and released, peak KiB) over one pass of the inputs"""
+    tracemalloc.start()
+    allocated = 0
+    for item in inputs:
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        fn(item)
+        allocated += tracemalloc.get_traced_memory()[1] - before
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return allocated / 1024, peak / 1024
+
+def benchmark_platform(platform, bodies, rounds):
+    plan = scraper.EXTRACTION_PLANS[platform]
+    base_url = BASE_URLS[platform]
+    parse_page = scraper.PLATFORM_PARSERS[platform]
+    soups = [scraper.make_soup(body, platform) for body in bodies]
+
+    stages = {
+        "parse": (lambda body: scraper.make_soup(body, platform), bodies),
+        "extract": (lambda soup: plan.extract(select_containers(soup, platform), base_url), soups),
+        "full": (parse_page, bodies),
+    }
+    report = {"pages": len(bodies), "products": sum(len(parse_page(body)) for body in bodies)}
+    for stage, (fn, inputs) in stages.items():
+        report[stage] = time_stage(fn, inputs, rounds)
+    report["allocated_kib"], report["peak_kib"] = measure_memory(parse_page, bodies)
+    return report
+
+def check_budget(results, budget):
+    """Return a message for every budgeted metric a platform exceeded"""
+    failures = []
+    for platform, limits in budget.items():
+        report = results.get(platform)
+        if report is None:
+            failures.append(f"{platform}: no fixtures to measure")
+            continue
+        measured = {"full_p95_ms": report["full"]["p95_ms"], "peak_kib": report["peak_kib"]}
+        for metric, limit in limits.items():
+            if measured[metric] > limit:
+                failures.append(f"{platform}: {metric} {measured[metric]:.2f} > budget {limit}")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--fixtures', default=os.path.join(ROOT, 'fixtures'))
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--budget', help="JSON file of per-platform full_p95_ms / peak_kib limits")
+    parser.add_argument('--json', action='store_true', help="print the raw report as JSON")
+    args = parser.parse_args()
+
+    pages = load_fixtures(args.fixtures)
+    if not pages:
+        sys.exit(f"No fixtures in {args.fixtures}; run benchmarks/record_fixtures.py first")
+
+    results = {}
+    for platform in scraper.PLATFORM_PARSERS:
+        bodies = pages.get(platform)
+        if not bodies:
+            continue
+        # Start every platform with the listed selector order, as a fresh process would
+        selector_stats.reset()
+        results[platform] = benchmark_platform(platform, bodies, args.rounds)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"Parser: {scraper.PARSER_BACKEND}, grid-only: {scraper.PARSE_PRODUCT_GRID_ONLY}")
+        print(f"{'platform':<18}{'stage':<9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+        print("-" * 54)
+        for platform, report in results.items():
+            for stage in ("parse", "extract", "full"):
+                timings = report[stage]
+                print(f"{platform:<18}{stage:<9}{timings['p50_ms']:>9.2f}"
+                      f"{timings['p95_ms']:>9.2f}{timings['p99_ms']:>9.2f}")
+            print(f"  {report['pages']} pages, {report['products']} products, "
+                  f"{report['allocated_kib']:.0f} KiB allocated, {report['peak_kib']:.0f} KiB peak")
+
+    if args.budget:
+        with open(args.budget) as f:
+            failures = check_budget(results, json.load(f))
+        for failure in failures:
+            print(f"[BUDGET] {failure}")
+        if failures:
+            sys.exit(1)
+        print("[PASS] All platforms within budget")
+
+if __name__ == "__main__":
+    main()
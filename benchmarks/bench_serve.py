@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark request throughput of the Flask dev server against serve.py (gunicorn or waitress).
+
+Each server answers /compare from the recorded fixtures with the result cache
+off, so every request parses three search pages. Concurrent clients keep
+sending requests for a fixed time; reports requests per second and latency
+percentiles per server.
+
+Usage: python benchmarks/bench_serve.py [--seconds N] [--clients N] [--workers N] [--threads N]
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND = os.path.join(ROOT, 'backend')
+
+# Queries recorded in benchmarks/fixtures
+QUERIES = ["iphone 15", "laptop", "samsung galaxy"]
+
+# The dev server as `python app.py` runs it, minus the reloader's second process
+DEV_SERVER = "import app; app.app.run(host='127.0.0.1', port={port}, threaded=True)"
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def server_command(server, port, workers, threads):
+    if server == 'dev':
+        return [sys.executable, '-c', DEV_SERVER.format(port=port)]
+    return [sys.executable, os.path.join(BACKEND, 'serve.py'), '--server', server, '--bind', f"127.0.0.1:{port}",
+            '--workers', str(workers), '--threads', str(threads)]
+
+def wait_ready(url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            requests.get(url, timeout=1)
+            return
+        except requests.ConnectionError:
+            time.sleep(0.1)
+    raise RuntimeError(f"server at {url} did not start")
+
+def load(base_url, seconds, clients):
+    """Latencies of every request completed by `clients` threads within `seconds`"""
+    latencies = []
+    errors = []
+    stop_at = time.monotonic() + seconds
+
+    def client(offset):
+        session = requests.Session()
+        i = offset
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            response = session.get(f"{base_url}/compare", params={"query": QUERIES[i % len(QUERIES)]}, timeout=60)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors.append(response.status_code)
+            i += 1
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors
+
+def percentile(sorted_values, pct):
+    return sorted_values[min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))]
+
+def bench(server, args):
+    port = free_port()
+    env = dict(os.environ, PRICEPULSE_FIXTURES="replay:" + os.path.join(ROOT, 'benchmarks', 'fixtures'),
+               PRICEPULSE_RATE="0", PRICEPULSE_CACHE_ENTRIES="0", PRICEPULSE_HISTORY="0",
+               PRICEPULSE_WATCHLIST="0")
+    process = subprocess.Popen(server_command(server, port, args.workers, args.threads), cwd=BACKEND, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        wait_ready(base_url + "/health")
+        load(base_url, 1, args.clients)  # warm-up
+        latencies, errors = load(base_url, args.seconds, args.clients)
+    finally:
+        process.terminate()
+        process.wait(timeout=60)
+    latencies.sort()
+    return len(latencies) / args.seconds, latencies, errors
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--threads', type=int, default=8)
+    args = parser.parse_args()
+
+    servers = ['dev']
+    for server, module in (('gunicorn', 'gunicorn'), ('waitress', 'waitress')):
+        try:
+            __import__(module)
+            servers.append(server)
+        except ImportError:
+            print(f"{server} not installed, skipped")
+
+    print(f"{args.clients} clients for {args.seconds:.0f}s; serve.py with {args.workers} workers x "
+          f"{args.threads} threads (waitress: 1 process); {os.cpu_count()} CPUs")
+    print("-" * 72)
+    baseline = None
+    for server in servers:
+        throughput, latencies, errors = bench(server, args)
+        baseline = baseline or throughput
+        print(f"{server:<9} {throughput:7.1f} req/s ({throughput / baseline:4.2f}x)  "
+              f"p50 {percentile(latencies, 50) * 1000:6.0f} ms  p95 {percentile(latencies, 95) * 1000:6.0f} ms  "
+              f"mean {statistics.mean(latencies) * 1000:6.0f} ms  errors {len(errors)}")
+
+if __name__ == "__main__":
+    main()
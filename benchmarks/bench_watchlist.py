@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark the watchlist scheduler with many tracked queries.
+
+Tracks N queries with scrapers replaced by a fixed sleep, runs the tracker
+for a while and reports dispatch throughput and schedule lag, to size
+PRICEPULSE_WATCH_CONCURRENCY for a given watchlist.
+
+Usage: python benchmarks/bench_watchlist.py [--items N] [--interval S] [--scrape-ms MS] [--seconds S]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(os.path.dirname(ROOT), 'backend'))
+
+import scraper
+from circuit_breaker import BreakerRegistry
+from history import HistoryStore
+from watchlist import Watchlist
+
+def fake_scraper(platform, delay):
+    def scrape(query):
+        time.sleep(delay)
+        return [{"name": f"{platform} {query}", "price": "₹1,000", "link": "https://example.com"}]
+    return scrape
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--items', type=int, default=10000)
+    parser.add_argument('--interval', type=float, default=60)
+    parser.add_argument('--scrape-ms', type=float, default=5)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    for platform in scraper.PLATFORM_SCRAPERS:
+        scraper.PLATFORM_SCRAPERS[platform] = fake_scraper(platform, args.scrape_ms / 1000)
+    scraper.platform_breakers = BreakerRegistry(min_calls=10 ** 9)
+
+    with tempfile.TemporaryDirectory() as directory:
+        watchlist = Watchlist(os.path.join(directory, "watchlist.db"), concurrency=args.concurrency,
+                              history=HistoryStore(enabled=False))
+        start = time.perf_counter()
+        for i in range(args.items):
+            watchlist.add(f"product {i}", interval=args.interval)
+        print(f"Added {args.items:,} queries in {time.perf_counter() - start:.1f}s")
+
+        watchlist.start()
+        time.sleep(args.seconds)
+        watchlist.stop()
+        stats = watchlist.stats()
+
+    capacity = args.concurrency / (args.scrape_ms / 1000)
+    needed = stats["platforms"]["Amazon"]["required_rate"]
+    print(f"Ran {stats['runs']:,} scrapes in {args.seconds:.0f}s ({stats['runs'] / args.seconds:,.0f}/s)")
+    print(f"Per platform: need {needed:,.1f} scrapes/s, capacity ~{capacity:,.0f}/s")
+    print(f"Lag p50 {stats['lag_p50_s']}s  p95 {stats['lag_p95_s']}s  max {stats['lag_max_s']}s")
+    print(f"Still overdue: {sum(p['overdue'] for p in stats['platforms'].values()):,}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Record search pages into the fixture store used by the offline benchmarks.
+
+  live QUERY...   scrape the real sites once per query and save the responses
+  synthetic       save stand-in pages under the real search URLs (no network)
+
+Usage: python benchmarks/record_fixtures.py [--fixtures DIR] {live,synthetic} [QUERY...]
+"""
+
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(os.path.dirname(ROOT), 'backend'))
+sys.path.append(ROOT)
+
+import http_pool
+import scraper
+from fixtures import FixtureStore
+from standin import PAGE_BUILDERS
+
+DEFAULT_FIXTURES = os.path.join(ROOT, 'fixtures')
+SYNTHETIC_QUERIES = ["iphone 15", "samsung galaxy", "laptop"]
+
+def record_live(store, queries):
+    http_pool.use_fixtures('record', store.directory)
+    for query in queries:
+        for platform, scraper_func in scraper.PLATFORM_SCRAPERS.items():
+            products = scraper_func(query)
+            status = "error: " + products[0]["error"] if 'error' in products[0] else f"{len(products)} products"
+            print(f"  {platform:<18}{query!r:<22}{status}")
+
+def record_synthetic(store, queries):
+    for seed, query in enumerate(queries):
+        for platform, build_page in PAGE_BUILDERS.items():
+            url, _ = scraper.PLATFORM_REQUESTS[platform](query)
+            page = build_page(query, noise_blocks=200, seed=seed).encode('utf-8')
+            path = store.save(url, 200, page, {"Content-Type": "text/html; charset=utf-8"})
+            print(f"  {platform:<18}{query!r:<22}{os.path.basename(path)}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES)
+    parser.add_argument('mode', choices=['live', 'synthetic'])
+    parser.add_argument('queries', nargs='*')
+    args = parser.parse_args()
+
+    store = FixtureStore(args.fixtures)
+    print(f"Recording into {args.fixtures}")
+    if args.mode == 'live':
+        record_live(store, args.queries or ["iphone"])
+    else:
+        record_synthetic(store, args.queries or SYNTHETIC_QUERIES)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Flipkart, Amazon and Reliance Digital search pages.
+
+Serves synthetic search results using the same markup the scrapers look for,
+with a configurable per-platform delay, so benchmarks can run offline.
+"""
+
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Path prefix served for each platform
+PLATFORM_PREFIXES = {
+    "Flipkart": "/flipkart",
+    "Amazon": "/amazon",
+    "Reliance Digital": "/reliance",
+}
+
+def _noise(rng, blocks):
+    """Filler markup so pages are closer to the size of the real ones"""
+    parts = []
+    for i in range(blocks):
+        parts.append(
+            f'<div class="nav-block-{i}"><ul>' +
+            "".join(f'<li><a href="/c/{i}/{j}">Category {i}-{j}</a></li>' for j in range(8)) +
+            f'</ul><script>window.__state_{i} = {{"id": {rng.randint(1, 10**6)}}};</script></div>'
+        )
+    return "".join(parts)
+
+def flipkart_page(query, products=10, noise_blocks=200, seed=0):
+    rng = random.Random(seed)
+    items = "".join(
+        f'<div class="_13oc-S"><div class="_2kHMtA">'
+        f'<a class="_1fQZEK" href="/product/{i}?pid={rng.randint(1, 10**6)}" title="{query} model {i}">'
+        f'<div class="_4rR01T">{query.title()} Model {i} (Black, 128 GB)</div></a>'
+        f'<div class="_30jeq3 _1_WHN1">₹{rng.randint(500, 90000):,}</div></div></div>'
+        for i in range(products)
+    )
+    return f'<html><head><title>{query}</title></head><body>{_noise(rng, noise_blocks)}<div id="grid">{items}</div></body></html>'
+
+def amazon_page(query, products=10, noise_blocks=200, seed=0):
+    rng = random.Random(seed)
+    items = "".join(
+        f'<div data-component-type="s-search-result" class="s-result-item"><div class="a-section">'
+        f'<h2><a class="a-link-normal" href="/dp/B0{i:08d}"><span class="a-text-normal">{query.title()} Model {i}</span></a></h2>'
+        f'<span class="a-price"><span class="a-offscreen">₹{rng.randint(500, 90000):,}</span>'
+        f'<span class="a-price-whole">{rng.randint(500, 90000):,}</span></span></div></div>'
+        for i in range(products)
+    )
+    return f'<html><head><title>{query}</title></head><body>{_noise(rng, noise_blocks)}<div class="s-main-slot">{items}</div></body></html>'
+
+def reliance_page(query, products=10, noise_blocks=200, seed=0):
+    rng = random.Random(seed)
+    items = "".join(
+        f'<li class="product-item"><a href="/product/{i}"><div class="sp__product">'
+        f'<p class="sp__name">{query.title()} Model {i}</p>'
+        f'<span class="sc__price--current">₹{rng.randint(500, 90000):,}.00</span></div></a></li>'
+        for i in range(products)
+    )
+    return f'<html><head><title>{query}</title></head><body>{_noise(rng, noise_blocks)}<ul class="pl__container">{items}</ul></body></html>'
+
+PAGE_BUILDERS = {
+    "Flipkart": flipkart_page,
+    "Amazon": amazon_page,
+    "Reliance Digital": reliance_page,
+}
+
+class StandInServer:
+    """Threaded HTTP server answering search requests for every platform"""
+
+    def __init__(self, delays=None, noise_blocks=200):
+        self.delays = delays or {}
+        self.noise_blocks = noise_blocks
+        self.requests_served = 0
+        self.connections_opened = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep connections open like the real sites do
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                server.connections_opened += 1
+                super().setup()
+
+            def do_HEAD(self):
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def do_GET(self):
+                for platform, prefix in PLATFORM_PREFIXES.items():
+                    if self.path.startswith(prefix + "/"):
+                        break
+                else:
+                    self.send_error(404)
+                    return
+                time.sleep(server.delays.get(platform, 0))
+                body = PAGE_BUILDERS[platform]("iphone", noise_blocks=server.noise_blocks).encode("utf-8")
+                server.requests_served += 1
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}"
+
+    def platform_url(self, platform):
+        return self.base_url + PLATFORM_PREFIXES[platform]
+
+    def point_scraper(self, scraper):
+        """Redirect the scraper module's platform URLs to this server"""
+        scraper.FLIPKART_URL = self.platform_url("Flipkart")
+        scraper.AMAZON_URL = self.platform_url("Amazon")
+        scraper.RELIANCE_URL = self.platform_url("Reliance Digital")
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
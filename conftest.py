@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Shared test helpers, loaded by pytest and importable by the test scripts run on their own
+"""
+
+import sys
+import os
+import time
+from contextlib import contextmanager
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import scraper
+import backend.app as app_module
+from result_cache import ResultCache
+from history import HistoryStore
+from suggest import SuggestionIndex
+from circuit_breaker import BreakerRegistry
+
+@contextmanager
+def fake_platforms(scrapers, breakers=None):
+    """Swap in fake platform scrapers, fresh breakers and an empty cache, history and suggestion index"""
+    original = dict(scraper.PLATFORM_SCRAPERS)
+    saved = (app_module.comparison_cache, app_module.price_history, app_module.suggestion_index,
+             scraper.platform_breakers)
+    scraper.PLATFORM_SCRAPERS.update(scrapers)
+    app_module.comparison_cache = ResultCache()
+    app_module.price_history = HistoryStore(enabled=False)
+    app_module.suggestion_index = SuggestionIndex()
+    scraper.platform_breakers = BreakerRegistry() if breakers is None else breakers
+    try:
+        yield
+    finally:
+        scraper.PLATFORM_SCRAPERS.update(original)
+        (app_module.comparison_cache, app_module.price_history, app_module.suggestion_index,
+         scraper.platform_breakers) = saved
+
+def fake_scraper(platform, delay=0, fail=False, listings=None, calls=None):
+    """
+    A platform scraper that waits `delay` seconds, then returns one product
+    named after the platform and query, the given (name, price) listings, or
+    a connection failure. Each call is appended to `calls` as (platform, query).
+    """
+    def scrape(query):
+        if calls is not None:
+            calls.append((platform, query))
+        time.sleep(delay)
+        if fail:
+            return scraper.PlatformFailure(
+                [{"error": f"Unable to connect to {platform}. Check your internet connection."}])
+        if listings is None:
+            return [{"name": f"{platform} {query}", "price": "₹1,000", "link": "https://example.com"}]
+        return scraper.with_price_paise(
+            [{"name": name, "price": price, "link": "https://example.com"} for name, price in listings])
+    return scrape
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Test script to verify price-drop alerts
+"""
+
+import sys
+import os
+import json
+import logging
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from alerts import AlertEngine, LogSink, MemorySink, WebhookSink
+from history import HistoryStore
+
+def _row(price, platform="Amazon", name="Apple iPhone 15 (128 GB)"):
+    return ("apple iphone 15 128 gb", platform, 1700000000.0, price, "iphone 15", name, "https://example.com")
+
+def test_fires_exactly_crossed_thresholds():
+    """Each price fires the thresholds between it and the last price, once per cool-down"""
+    with tempfile.TemporaryDirectory() as directory:
+        sink = MemorySink()
+        engine = AlertEngine(os.path.join(directory, "alerts.db"), cooldown=3600, sinks=[sink])
+        ids = {below: engine.add("Apple iPhone 15 (128 GB)", below)["id"] for below in (100, 90, 80)}
+        engine.add("Galaxy S24", 1000)
+
+        fired = lambda rows: sorted(event["below_paise"] for event in engine.observe(rows))
+        assert fired([_row(95)]) == [100]
+        assert fired([_row(85)]) == [90]
+        assert fired([_row(85)]) == []
+        # Several listings of one product in a batch count once, at the lowest price
+        assert fired([_row(75), _row(70), _row(99)]) == [80]
+        # Other platforms keep their own last price (90 and 100 are crossed but cooling down)
+        assert fired([_row(85, platform="Flipkart")]) == []
+        # Back up and down again: crossed, but still cooling down
+        assert fired([_row(120)]) == []
+        assert fired([_row(50)]) == []
+
+        engine.cooldown = 0
+        assert fired([_row(120)]) == []
+        assert fired([_row(50)]) == [80, 90, 100]
+        assert engine.remove(ids[90]) and not engine.remove(ids[90])
+        assert fired([_row(120)]) == [] and fired([_row(50)]) == [80, 100]
+
+        engine.flush()
+        stats = engine.stats()
+    assert stats["alerts"] == 3 and stats["suppressed"] == 5
+    assert stats["fired"] == stats["delivered"] == len(sink.events) == 8
+    print(f"[PASS] Fired {stats['fired']} crossed alerts, held back {stats['suppressed']}")
+
+class WebhookStub(BaseHTTPRequestHandler):
+    """Local webhook receiver that keeps every posted body"""
+
+    received = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        self.received.append(json.loads(body))
+        self.send_response(204 if self.path == '/ok' else 500)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+def test_alert_below_seen_price_fires_next():
+    """An alert registered at or above a platform's last seen price fires on its next observation"""
+    with tempfile.TemporaryDirectory() as directory:
+        engine = AlertEngine(os.path.join(directory, "alerts.db"), cooldown=3600, sinks=[MemorySink()])
+        engine.add("Apple iPhone 15 (128 GB)", 50)
+        assert engine.observe([_row(95), _row(99, platform="Flipkart")]) == []
+
+        late = engine.add("Apple iPhone 15 (128 GB)", 96)["id"]
+        # The price stays flat on Amazon and rises on Flipkart
+        fired = engine.observe([_row(95), _row(120, platform="Flipkart")])
+        assert [(event["alert_id"], event["platform"]) for event in fired] == [(late, "Amazon")]
+        assert engine.observe([_row(95)]) == []
+
+        # Back above the threshold by the time the price is seen again: nothing to report
+        engine.add("Apple iPhone 15 (128 GB)", 110)
+        assert engine.observe([_row(115)]) == []
+    print("[PASS] Alerts added below the current price fire on the next observation")
+
+def test_log_sink_uses_logging():
+    """Fired alerts are logged at INFO on the pricepulse.alerts logger"""
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger = logging.getLogger('pricepulse.alerts')
+    saved_level = logger.level
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    try:
+        LogSink().deliver([{"alert_id": 7, "name": "Galaxy S24", "price_paise": 5499900,
+                            "platform": "Amazon", "below_paise": 5500000}])
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(saved_level)
+    assert [record.levelno for record in records] == [logging.INFO]
+    assert records[0].getMessage() == "Price alert 7: Galaxy S24 is 54,999.00 on Amazon (alert at 55,000.00)"
+    print("[PASS] Log sink writes through logging")
+
+def test_webhook_sink_delivery():
+    """Fired alerts are POSTed to webhooks; a failing sink does not stop the others"""
+    server = HTTPServer(('127.0.0.1', 0), WebhookStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    WebhookStub.received = []
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            sink = MemorySink()
+            engine = AlertEngine(os.path.join(directory, "alerts.db"), cooldown=0,
+                                 sinks=[WebhookSink(f"{base}/broken"), WebhookSink(f"{base}/ok"), sink])
+            engine.add("Apple iPhone 15 (128 GB)", 6000000, owner="user-1")
+            engine.observe([_row(5999900)])
+            engine.flush()
+            stats = engine.stats()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert len(WebhookStub.received) == 2 and len(sink.events) == 1
+    event = WebhookStub.received[1]["alerts"][0]
+    assert event["owner"] == "user-1" and event["price_paise"] == 5999900 and event["platform"] == "Amazon"
+    assert stats["delivery_errors"] == {f"webhook:{base}/broken": 1}
+    print("[PASS] Webhook sink delivery")
+
+def test_history_feeds_persisted_alerts():
+    """Alerts survive a restart and are evaluated against recorded prices"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "history.db")
+        AlertEngine(path, sinks=[]).add("Apple iPhone 15 (128 GB)", 7000000)
+
+        sink = MemorySink()
+        engine = AlertEngine(path, sinks=[sink])
+        history = HistoryStore(path)
+        history.add_listener(engine.observe)
+        history.record("iphone 15", {
+            "Amazon": [{"name": "Apple iPhone 15 (128 GB)", "price": "₹69,999", "link": "https://example.com"}],
+            "Flipkart": [{"name": "Apple iPhone 15 (128 GB)", "price": "₹72,999", "link": "https://example.com"}]
+        })
+        history.flush()
+        engine.flush()
+        reloaded = AlertEngine(path, sinks=[]).alerts()
+
+    assert [(event["platform"], event["price_paise"]) for event in sink.events] == [("Amazon", 6999900)]
+    assert len(reloaded) == 1 and reloaded[0]["last_fired"] is not None
+    print("[PASS] History observations fire persisted alerts")
+
+def test_workers_share_alerts():
+    """Engines in separate workers on one database get distinct ids, see each other's changes and fire once"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "alerts.db")
+        first_sink, second_sink = MemorySink(), MemorySink()
+        first = AlertEngine(path, sinks=[first_sink], sync_interval=0)
+        second = AlertEngine(path, sinks=[second_sink], sync_interval=0)
+        a = first.add("Apple iPhone 15 (128 GB)", 100)
+        b = second.add("Apple iPhone 15 (128 GB)", 90)
+        c = second.add("Galaxy S24", 1000)
+        listed = [sorted(alert["id"] for alert in engine.alerts()) for engine in (first, second)]
+        assert first.remove(c["id"])
+        remaining = sorted(alert["id"] for alert in second.alerts())
+
+        # Both workers record the same price; each alert notifies once
+        fired = first.observe([_row(85)]) + second.observe([_row(85)])
+        first.flush()
+        second.flush()
+
+    assert len({a["id"], b["id"], c["id"]}) == 3
+    assert listed == [sorted([a["id"], b["id"], c["id"]])] * 2
+    assert remaining == sorted([a["id"], b["id"]])
+    assert sorted(event["alert_id"] for event in fired) == sorted([a["id"], b["id"]])
+    assert len(first_sink.events) + len(second_sink.events) == 2
+    assert first.stats()["fired"] + second.stats()["fired"] == 2
+    print("[PASS] Workers share alerts through the database")
+
+def test_sync_reads_only_changes():
+    """A sync applies only what changed since the last one, and reloads when it fell too far behind"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "alerts.db")
+        writer = AlertEngine(path, sinks=[])
+        kept = writer.add("Apple iPhone 15 (128 GB)", 100)
+        removed = writer.add("Galaxy S24", 1000)
+        # Many alerts loaded before the reader starts
+        with writer._db_lock:
+            connection = writer._connection()
+            with connection:
+                connection.executemany(
+                    'INSERT INTO alerts (product, product_key, below_paise, created) VALUES (?, ?, ?, ?)',
+                    [(f"Phone {i}", f"phone {i}", 1000 + i, 0.0) for i in range(50000)]
+                )
+        reader = AlertEngine(path, sinks=[], sync_interval=0)
+        assert reader.stats()["alerts"] == 50002
+
+        start = time.perf_counter()
+        for _ in range(100):
+            reader.sync()
+        idle_ms = (time.perf_counter() - start) * 10
+
+        added = writer.add("Pixel 8", 500)
+        writer.remove(removed["id"])
+        fired = writer.observe([_row(95)])
+        reader.sync()
+        with reader._lock:
+            synced = (added["id"] in reader._alerts, removed["id"] in reader._alerts)
+        # The reader lost the race to fire, which is all it needs to know about the cool-down
+        assert reader.observe([_row(95)]) == []
+
+        # Changes older than the retention are pruned; a reader that missed them reloads everything
+        stale = AlertEngine(path, sinks=[], sync_interval=0)
+        stale._synced_seq = 0
+        with writer._db_lock:
+            with writer._connection() as connection:
+                connection.execute('DELETE FROM alert_changes WHERE seq < (SELECT MAX(seq) FROM alert_changes)')
+                connection.execute('DELETE FROM alerts WHERE id = ?', (added["id"],))
+        stale.sync()
+        with stale._lock:
+            reloaded = added["id"] in stale._alerts
+
+    assert idle_ms < 5, idle_ms
+    assert [event["alert_id"] for event in fired] == [kept["id"]]
+    assert synced == (True, False)
+    assert reloaded is False
+    print(f"[PASS] Sync with no changes over 50,002 alerts takes {idle_ms:.2f} ms")
+
+def test_alert_routes():
+    """/alerts registers, lists and deletes alerts"""
+    import backend.app as app_module
+    import alerts as alerts_module
+
+    with tempfile.TemporaryDirectory() as directory:
+        saved = alerts_module._alert_engine
+        alerts_module._alert_engine = AlertEngine(os.path.join(directory, "alerts.db"), sinks=[])
+        try:
+            with app_module.app.test_client() as client:
+                added = client.post('/alerts', json={"product": "Galaxy S24", "below": "₹59,999.50"})
+                numeric = client.post('/alerts', json={"product": "Galaxy S24", "below": 55000})
+                assert client.post('/alerts', json={"product": "Galaxy S24", "below": "soon"}).status_code == 400
+                assert client.post('/alerts', json={"below": 100}).status_code == 400
+                listed = client.get('/alerts?product=galaxy%20s24').get_json()
+                first_page = client.get('/alerts?limit=1').get_json()
+                second_page = client.get(f"/alerts?limit=1&after={first_page['next_after']}").get_json()
+                assert client.get('/alerts?limit=0').status_code == 400
+                assert client.get('/alerts?after=x').status_code == 400
+                assert client.delete(f"/alerts?id={added.get_json()['id']}").status_code == 200
+                assert client.delete(f"/alerts?id={added.get_json()['id']}").status_code == 404
+                stats = client.get('/stats/alerts').get_json()
+        finally:
+            alerts_module._alert_engine = saved
+
+    assert added.status_code == 201 and added.get_json()["below_paise"] == 5999950
+    assert numeric.get_json()["below_paise"] == 5500000
+    assert [alert["below_paise"] for alert in listed["alerts"]] == [5999950, 5500000]
+    assert listed["next_after"] is None
+    assert [alert["below_paise"] for alert in first_page["alerts"]] == [5999950]
+    assert [alert["below_paise"] for alert in second_page["alerts"]] == [5500000]
+    assert stats["alerts"] == 1 and stats["products"] == 1
+    print("[PASS] /alerts routes")
+
+if __name__ == "__main__":
+    test_fires_exactly_crossed_thresholds()
+    test_alert_below_seen_price_fires_next()
+    test_log_sink_uses_logging()
+    test_webhook_sink_delivery()
+    test_history_feeds_persisted_alerts()
+    test_workers_share_alerts()
+    test_sync_reads_only_changes()
+    test_alert_routes()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the ASGI entry point serves /compare/async on one event loop
+"""
+
+import sys
+import os
+import json
+import asyncio
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import scraper
+from result_cache import ResultCache
+from history import HistoryStore
+from suggest import SuggestionIndex
+
+try:
+    import asgi
+    import async_scraper
+except ImportError:
+    asgi = None
+
+async def _request(app, path, query=b''):
+    """Send one GET through an ASGI app; return (status, headers, body)"""
+    scope = {'type': 'http', 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+             'path': path, 'raw_path': path.encode(), 'query_string': query, 'root_path': '',
+             'headers': [(b'host', b'localhost')], 'server': ('localhost', 80)}
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    start = messages[0]
+    body = b''.join(message.get('body', b'') for message in messages[1:])
+    return start['status'], dict(start['headers']), body
+
+def _with_fresh_app(test):
+    """Run test() with the ASGI app's cache, history and suggestion index replaced"""
+    module = asgi.app_module
+    saved = (module.comparison_cache, module.price_history, module.suggestion_index)
+    module.comparison_cache = ResultCache()
+    module.price_history = HistoryStore(enabled=False)
+    module.suggestion_index = SuggestionIndex()
+    try:
+        return test()
+    finally:
+        module.comparison_cache, module.price_history, module.suggestion_index = saved
+
+def test_comparisons_share_one_loop():
+    """Hundreds of concurrent /compare/async requests run on the loop without a thread each"""
+    if asgi is None:
+        print("[SKIP] aiohttp or asgiref not installed")
+        return
+
+    requests = 300
+    threads = []
+
+    async def slow_platform(platform, session, query):
+        threads.append(threading.active_count())
+        await asyncio.sleep(0.3)
+        return [{"name": f"{platform} {query}", "price": "₹1,000", "link": "https://example.com"}]
+
+    async def run():
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(
+            _request(asgi.app, '/compare/async', f'query=phone {i}'.encode()) for i in range(requests)
+        ))
+        elapsed = time.perf_counter() - start
+        await async_scraper.close_session()
+        return responses, elapsed
+
+    saved = async_scraper.fetch_platform_prices
+    async_scraper.fetch_platform_prices = slow_platform
+    try:
+        responses, elapsed = _with_fresh_app(lambda: asyncio.run(run()))
+    finally:
+        async_scraper.fetch_platform_prices = saved
+
+    assert [status for status, _, _ in responses] == [200] * requests
+    status, headers, body = responses[7]
+    assert json.loads(body)["Amazon"][0]["name"] == "Amazon phone 7"
+    assert headers[b'x-cache'] == b'MISS'
+    # 900 platform fetches of 0.3 s each overlap on the one loop
+    assert elapsed < 3, elapsed
+    assert len(threads) == 3 * requests and max(threads) < 20, max(threads)
+    print(f"[PASS] {requests} concurrent comparisons in {elapsed:.2f}s with at most {max(threads)} threads")
+
+def test_other_routes_use_flask():
+    """Routes other than /compare/async, and its validation errors, match the Flask app"""
+    if asgi is None:
+        print("[SKIP] aiohttp or asgiref not installed")
+        return
+
+    async def run():
+        return (await _request(asgi.app, '/health'),
+                await _request(asgi.app, '/compare/async', b'query=%20'))
+
+    (health_status, _, health_body), (empty_status, _, _) = asyncio.run(run())
+    assert health_status == 200 and json.loads(health_body)["status"] == "healthy"
+    assert empty_status == 400
+    print("[PASS] Other routes are served by Flask")
+
+def test_lifespan():
+    """Startup starts the background services and shutdown closes the loop's session"""
+    if asgi is None:
+        print("[SKIP] aiohttp or asgiref not installed")
+        return
+
+    calls = []
+    module = asgi.app_module
+    saved = (module.start_background_services, module.stop_background_services, asgi.claim_tracker)
+    module.start_background_services = lambda tracker=True: calls.append(('start', tracker))
+    module.stop_background_services = lambda tracker=True: calls.append(('stop', tracker))
+    asgi.claim_tracker = lambda: True
+
+    async def run():
+        events = asyncio.Queue()
+        sent = []
+        for message in ('lifespan.startup', 'lifespan.shutdown'):
+            events.put_nowait({'type': message})
+
+        async def send(message):
+            sent.append(message['type'])
+
+        session = async_scraper.get_session()
+        await asgi.app({'type': 'lifespan'}, events.get, send)
+        return sent, session
+
+    try:
+        sent, session = asyncio.run(run())
+    finally:
+        module.start_background_services, module.stop_background_services, asgi.claim_tracker = saved
+
+    assert sent == ['lifespan.startup.complete', 'lifespan.shutdown.complete']
+    assert calls == [('start', True), ('stop', True)]
+    assert session.closed
+    print("[PASS] Lifespan starts and stops the background services")
+
+if __name__ == "__main__":
+    test_comparisons_share_one_loop()
+    test_other_routes_use_flask()
+    test_lifespan()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the asyncio scraping engine
+"""
+
+import sys
+import os
+import asyncio
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+sys.path.append(os.path.join(os.path.dirname(__file__), 'benchmarks'))
+
+import scraper
+from rate_limiter import RateLimiter
+from standin import StandInServer
+
+async def _compare_and_close(*queries):
+    from async_scraper import close_session, get_price_comparison_async
+    try:
+        results = [await get_price_comparison_async(query) for query in queries]
+    finally:
+        await close_session()
+    return results[0] if len(results) == 1 else results
+
+def test_async_matches_threaded():
+    """The async engine parses the same products as the threaded scrapers"""
+    try:
+        from async_scraper import get_price_comparison_async
+    except ImportError:
+        print("[SKIP] aiohttp not installed")
+        return
+
+    saved = (scraper.FLIPKART_URL, scraper.AMAZON_URL, scraper.RELIANCE_URL, scraper.rate_limiter)
+    scraper.rate_limiter = RateLimiter(rate=0)
+    try:
+        with StandInServer(noise_blocks=5) as server:
+            server.point_scraper(scraper)
+            threaded = scraper.get_price_comparison("iphone")
+            async_results = asyncio.run(_compare_and_close("iphone"))
+    finally:
+        scraper.FLIPKART_URL, scraper.AMAZON_URL, scraper.RELIANCE_URL, scraper.rate_limiter = saved
+
+    assert list(async_results) == ["Flipkart", "Amazon", "Reliance Digital"]
+    assert async_results == threaded
+    print("[PASS] Async engine matches threaded scrapers")
+
+def test_async_session_reused():
+    """Comparisons on one event loop share its session and keep-alive connections"""
+    try:
+        from async_scraper import get_session
+    except ImportError:
+        print("[SKIP] aiohttp not installed")
+        return
+
+    async def compare_twice():
+        first = get_session()
+        results = await _compare_and_close("iphone", "pixel")
+        return first, results
+
+    saved = (scraper.FLIPKART_URL, scraper.AMAZON_URL, scraper.RELIANCE_URL, scraper.rate_limiter)
+    scraper.rate_limiter = RateLimiter(rate=0)
+    try:
+        with StandInServer(noise_blocks=5) as server:
+            server.point_scraper(scraper)
+            session, results = asyncio.run(compare_twice())
+            served, opened = server.requests_served, server.connections_opened
+    finally:
+        scraper.FLIPKART_URL, scraper.AMAZON_URL, scraper.RELIANCE_URL, scraper.rate_limiter = saved
+
+    assert all("error" not in items[0] for comparison in results for items in comparison.values())
+    assert session.closed
+    # Three platforms on one host: the second comparison reuses the first one's connections
+    assert served == 6 and opened == 3, (served, opened)
+    print(f"[PASS] {served} async requests over {opened} connections")
+
+def test_async_route():
+    """/compare/async validates its query like /compare"""
+    from backend.app import app, ASYNC_AVAILABLE
+    if not ASYNC_AVAILABLE:
+        print("[SKIP] async engine not available")
+        return
+
+    response = app.test_client().get('/compare/async?query=%20')
+    assert response.status_code == 400
+    print("[PASS] /compare/async rejects empty queries")
+
+def test_async_api_runs_off_loop():
+    """/compare/async?method=api calls the blocking API clients on a pool thread, not the event loop"""
+    import backend.app as app_module
+    from conftest import fake_platforms
+    if not app_module.ASYNC_AVAILABLE:
+        print("[SKIP] async engine not available")
+        return
+
+    on_loop = []
+
+    def fake_api(query):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return {"Amazon": [{"name": f"Amazon {query}", "price": "₹1,000", "link": "https://example.com"}]}
+
+    saved = (app_module.API_AVAILABLE, app_module.get_price_comparison_api)
+    app_module.API_AVAILABLE, app_module.get_price_comparison_api = True, fake_api
+    try:
+        with fake_platforms({}):
+            response = app_module.app.test_client().get('/compare/async?query=phone&method=api')
+    finally:
+        app_module.API_AVAILABLE, app_module.get_price_comparison_api = saved
+
+    assert response.status_code == 200 and response.get_json()["Amazon"][0]["name"] == "Amazon phone"
+    assert on_loop == [False]
+    print("[PASS] API comparisons run off the event loop")
+
+if __name__ == "__main__":
+    test_async_matches_threaded()
+    test_async_session_reused()
+    test_async_route()
+    test_async_api_runs_off_loop()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test script to verify batch comparisons
+"""
+
+import sys
+import os
+import json
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import scraper
+import backend.app as app_module
+from batch import BatchScheduler, LaneSlots, dedupe_queries
+from conftest import fake_platforms, fake_scraper
+
+def _counting_lane(delay, in_flight, peaks, name):
+    lock = threading.Lock()
+
+    def scrape(query):
+        with lock:
+            in_flight[name] = in_flight.get(name, 0) + 1
+            peaks[name] = max(peaks.get(name, 0), in_flight[name])
+        time.sleep(delay)
+        with lock:
+            in_flight[name] -= 1
+        return [{"name": f"{name} {query}", "price": "₹1,000", "link": "https://example.com"}]
+    return scrape
+
+def test_dedupe_queries():
+    """Queries that share a cache key are fetched once, keeping the first spelling"""
+    assert dedupe_queries(["iPhone 15", " iphone  15", "", "Laptop", "laptop "]) == ["iPhone 15", "Laptop"]
+    print("[PASS] Queries are deduplicated")
+
+def test_throughput_scales_with_concurrency():
+    """Per-lane concurrency is respected and throughput grows with it"""
+    queries = [f"q{i}" for i in range(8)]
+    timings = {}
+    for concurrency in (1, 4):
+        in_flight, peaks = {}, {}
+        lanes = {name: _counting_lane(0.05, in_flight, peaks, name) for name in ("A", "B", "C")}
+        start = time.perf_counter()
+        results = list(BatchScheduler(lanes, concurrency=concurrency).run(queries))
+        timings[concurrency] = time.perf_counter() - start
+        assert sorted(query for query, _ in results) == sorted(queries)
+        assert all(list(lane_results) == ["A", "B", "C"] for _, lane_results in results)
+        assert max(peaks.values()) == concurrency, peaks
+
+    # 8 queries x 50 ms per lane: ~0.4 s one at a time, ~0.1 s four at a time
+    assert timings[1] >= 0.38
+    assert timings[4] < timings[1] / 2
+    print(f"[PASS] concurrency 1: {timings[1]:.2f}s, concurrency 4: {timings[4]:.2f}s")
+
+def test_concurrent_batches_share_host_limit():
+    """Two batches at once still keep each lane within its shared concurrency"""
+    in_flight, peaks = {}, {}
+    lanes = {name: _counting_lane(0.05, in_flight, peaks, name) for name in ("A", "B")}
+    slots = LaneSlots(2)
+    results = []
+
+    def run_batch(prefix):
+        results.extend(BatchScheduler(lanes, slots=slots).run([f"{prefix}{i}" for i in range(6)]))
+
+    start = time.perf_counter()
+    batches = [threading.Thread(target=run_batch, args=(prefix,)) for prefix in ("x", "y")]
+    for batch in batches:
+        batch.start()
+    for batch in batches:
+        batch.join()
+    elapsed = time.perf_counter() - start
+
+    assert len(results) == 12
+    assert max(peaks.values()) == 2, peaks
+    # 12 queries x 50 ms per lane, two at a time
+    assert elapsed >= 0.28
+    print(f"[PASS] Two batches kept to 2 requests per lane in {elapsed:.2f}s")
+
+def test_batch_route_streams_jsonl():
+    """/compare/batch streams a line per unique query, answering cached ones without scraping"""
+    calls = []
+    with fake_platforms({platform: fake_scraper(platform, calls=calls) for platform in scraper.PLATFORM_SCRAPERS}), \
+            app_module.app.test_client() as client:
+        app_module.comparison_cache.set(('scrape', 'tv'), {"Flipkart": [{"name": "TV", "price": "₹9", "link": "x"}]})
+        response = client.post('/compare/batch', json={"queries": ["Phone", "phone ", "tv", "Laptop"]})
+        events = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert client.post('/compare/batch', json={"queries": "phone"}).status_code == 400
+        assert client.post('/compare/batch', json=["", " "]).status_code == 400
+
+    assert response.mimetype == 'application/x-ndjson'
+    assert events[0] == {"event": "result", "query": "tv", "cache": "HIT",
+                         "results": {"Flipkart": [{"name": "TV", "price": "₹9", "link": "x"}]}}
+    assert sorted(event["query"] for event in events[1:3]) == ["Laptop", "Phone"]
+    assert list(events[1]["results"]) == ["Flipkart", "Amazon", "Reliance Digital"]
+    assert len(calls) == 6
+    summary = events[-1]
+    assert summary["submitted"] == 4 and summary["unique"] == 3
+    assert summary["cached"] == 1 and summary["fetched"] == 2 and summary["failed"] == 0
+    print("[PASS] /compare/batch streams JSONL")
+
+if __name__ == "__main__":
+    test_dedupe_queries()
+    test_throughput_scales_with_concurrency()
+    test_concurrent_batches_share_host_limit()
+    test_batch_route_streams_jsonl()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Test script to verify per-platform circuit breakers
+"""
+
+import sys
+import os
+import time
+import asyncio
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import scraper
+from circuit_breaker import CircuitBreaker, BreakerRegistry, CLOSED, OPEN, HALF_OPEN
+from conftest import fake_platforms
+
+def test_opens_on_failure_rate():
+    """The breaker opens once the window's failure rate reaches the threshold"""
+    breaker = CircuitBreaker("Amazon", window_size=4, min_calls=4, failure_threshold=0.5, cooldown=60)
+    for success in (True, False, True):
+        assert breaker.allow()
+        breaker.record(success)
+    assert breaker.state == CLOSED
+    breaker.record(False)
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.stats()["rejected"] == 1
+    print("[PASS] Breaker opens on failure rate")
+
+def test_half_open_allows_single_probe():
+    """After the cool-down exactly one probe goes through and decides the state"""
+    breaker = CircuitBreaker("Amazon", window_size=2, min_calls=2, failure_threshold=1.0, cooldown=0.1)
+    breaker.record(False)
+    breaker.record(False)
+    assert breaker.state == OPEN
+    time.sleep(0.12)
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record(False)
+    assert breaker.state == OPEN and breaker.stats()["times_opened"] == 2
+
+    time.sleep(0.12)
+    assert breaker.allow()
+    breaker.record(True)
+    assert breaker.state == CLOSED and breaker.allow()
+    print("[PASS] Half-open breaker allows a single probe")
+
+def test_comparison_skips_open_platform():
+    """An open platform fails fast with an unavailable entry while the others are scraped"""
+    calls = {"Amazon": 0}
+
+    def failing(query):
+        calls["Amazon"] += 1
+        return scraper.PlatformFailure([{"error": "Network error with Amazon: 503 Server Error..."}])
+
+    def working(query):
+        return [{"name": "Phone", "price": "₹1,000", "link": "https://example.com"}]
+
+    breakers = BreakerRegistry(window_size=4, min_calls=2, failure_threshold=0.5, cooldown=60)
+    with fake_platforms({"Flipkart": working, "Amazon": failing, "Reliance Digital": working}, breakers):
+        start = time.perf_counter()
+        first = scraper.get_price_comparison("phone")
+        # One backoff after the first failure; the second opens the breaker and retries stop there
+        assert time.perf_counter() - start < 1
+        assert calls["Amazon"] == 2
+        assert breakers.get("Amazon").state == OPEN
+
+        second = scraper.get_price_comparison("phone")
+        assert calls["Amazon"] == 2
+
+    assert "503" in first["Amazon"][0]["error"]
+    assert "temporarily unavailable" in second["Amazon"][0]["error"]
+    assert second["Amazon"][0]["retry_after"] > 0
+    assert second["Flipkart"] == first["Flipkart"]
+    print("[PASS] Open platform fails fast")
+
+def test_retries_back_off_while_closed():
+    """Retries wait a jittered exponential backoff, capped at RETRY_MAX_BACKOFF, while the breaker is closed"""
+    attempts = []
+
+    def failing(query):
+        attempts.append(time.perf_counter())
+        return scraper.PlatformFailure([{"error": "Network error with Amazon: 503 Server Error..."}])
+
+    async def failing_async(platform, session, query):
+        return failing(query)
+
+    saved = (scraper.RETRY_BACKOFF, scraper.RETRY_MAX_BACKOFF)
+    scraper.RETRY_BACKOFF, scraper.RETRY_MAX_BACKOFF = 0.1, 0.15
+    breakers = BreakerRegistry(window_size=10, min_calls=10, failure_threshold=0.5, cooldown=60)
+    try:
+        with fake_platforms({"Amazon": failing}, breakers):
+            scraper.scrape_with_retry(failing, "phone", max_retries=3, platform="Amazon")
+            try:
+                import async_scraper
+            except ImportError:
+                async_scraper = None
+            if async_scraper is not None:
+                fetch = async_scraper.fetch_platform_prices
+                async_scraper.fetch_platform_prices = failing_async
+                try:
+                    asyncio.run(async_scraper.scrape_with_retry_async("Amazon", None, "phone", max_retries=3))
+                finally:
+                    async_scraper.fetch_platform_prices = fetch
+        assert breakers.get("Amazon").state == CLOSED
+    finally:
+        scraper.RETRY_BACKOFF, scraper.RETRY_MAX_BACKOFF = saved
+
+    # 0.05-0.1 s, then 0.075-0.15 s twice: the doubled 0.2 and 0.4 s are capped
+    for run in (attempts[:4], attempts[4:]):
+        if not run:
+            continue
+        gaps = [later - earlier for earlier, later in zip(run, run[1:])]
+        assert len(gaps) == 3
+        assert 0.05 <= gaps[0] < 0.1 + 0.05, gaps
+        assert all(0.075 <= gap < 0.15 + 0.05 for gap in gaps[1:]), gaps
+    assert len({scraper.retry_delay(2) for _ in range(10)}) > 1
+    print(f"[PASS] Retries back off while the breaker is closed ({len(attempts)} attempts)")
+
+def test_no_products_is_not_a_failure():
+    """A search without products is neither retried nor counted against the platform"""
+    calls = {"Flipkart": 0}
+
+    def no_products(query):
+        calls["Flipkart"] += 1
+        return [{"error": "No products found on Flipkart"}]
+
+    saved_breakers = scraper.platform_breakers
+    scraper.platform_breakers = BreakerRegistry(window_size=4, min_calls=3, failure_threshold=0.5, cooldown=60)
+    try:
+        for _ in range(3):
+            scraper.scrape_with_retry(no_products, "asdfqwer", platform="Flipkart")
+        assert calls["Flipkart"] == 3
+        breaker = scraper.platform_breakers.get("Flipkart")
+        assert breaker.state == CLOSED and breaker.stats()["window_calls"] == 0
+        working = scraper.scrape_with_retry(
+            lambda query: [{"name": "Phone", "price": "₹1,000", "link": "https://example.com"}],
+            "phone", platform="Flipkart")
+    finally:
+        scraper.platform_breakers = saved_breakers
+    assert working[0]["name"] == "Phone"
+    print("[PASS] Searches without products leave the breaker alone")
+
+def test_answered_probe_closes_breaker():
+    """A half-open probe answered with no products still shows the platform is back"""
+    breaker = CircuitBreaker("Flipkart", window_size=2, min_calls=2, failure_threshold=1.0, cooldown=0.1)
+    breaker.record(False)
+    breaker.record(False)
+    time.sleep(0.12)
+    assert breaker.allow()
+    breaker.record_answered()
+    assert breaker.state == CLOSED and breaker.allow()
+    print("[PASS] Answered probe closes the breaker")
+
+def test_outage_classification():
+    """Timeouts, 5xx, 403, 429 and CAPTCHA pages are outages; other statuses are not"""
+    import requests
+
+    def http_error(status):
+        response = requests.Response()
+        response.status_code = status
+        return requests.HTTPError(response=response)
+
+    assert scraper.is_outage(requests.Timeout()) and scraper.is_outage(requests.ConnectionError())
+    assert all(scraper.is_outage(http_error(status)) for status in (500, 503, 529, 429, 403))
+    assert not scraper.is_outage(http_error(404))
+    assert scraper.is_outage(scraper.PlatformBlocked())
+    assert scraper.looks_blocked(b'<form action="/errors/validateCaptcha">')
+    assert not scraper.looks_blocked(b'<div class="s-result-item">Phone</div>')
+    print("[PASS] Outages told apart from answered searches")
+
+def test_health_reports_breakers():
+    """/health shows every platform's breaker state"""
+    from backend.app import app
+    with app.test_client() as client:
+        data = client.get('/health').get_json()
+    assert set(data["circuit_breakers"]) == {"Flipkart", "Amazon", "Reliance Digital"}
+    assert all("state" in breaker for breaker in data["circuit_breakers"].values())
+    print("[PASS] /health reports breaker state")
+
+if __name__ == "__main__":
+    test_opens_on_failure_rate()
+    test_half_open_allows_single_probe()
+    test_comparison_skips_open_platform()
+    test_retries_back_off_while_closed()
+    test_no_products_is_not_a_failure()
+    test_answered_probe_closes_breaker()
+    test_outage_classification()
+    test_health_reports_breakers()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test script to verify compiled extraction plans
+"""
+
+import sys
+import os
+import random
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import scraper
+from bs4 import BeautifulSoup
+from extraction import compile_selector
+from selector_stats import selector_stats
+
+# Markup fragments that exercise every selector, including empty and invalid values
+FRAGMENTS = {
+    "Flipkart": [
+        '<a title="t" href="/x">{name}</a>', '<a href="/y"></a>', '<div class="_4rR01T">{name}</div>',
+        '<div class="_30jeq3">₹{price}</div>', '<div class="_30jeq3 _1_WHN1">₹{price}</div>',
+        '<div class="_25b18c"><div class="_30jeq3">{price}</div></div>', '<a class="s1Q9rs">{name}</a>',
+        '<div class="_1vC4OE"> </div>', '<a title="">  </a>'
+    ],
+    "Amazon": [
+        '<h2><a href="/dp/1"><span>{name}</span></a></h2>', '<h2><span class="a-text-normal">{name}</span></h2>',
+        '<span class="a-size-base-plus">ab</span>', '<div class="a-row"><a class="a-link-normal" href="/z"><span>{name}</span></a></div>',
+        '<span class="a-price-whole">{price}</span>', '<span class="a-price"><span class="a-offscreen">₹{price}</span></span>',
+        '<span class="a-offscreen">abc</span>', '<a class="a-link-normal">x</a>'
+    ],
+    "Reliance Digital": [
+        '<p class="sp__name">{name}</p>', '<p class="sp__name"></p>', '<div class="product-name">{name}</div>',
+        '<h3 class="product-title"><a href="/r">{name}</a></h3>', '<span class="sc__price--current">₹{price}</span>',
+        '<span class="price">{price}</span>', '<div class="price"></div>', '<a href="/q">link</a>', '<a>no link</a>'
+    ],
+}
+
+CONTAINERS = {
+    "Flipkart": '<div class="_13oc-S">{}</div>',
+    "Amazon": '<div data-component-type="s-search-result">{}</div>',
+    "Reliance Digital": '<li class="product-item">{}</li>',
+}
+
+def random_page(platform, rng):
+    containers = []
+    for _ in range(rng.randint(1, 7)):
+        fragments = [
+            rng.choice(FRAGMENTS[platform]).format(name="Phone %d" % rng.randint(0, 99), price=f"{rng.randint(1, 99999):,}")
+            for _ in range(rng.randint(0, 5))
+        ]
+        containers.append(CONTAINERS[platform].format("".join(fragments)))
+    return f'<html><body><div>{"".join(containers)}</div></body></html>'.encode('utf-8')
+
+def test_compiled_matches_select_one():
+    """Compiled plans produce exactly the products of the select_one loops"""
+    rng = random.Random(7)
+    saved = scraper.COMPILED_EXTRACTION
+    try:
+        for _ in range(100):
+            for platform, parse in scraper.PLATFORM_PARSERS.items():
+                page = random_page(platform, rng)
+                results = []
+                for compiled in (False, True):
+                    selector_stats.reset()
+                    scraper.COMPILED_EXTRACTION = compiled
+                    results.append(parse(page))
+                assert results[0] == results[1], (platform, page)
+    finally:
+        scraper.COMPILED_EXTRACTION = saved
+        selector_stats.reset()
+    print("[PASS] Compiled extraction matches select_one on 300 random pages")
+
+def test_compiled_selectors_match_soupsieve():
+    """Compiled selector tests agree with soupsieve on every tag"""
+    soup = BeautifulSoup(random_page("Amazon", random.Random(3)) + random_page("Flipkart", random.Random(4)), 'html.parser')
+    selectors = scraper.AMAZON_NAME_SELECTORS + scraper.AMAZON_PRICE_SELECTORS + scraper.FLIPKART_PRICE_SELECTORS
+    for selector in selectors + ['h2 a, a.a-link-normal', 'a[title]']:
+        matches = compile_selector(selector)
+        expected = set(map(id, soup.select(selector)))
+        assert {id(tag) for tag in soup.find_all(True) if matches(tag)} == expected, selector
+    print("[PASS] Compiled selectors agree with soupsieve")
+
+if __name__ == "__main__":
+    test_compiled_matches_select_one()
+    test_compiled_selectors_match_soupsieve()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the fixture store and record/replay transport
+"""
+
+import sys
+import os
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+sys.path.append(os.path.join(os.path.dirname(__file__), 'benchmarks'))
+
+import http_pool
+import scraper
+from rate_limiter import RateLimiter
+from fixtures import FixtureStore
+from standin import PAGE_BUILDERS, StandInServer
+
+def test_store_round_trip():
+    """Saved responses load back byte for byte, keyed by normalized URL"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = FixtureStore(directory)
+        body = "₹59,999 <b>page</b>".encode('utf-8')
+        store.save("HTTPS://Example.com/search?q=a#frag", 200, body,
+                   {"Content-Type": "text/html", "Content-Encoding": "gzip"})
+
+        fixture = store.load("https://example.com/search?q=a")
+        assert fixture["body"] == body
+        assert fixture["headers"] == {"Content-Type": "text/html"}
+        assert store.load("https://example.com/search?q=b") is None
+        assert len(list(store)) == 1
+    print("[PASS] Fixture store round trip")
+
+def test_record_then_replay_offline():
+    """Pages recorded from a server replay through the scrapers after it is gone"""
+    saved_limiter = scraper.rate_limiter
+    scraper.rate_limiter = RateLimiter(rate=0)
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            with StandInServer() as server:
+                server.point_scraper(scraper)
+                http_pool.use_fixtures('record', directory)
+                recorded = scraper.scrape_flipkart_prices("iphone")
+                assert 'error' not in recorded[0]
+                assert server.requests_served == 1
+
+            http_pool.use_fixtures('replay', directory)
+            assert scraper.scrape_flipkart_prices("iphone") == recorded
+
+            missing = scraper.scrape_flipkart_prices("not recorded")
+            assert 'error' in missing[0]
+    finally:
+        http_pool.use_fixtures(None)
+        scraper.rate_limiter = saved_limiter
+    print("[PASS] Recorded pages replay offline")
+
+def test_replay_synthetic_fixture():
+    """A page saved under a real search URL is served to that platform's scraper"""
+    saved_limiter = scraper.rate_limiter
+    scraper.rate_limiter = RateLimiter(rate=0)
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            url, _ = scraper.build_amazon_request("galaxy")
+            FixtureStore(directory).save(url, 200, PAGE_BUILDERS["Amazon"]("galaxy").encode('utf-8'),
+                                         {"Content-Type": "text/html; charset=utf-8"})
+            http_pool.use_fixtures('replay', directory)
+            products = scraper.scrape_amazon_prices("galaxy")
+            assert len(products) == 3 and 'error' not in products[0]
+    finally:
+        http_pool.use_fixtures(None)
+        scraper.rate_limiter = saved_limiter
+    print("[PASS] Synthetic fixture replays under its search URL")
+
+if __name__ == "__main__":
+    test_store_round_trip()
+    test_record_then_replay_offline()
+    test_replay_synthetic_fixture()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the price history store
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import backend.app as app_module
+from history import HistoryStore, product_key
+
+def _results(flipkart_price, amazon_price):
+    return {
+        "Flipkart": [{"name": "Apple iPhone 15 (Black, 128 GB)", "price": flipkart_price, "link": "https://f"}],
+        "Amazon": [{"name": "Apple iPhone 15 (Black, 128 GB)", "price": amazon_price, "price_paise": None}],
+        "Reliance Digital": [{"error": "No products found on Reliance Digital"}]
+    }
+
+def test_record_is_batched_and_aggregated():
+    """Queued observations are written in batches and aggregated per platform"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = HistoryStore(os.path.join(directory, "history.db"), flush_interval=0.05)
+        start = time.perf_counter()
+        for day, (flipkart, amazon) in enumerate([("₹69,999", "₹71,000"), ("₹65,999", "₹70,500.50"), ("₹67,999", "N/A")]):
+            assert store.record("iPhone 15", _results(flipkart, amazon), ts=1_700_000_000 + day * 86400) in (1, 2)
+        # Recording only queues rows
+        assert time.perf_counter() - start < 0.05
+        store.flush()
+
+        report = store.summary(product="Apple iPhone 15 (Black, 128 GB)")
+        assert report["product_key"] == "apple iphone 15 black 128 gb"
+        assert report["platforms"]["Flipkart"]["min_paise"] == 6599900
+        assert report["platforms"]["Flipkart"]["max_paise"] == 6999900
+        assert report["platforms"]["Flipkart"]["avg_paise"] == 6799900
+        assert report["platforms"]["Amazon"]["count"] == 2
+        assert report["overall"] == {"min_paise": 6599900, "max_paise": 7100000, "avg_paise": 6909950, "count": 5}
+
+        ranged = store.summary(query="  IPHONE 15", platform="Flipkart", since=1_700_000_000 + 86400, bucket=86400)
+        assert ranged["platforms"]["Flipkart"]["count"] == 2
+        assert [point["min_paise"] for point in ranged["series"]] == [6599900, 6799900]
+        assert store.stats()["written"] == 5 and store.stats()["batches"] <= 3
+
+        connection = sqlite3.connect(store.path)
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        plan = " ".join(row[3] for row in connection.execute(
+            "EXPLAIN QUERY PLAN SELECT MIN(price_paise) FROM observations "
+            "WHERE product_key = ? AND platform = ? AND ts >= ?", ("x", "y", 0)
+        ))
+        connection.close()
+        assert "COVERING INDEX idx_observations_product" in plan, plan
+    print("[PASS] History is batched, indexed and aggregated")
+
+def test_disabled_store_records_nothing():
+    """A disabled store never queues observations"""
+    store = HistoryStore("/nonexistent/history.db", enabled=False)
+    assert store.record("phone", _results("₹1", "₹2")) == 0
+    print("[PASS] Disabled history records nothing")
+
+def test_unwritable_path_does_not_block_flush():
+    """If the database cannot be opened the rows are dropped and flush() still returns"""
+    with tempfile.TemporaryDirectory() as directory:
+        blocker = os.path.join(directory, "not-a-directory")
+        with open(blocker, "w") as f:
+            f.write("")
+        store = HistoryStore(os.path.join(blocker, "data", "history.db"), flush_interval=0.01)
+        queued = store.record("iPhone 15", _results("₹69,999", "₹71,000"))
+        flusher = threading.Thread(target=store.flush, daemon=True)
+        flusher.start()
+        flusher.join(timeout=5)
+    assert not flusher.is_alive()
+    assert queued == 2 and store.dropped == 2 and store.written == 0
+    print("[PASS] Unwritable history path drops rows without hanging flush()")
+
+def test_history_route():
+    """/history validates its parameters and returns the summary"""
+    with tempfile.TemporaryDirectory() as directory:
+        store = HistoryStore(os.path.join(directory, "history.db"), flush_interval=0.01)
+        store.record("iphone 15", _results("₹69,999", "₹71,000"))
+        store.flush()
+        saved = app_module.price_history
+        app_module.price_history = store
+        try:
+            with app_module.app.test_client() as client:
+                data = client.get('/history?query=iphone%2015&days=7&bucket=day').get_json()
+                assert client.get('/history').status_code == 400
+                assert client.get('/history?query=a&product=b').status_code == 400
+                assert client.get('/history?query=a&since=yesterday').status_code == 400
+        finally:
+            app_module.price_history = saved
+    assert data["overall"]["count"] == 2
+    assert data["bucket"] == 86400 and len(data["series"]) == 2
+    assert product_key("  Galaxy S24 — 5G ") == "galaxy s24 5g"
+    print("[PASS] /history route")
+
+if __name__ == "__main__":
+    test_record_is_batched_and_aggregated()
+    test_disabled_store_records_nothing()
+    test_unwritable_path_does_not_block_flush()
+    test_history_route()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Test script to verify pooled HTTP sessions
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+sys.path.append(os.path.join(os.path.dirname(__file__), 'benchmarks'))
+
+import http_pool
+import scraper
+from rate_limiter import RateLimiter
+from standin import StandInServer
+
+def test_session_shared_per_host():
+    """URLs on the same host share one session"""
+    first = http_pool.get_session("https://www.amazon.in/s?k=phone")
+    second = http_pool.get_session("https://www.amazon.in/s?k=laptop")
+    other = http_pool.get_session("https://www.flipkart.com/search?q=phone")
+    assert first is second
+    assert first is not other
+    print("[PASS] One session per host")
+
+def test_connections_reused():
+    """Warm-up opens the connection and later searches reuse it"""
+    saved = (scraper.FLIPKART_URL, scraper.AMAZON_URL, scraper.RELIANCE_URL, scraper.rate_limiter)
+    scraper.rate_limiter = RateLimiter(rate=0)
+    try:
+        with StandInServer(noise_blocks=1) as server:
+            server.point_scraper(scraper)
+            http_pool.warm_up([server.base_url + "/"])
+            for _ in range(3):
+                scraper.scrape_with_retry(scraper.scrape_amazon_prices, "iphone")
+            stats = http_pool.connection_stats()[server.base_url]
+    finally:
+        scraper.FLIPKART_URL, scraper.AMAZON_URL, scraper.RELIANCE_URL, scraper.rate_limiter = saved
+
+    assert stats["requests"] == 4
+    assert stats["connections_opened"] == 1
+    assert stats["connections_reused"] == 3
+    print(f"[PASS] Connections reused: {stats}")
+
+if __name__ == "__main__":
+    test_session_shared_per_host()
+    test_connections_reused()
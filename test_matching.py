@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script to verify cross-platform product matching
+"""
+
+import sys
+import os
+import random
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import backend.app as app_module
+from matching import tokenize, similarity, cluster_names, match_products
+from conftest import fake_platforms, fake_scraper
+
+NAMES = [
+    "Apple iPhone 15 (128 GB) - Black",
+    "Apple iPhone 15 128GB Black",
+    "APPLE iPhone 15 (Black, 128 GB)",
+    "Apple iPhone 15 (256 GB) - Black",
+    "Apple iPhone 15 Plus (128 GB) - Black",
+    "Apple iPhone 15",
+    "Samsung Galaxy S24 5G (Onyx Black, 8GB RAM, 256GB Storage)",
+    "Samsung Galaxy S24 5G AI Smartphone (Onyx Black, 8GB, 256GB Storage)",
+    "Samsung Galaxy S24 Ultra 5G (Titanium Black, 12GB, 256GB)",
+]
+
+def test_tokenize_normalizes_names():
+    """Case, units, filler words and a truncated last word are normalized away"""
+    assert tokenize("Apple iPhone 15 (128 GB) - Black") == tokenize("APPLE iPhone 15 128GB Black")
+    assert tokenize('Sony Bravia 55" 4K TV with the Remote') == {"sony", "bravia", "55inch", "4k", "tv", "remote"}
+    assert tokenize("Samsung 6.1 inches Display Phone Cov...") == {"samsung", "6.1inch", "display", "phone"}
+    assert tokenize(None) == frozenset()
+    assert similarity(NAMES[0], NAMES[1]) == 1.0
+    assert similarity(NAMES[0], NAMES[3]) == 0.0
+    print("[PASS] Names tokenize to comparable sets")
+
+def test_clusters_respect_numbers_and_variants():
+    """Same product groups together; other storage sizes and variants stay apart"""
+    expected = [[0, 1, 2, 5], [3], [4], [6, 7], [8]]
+    assert cluster_names(NAMES) == expected
+    assert cluster_names(NAMES, method='lsh') == expected
+    print("[PASS] Storage and variant differences split clusters")
+
+def test_lsh_matches_index_on_corpus():
+    """MinHash/LSH finds the same groups as the exact index on a larger corpus"""
+    rng = random.Random(7)
+    names, truth = [], []
+    for product in range(300):
+        model = f"Phone {rng.choice('ABCDEFG')}{product} ({rng.choice([64, 128, 256])} GB)"
+        variants = [f"Brand {model} Black", f"BRAND {model} - Black Smartphone", f"Brand {model} Black 5G"]
+        for name in rng.sample(variants, 2):
+            names.append(name)
+            truth.append(product)
+
+    exact = cluster_names(names, method='index')
+    approximate = cluster_names(names, method='lsh')
+    assert sorted(len(cluster) for cluster in exact) == [2] * 300
+    assert all(len({truth[i] for i in cluster}) == 1 for cluster in approximate)
+    assert len(approximate) <= 303
+    print(f"[PASS] LSH found {len(approximate)} groups for 300 products")
+
+def test_compare_group_option():
+    """/compare?group=products returns listings grouped across platforms"""
+    with fake_platforms({
+        "Flipkart": fake_scraper("Flipkart", listings=[(NAMES[0], "₹69,999"), (NAMES[3], "₹79,999")]),
+        "Amazon": fake_scraper("Amazon", listings=[(NAMES[1], "₹68,499"), (NAMES[4], "₹79,900")]),
+        "Reliance Digital": lambda query: [{"error": "Unable to connect to Reliance Digital."}],
+    }), app_module.app.test_client() as client:
+        grouped = client.get('/compare?query=iphone 15&group=products').get_json()
+        assert client.get('/compare?query=iphone 15&group=brands').status_code == 400
+        assert client.get('/compare?query=iphone 15&group=products&rank=cheapest').status_code == 400
+
+    products = grouped["products"]
+    assert len(products) == 3
+    assert products[0]["platforms"] == ["Amazon", "Flipkart"]
+    assert products[0]["cheapest"]["price_paise"] == 6849900 and products[0]["cheapest"]["platform"] == "Amazon"
+    assert [listing["platform"] for listing in products[0]["listings"]] == ["Amazon", "Flipkart"]
+    assert "Reliance Digital" in grouped["errors"]
+    print("[PASS] /compare groups the same product across platforms")
+
+def test_match_products_speed():
+    """Grouping one comparison's listings stays within a few milliseconds"""
+    rng = random.Random(3)
+    results = {platform: [{"name": f"{rng.choice(NAMES)} {rng.choice(['', 'Renewed', 'Combo'])}",
+                           "price": f"₹{rng.randint(10, 90)},999"} for _ in range(20)]
+               for platform in ("Flipkart", "Amazon", "Reliance Digital")}
+    match_products(results)
+    start = time.perf_counter()
+    for _ in range(20):
+        products, _ = match_products(results)
+    elapsed_ms = (time.perf_counter() - start) / 20 * 1000
+    assert sum(len(product["listings"]) for product in products) == 60
+    assert elapsed_ms < 50, elapsed_ms
+    print(f"[PASS] Matched 60 listings in {elapsed_ms:.2f} ms")
+
+if __name__ == "__main__":
+    test_tokenize_normalizes_names()
+    test_clusters_respect_numbers_and_variants()
+    test_lsh_matches_index_on_corpus()
+    test_compare_group_option()
+    test_match_products_speed()
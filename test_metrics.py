@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the Prometheus metrics
+"""
+
+import sys
+import os
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+sys.path.append(os.path.join(os.path.dirname(__file__), 'benchmarks'))
+
+import scraper
+import backend.app as app_module
+from metrics import (MetricsRegistry, Counter, Gauge, Histogram, metrics_registry, FETCH_SECONDS, PARSE_SECONDS,
+                     EXTRACT_SECONDS, RESPONSE_BYTES, SCRAPE_ERRORS, HTTP_STATUS, SCRAPE_RETRIES)
+from circuit_breaker import BreakerRegistry
+from rate_limiter import RateLimiter
+from standin import StandInServer
+
+def test_sharded_updates_add_up():
+    """Updates from many threads, including exited ones, add up exactly"""
+    registry = MetricsRegistry()
+    requests = Counter('test_requests_total', 'Requests', ['platform'], registry=registry)
+    in_flight = Gauge('test_in_flight', 'In flight', registry=registry)
+    latency = Histogram('test_seconds', 'Latency', ['platform'], buckets=(0.1, 1.0), registry=registry)
+
+    def work():
+        for i in range(5000):
+            requests.inc("Amazon")
+            with in_flight.track():
+                latency.observe((0.05, 0.5, 5.0)[i % 3], "Amazon")
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    in_flight.inc()
+    for thread in threads:
+        thread.join()
+
+    totals = registry.totals()
+    assert totals[(requests, ("Amazon",))] == 40000
+    assert totals[(in_flight, ())] == 1
+    buckets = totals[(latency, ("Amazon",))]
+    assert buckets[:3] == [13336, 13336, 13328] and buckets[-1] == 40000
+    # Exited threads were folded into the retired totals
+    assert len(registry._shards) == 1
+    print("[PASS] Per-thread shards add up")
+
+def test_render_prometheus_text():
+    """Histograms render cumulative buckets, sum and count; labels are escaped"""
+    registry = MetricsRegistry()
+    latency = Histogram('test_fetch_seconds', 'Fetch time', ['platform'], buckets=(0.1, 1.0), registry=registry)
+    errors = Counter('test_errors_total', 'Errors', ['platform', 'category'], registry=registry)
+    for value in (0.05, 0.5, 2.0):
+        latency.observe(value, 'Reliance "Digital"')
+    errors.inc("Amazon", "timeout", amount=2)
+    registry.add_collector(lambda: [('test_up', 'gauge', 'Up', [({}, 1)])])
+
+    lines = registry.render().splitlines()
+    assert '# TYPE test_fetch_seconds histogram' in lines
+    assert 'test_fetch_seconds_bucket{platform="Reliance \\"Digital\\"",le="0.1"} 1' in lines
+    assert 'test_fetch_seconds_bucket{platform="Reliance \\"Digital\\"",le="1.0"} 2' in lines
+    assert 'test_fetch_seconds_bucket{platform="Reliance \\"Digital\\"",le="+Inf"} 3' in lines
+    assert 'test_fetch_seconds_sum{platform="Reliance \\"Digital\\""} 2.55' in lines
+    assert 'test_fetch_seconds_count{platform="Reliance \\"Digital\\""} 3' in lines
+    assert 'test_errors_total{platform="Amazon",category="timeout"} 2' in lines
+    assert lines[-1] == 'test_up 1'
+    print("[PASS] Prometheus text format")
+
+def test_scraper_records_metrics():
+    """A scrape records fetch, parse and extraction time, size and status; failures get a category"""
+    tracked = [(FETCH_SECONDS, ("Amazon",)), (PARSE_SECONDS, ("Amazon",)), (EXTRACT_SECONDS, ("Amazon",)),
+               (RESPONSE_BYTES, ("Amazon",))]
+    count = lambda totals, key: totals.get(key, [0])[-1]
+    saved = (scraper.FLIPKART_URL, scraper.AMAZON_URL, scraper.RELIANCE_URL, scraper.rate_limiter,
+             scraper.platform_breakers)
+    scraper.rate_limiter = RateLimiter(rate=0)
+    scraper.platform_breakers = BreakerRegistry()
+    before = metrics_registry.totals()
+    try:
+        with StandInServer(noise_blocks=1) as server:
+            server.point_scraper(scraper)
+            scraper.FLIPKART_URL = server.base_url + "/missing"
+            amazon = scraper.scrape_with_retry(scraper.scrape_amazon_prices, "iphone", platform="Amazon")
+            flipkart = scraper.scrape_with_retry(scraper.scrape_flipkart_prices, "iphone", max_retries=1,
+                                                 platform="Flipkart")
+    finally:
+        (scraper.FLIPKART_URL, scraper.AMAZON_URL, scraper.RELIANCE_URL, scraper.rate_limiter,
+         scraper.platform_breakers) = saved
+    after = metrics_registry.totals()
+    delta = lambda key: after.get(key, 0) - before.get(key, 0)
+
+    assert not scraper.is_failed_result(amazon) and scraper.is_failed_result(flipkart)
+    assert all(count(after, key) - count(before, key) == 1 for key in tracked)
+    assert delta((HTTP_STATUS, ("Amazon", "200"))) == 1
+    # A 404 is an answer, not an outage, so it is not retried
+    assert delta((HTTP_STATUS, ("Flipkart", "404"))) == 1
+    assert delta((SCRAPE_ERRORS, ("Flipkart", "http_status"))) == 1
+    assert delta((SCRAPE_RETRIES, ("Flipkart",))) == 0 and delta((SCRAPE_RETRIES, ("Amazon",))) == 0
+    print("[PASS] Scrapes record latency, size, status and error metrics")
+
+def test_metrics_route_and_overhead():
+    """/metrics serves the text format, and an update costs about a microsecond"""
+    with app_module.app.test_client() as client:
+        client.get('/health')
+        response = client.get('/metrics')
+    text = response.get_data(as_text=True)
+    assert response.content_type.startswith('text/plain; version=0.0.4')
+    assert 'pricepulse_request_seconds_count{endpoint="health_check"}' in text
+    assert 'pricepulse_requests_in_flight 1' in text  # the /metrics request itself
+    assert '# TYPE pricepulse_cache_lookups_total counter' in text
+
+    registry = MetricsRegistry()
+    counter = Counter('test_overhead_total', 'Overhead', ['platform'], registry=registry)
+    histogram = Histogram('test_overhead_seconds', 'Overhead', ['platform'], registry=registry)
+    start = time.perf_counter()
+    for _ in range(100000):
+        counter.inc("Amazon")
+        histogram.observe(0.3, "Amazon")
+    per_update_us = (time.perf_counter() - start) / 200000 * 1e6
+    assert per_update_us < 5, per_update_us
+    print(f"[PASS] /metrics served; {per_update_us:.2f} us per update")
+
+if __name__ == "__main__":
+    test_sharded_updates_add_up()
+    test_render_prometheus_text()
+    test_scraper_records_metrics()
+    test_metrics_route_and_overhead()
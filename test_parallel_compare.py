@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Test script to verify parallel price comparison
+"""
+
+import sys
+import os
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import scraper
+from conftest import fake_platforms, fake_scraper
+
+def test_parallel_matches_sequential():
+    """Parallel fan-out returns the same dict, in the same order, in max() time"""
+    with fake_platforms({
+        "Flipkart": fake_scraper("Flipkart", 0.3),
+        "Amazon": fake_scraper("Amazon", 0.2),
+        "Reliance Digital": fake_scraper("Reliance Digital", 0.1),
+    }):
+        start = time.perf_counter()
+        sequential = scraper.get_price_comparison("phone", parallel=False)
+        sequential_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parallel = scraper.get_price_comparison("phone", parallel=True)
+        parallel_time = time.perf_counter() - start
+
+    assert parallel == sequential
+    assert list(parallel) == ["Flipkart", "Amazon", "Reliance Digital"]
+    assert sequential_time >= 0.6
+    assert parallel_time < 0.5
+    print(f"[PASS] sequential {sequential_time:.2f}s, parallel {parallel_time:.2f}s")
+
+if __name__ == "__main__":
+    test_parallel_matches_sequential()
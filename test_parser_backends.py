@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Test script to verify parser backends and the product-grid fast path
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+sys.path.append(os.path.join(os.path.dirname(__file__), 'benchmarks'))
+
+from bs4.builder import builder_registry
+
+import scraper
+from standin import PAGE_BUILDERS
+
+def test_backends_extract_same_products():
+    """Every installed backend, full or grid-only, extracts the same products"""
+    saved = (scraper.PARSER_BACKEND, scraper.PARSE_PRODUCT_GRID_ONLY)
+    backends = [backend for backend in ('html.parser', 'lxml') if builder_registry.lookup(backend)]
+    try:
+        for platform, build_page in PAGE_BUILDERS.items():
+            page = build_page("iphone", noise_blocks=20).encode('utf-8')
+            parse = scraper.PLATFORM_PARSERS[platform]
+            scraper.PARSER_BACKEND, scraper.PARSE_PRODUCT_GRID_ONLY = 'html.parser', False
+            reference = parse(page)
+            assert len(reference) == 3 and 'error' not in reference[0]
+            for backend in backends:
+                for grid_only in (False, True):
+                    scraper.PARSER_BACKEND, scraper.PARSE_PRODUCT_GRID_ONLY = backend, grid_only
+                    assert parse(page) == reference, (platform, backend, grid_only)
+    finally:
+        scraper.PARSER_BACKEND, scraper.PARSE_PRODUCT_GRID_ONLY = saved
+    print(f"[PASS] Same products with {', '.join(backends)}, full and grid-only")
+
+def test_grid_strainer_drops_other_markup():
+    """Grid-only parsing keeps the containers and nothing else"""
+    page = PAGE_BUILDERS["Flipkart"]("iphone", products=4, noise_blocks=5)
+    soup = scraper.make_soup(page, "Flipkart", backend='html.parser', grid_only=True)
+    assert len(soup.select('div._13oc-S')) == 4
+    assert soup.find('script') is None and soup.find('title') is None
+    print("[PASS] Grid strainer keeps only product containers")
+
+if __name__ == "__main__":
+    test_backends_extract_same_products()
+    test_grid_strainer_drops_other_markup()
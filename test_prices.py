@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test script to verify price normalization and cheapest-first ranking
+"""
+
+import sys
+import os
+import random
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import backend.app as app_module
+from prices import parse_price_paise, normalize_prices, rank_cheapest, is_plain_number
+from conftest import fake_platforms, fake_scraper
+
+def test_parse_price_formats():
+    """Display strings from every platform become integer paise"""
+    assert parse_price_paise("₹2,999") == 299900
+    assert parse_price_paise("2,999.") == 299900
+    assert parse_price_paise("₹1,29,999.00") == 12999900
+    assert parse_price_paise("Rs. 1,299.5") == 129950
+    assert parse_price_paise("₹59,999₹79,999") == 5999900
+    assert parse_price_paise("Currently unavailable") is None
+    assert parse_price_paise(None) is None
+    assert is_plain_number("2,999.00") and not is_plain_number(",.") and not is_plain_number("₹5")
+    print("[PASS] Price formats parse to paise")
+
+def test_bulk_matches_single():
+    """normalize_prices agrees with parse_price_paise on awkward input"""
+    rng = random.Random(5)
+    pieces = ["₹", "Rs. ", "", " ", "\n", ",", ".", "5", "99", "1,299", ".00", "abc", "₹0"]
+    texts = ["".join(rng.choice(pieces) for _ in range(rng.randint(0, 5))) for _ in range(3000)]
+    texts += [None, ""]
+    assert normalize_prices(texts) == [parse_price_paise(text) for text in texts]
+    assert normalize_prices([]) == []
+    print("[PASS] Bulk normalization matches single parsing")
+
+def test_rank_cheapest_top_k():
+    """Ranking merges platforms cheapest first and reports failed platforms"""
+    results = {
+        "Flipkart": [{"name": "A", "price": "₹3,499"}, {"name": "B", "price": "₹999"}],
+        "Amazon": [{"name": "C", "price": "₹2,999.50"}, {"name": "D", "price": "N/A"}],
+        "Reliance Digital": [{"error": "No products found on Reliance Digital"}]
+    }
+    ranking, errors = rank_cheapest(results, top=2)
+    assert [(item["name"], item["platform"], item["price_paise"]) for item in ranking] == [
+        ("B", "Flipkart", 99900), ("C", "Amazon", 299950)
+    ]
+    assert errors == {"Reliance Digital": "No products found on Reliance Digital"}
+    assert [item["name"] for item in rank_cheapest(results)[0]] == ["B", "C", "A"]
+    print("[PASS] Cheapest-first ranking")
+
+def test_compare_rank_option():
+    """/compare?rank=cheapest&top=k returns the merged ranking"""
+    with fake_platforms({
+        "Flipkart": fake_scraper("Flipkart", listings=[("TV A", "₹5,000"), ("TV B", "₹1,500")]),
+        "Amazon": fake_scraper("Amazon", listings=[("TV C", "₹2,000.00")]),
+        "Reliance Digital": fake_scraper("Reliance Digital", listings=[("TV D", "₹1,000")]),
+    }), app_module.app.test_client() as client:
+        plain = client.get('/compare?query=tv').get_json()
+        ranked = client.get('/compare?query=tv&rank=cheapest&top=3').get_json()
+        assert client.get('/compare?query=tv&rank=dearest').status_code == 400
+        assert client.get('/compare?query=tv&rank=cheapest&top=0').status_code == 400
+
+    assert plain["Flipkart"][1]["price_paise"] == 150000
+    assert [item["price_paise"] for item in ranked["ranking"]] == [100000, 150000, 200000]
+    assert ranked["errors"] == {}
+    print("[PASS] /compare ranks cheapest first")
+
+if __name__ == "__main__":
+    test_parse_price_formats()
+    test_bulk_matches_single()
+    test_rank_cheapest_top_k()
+    test_compare_rank_option()
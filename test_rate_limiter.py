@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the per-host rate limiter
+"""
+
+import sys
+import os
+import asyncio
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from rate_limiter import RateLimiter
+
+def test_burst_fires_immediately():
+    """Requests within the burst do not wait; the next one waits for the rate"""
+    limiter = RateLimiter(rate=10, burst=3, jitter=0)
+    delays = [limiter.reserve("https://www.amazon.in/s?k=a")[1] for _ in range(4)]
+    assert delays[:3] == [0.0, 0.0, 0.0]
+    assert 0.09 < delays[3] <= 0.1
+    print("[PASS] Burst fires immediately, then requests are spaced")
+
+def test_hosts_have_separate_buckets():
+    """Using up one host's budget does not delay another host"""
+    limiter = RateLimiter(rate=1, burst=1, jitter=0)
+    limiter.reserve("https://www.amazon.in/s?k=a")
+    assert limiter.reserve("https://www.flipkart.com/search?q=a")[1] == 0.0
+    assert limiter.reserve("https://www.amazon.in/s?k=b")[1] > 0.9
+    print("[PASS] Hosts have separate buckets")
+
+def test_threads_limited_in_aggregate():
+    """Many threads together stay within the host's rate"""
+    limiter = RateLimiter(rate=20, burst=2, jitter=0)
+    start = time.monotonic()
+    threads = [threading.Thread(target=limiter.acquire, args=("https://www.amazon.in/",)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - start
+    # 2 immediately, then 6 more at 20 per second
+    assert elapsed >= 0.28, elapsed
+    stats = limiter.stats()["www.amazon.in"]
+    assert stats["requests"] == 8 and stats["delayed"] == 6 and stats["waiting"] == 0
+    assert 290 <= stats["max_wait_ms"] <= 310
+    print("[PASS] Threads are limited in aggregate")
+
+def test_async_callers_share_buckets():
+    """Coroutines wait without blocking and share the threads' buckets"""
+    limiter = RateLimiter(rate=20, burst=1, jitter=0)
+    limiter.acquire("https://www.amazon.in/")
+
+    async def main():
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.acquire_async("https://www.amazon.in/") for _ in range(4)))
+        return time.monotonic() - start
+
+    elapsed = asyncio.run(main())
+    assert 0.18 <= elapsed < 0.5, elapsed
+    print("[PASS] Async callers share buckets")
+
+def test_zero_rate_disables_limiting():
+    """A rate of 0 never delays, but per-host limits still apply"""
+    limiter = RateLimiter(rate=0, burst=1, jitter=0, host_limits={"www.amazon.in": (1, 1)})
+    assert all(limiter.reserve("https://www.flipkart.com/")[1] == 0.0 for _ in range(10))
+    limiter.reserve("https://www.amazon.in/")
+    assert limiter.reserve("https://www.amazon.in/")[1] > 0.9
+    print("[PASS] Zero rate disables limiting")
+
+def test_share_splits_budget():
+    """Each of n worker processes gets 1/n of every host's rate and burst"""
+    limiter = RateLimiter(rate=4, burst=4, jitter=0, host_limits={"www.amazon.in": (2, 3)})
+    limiter.reserve("https://www.flipkart.com/")
+    limiter.share(4)
+    assert (limiter.rate, limiter.burst) == (1, 1)
+    assert limiter.host_limits == {"www.amazon.in": (0.5, 1)}
+    # The bucket made before sharing is replaced
+    assert limiter.reserve("https://www.flipkart.com/")[1] == 0.0
+    assert 0.9 < limiter.reserve("https://www.flipkart.com/")[1] <= 1.0
+    limiter.reserve("https://www.amazon.in/")
+    assert 1.9 < limiter.reserve("https://www.amazon.in/")[1] <= 2.0
+    print("[PASS] Budget shared between worker processes")
+
+if __name__ == "__main__":
+    test_burst_fires_immediately()
+    test_hosts_have_separate_buckets()
+    test_threads_limited_in_aggregate()
+    test_async_callers_share_buckets()
+    test_zero_rate_disables_limiting()
+    test_share_splits_budget()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the comparison result cache
+"""
+
+import sys
+import os
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from result_cache import ResultCache, normalize_query, result_ttl
+from history import HistoryStore
+
+PRODUCT = [{"name": "Phone", "price": "₹1,000", "link": "https://example.com"}]
+ERROR = [{"error": "No products found"}]
+
+def test_ttl_per_platform_and_errors():
+    """Entries live as long as their shortest-lived platform; errors expire sooner"""
+    ttls = {"Flipkart": 600, "Amazon": 300}
+    assert result_ttl({"Flipkart": PRODUCT}, ttls, 100, 10) == 600
+    assert result_ttl({"Flipkart": PRODUCT, "Amazon": PRODUCT}, ttls, 100, 10) == 300
+    assert result_ttl({"Flipkart": PRODUCT, "Amazon": ERROR}, ttls, 100, 10) == 10
+    assert result_ttl({"error": "all failed"}, ttls, 100, 10) == 10
+    print("[PASS] TTL per platform and for errors")
+
+def test_expiry_and_lru_eviction():
+    """Expired entries miss, and the least recently used entry is evicted first"""
+    cache = ResultCache(max_entries=2, platform_ttls={}, default_ttl=60, error_ttl=0.05)
+    cache.set("a", {"Flipkart": PRODUCT})
+    cache.set("b", {"Flipkart": PRODUCT})
+    assert cache.get("a") is not None  # "b" is now least recently used
+    cache.set("c", {"Flipkart": PRODUCT})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+    cache.set("err", {"error": "all failed"})
+    time.sleep(0.06)
+    assert cache.get("err") is None
+
+    stats = cache.stats()
+    assert stats["evictions"] == 2 and stats["expirations"] == 1
+    print(f"[PASS] Expiry and LRU eviction: {stats}")
+
+def test_byte_budget():
+    """Entries are evicted to stay within the byte budget"""
+    cache = ResultCache(max_entries=100, max_bytes=300, platform_ttls={}, default_ttl=60)
+    for i in range(10):
+        cache.set(i, {"Flipkart": PRODUCT})
+    stats = cache.stats()
+    assert 0 < stats["bytes"] <= 300
+    assert stats["entries"] < 10
+    print("[PASS] Byte budget respected")
+
+def test_stale_while_revalidate():
+    """Stale values are served at once while exactly one refresh runs"""
+    import threading
+    cache = ResultCache(platform_ttls={}, default_ttl=0.05, stale_ttl=60)
+    cache.set("q", {"Flipkart": PRODUCT})
+    time.sleep(0.06)
+
+    started = threading.Event()
+    release = threading.Event()
+    refreshes = []
+
+    def slow_refresh():
+        refreshes.append(1)
+        started.set()
+        release.wait(5)
+        return {"Flipkart": PRODUCT + PRODUCT}
+
+    start = time.perf_counter()
+    value, status, age = cache.get_stale_while_revalidate("q", slow_refresh)
+    elapsed = time.perf_counter() - start
+    assert status == "STALE" and value == {"Flipkart": PRODUCT} and age >= 0.05
+    assert elapsed < 0.05
+    started.wait(5)
+    assert cache.get_stale_while_revalidate("q", slow_refresh)[1] == "STALE"
+
+    release.set()
+    for _ in range(100):
+        if cache.stats()["refreshes"]:
+            break
+        time.sleep(0.01)
+    value, status, age = cache.get_stale_while_revalidate("q", slow_refresh)
+    assert status == "HIT" and len(value["Flipkart"]) == 2
+    assert len(refreshes) == 1
+    print("[PASS] Stale-while-revalidate with a single refresh")
+
+def test_compare_route_uses_cache():
+    """A repeated /compare is served from the cache"""
+    import backend.app as app_module
+    app = app_module.app
+    calls = []
+
+    def fake_comparison(query):
+        calls.append(query)
+        return {"Flipkart": PRODUCT}
+
+    saved = (app_module.get_price_comparison, app_module.price_history)
+    app_module.get_price_comparison = fake_comparison
+    app_module.price_history = HistoryStore(enabled=False)
+    app_module.comparison_cache.clear()
+    try:
+        client = app.test_client()
+        first = client.get('/compare?query=Phone')
+        second = client.get('/compare?query=%20phone%20')
+    finally:
+        app_module.get_price_comparison, app_module.price_history = saved
+        app_module.comparison_cache.clear()
+
+    assert calls == ["Phone"]
+    assert first.headers["X-Cache"] == "MISS" and second.headers["X-Cache"] == "HIT"
+    assert second.get_json() == first.get_json()
+    assert normalize_query("  iPhone   15 ") == "iphone 15"
+    print("[PASS] /compare served from cache")
+
+if __name__ == "__main__":
+    test_ttl_per_platform_and_errors()
+    test_expiry_and_lru_eviction()
+    test_byte_budget()
+    test_stale_while_revalidate()
+    test_compare_route_uses_cache()
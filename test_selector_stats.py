@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test script to verify adaptive selector ordering
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+sys.path.append(os.path.join(os.path.dirname(__file__), 'benchmarks'))
+
+import scraper
+from selector_stats import SelectorStats, selector_stats
+from standin import PAGE_BUILDERS
+
+def test_ordering_follows_hit_rate():
+    """Untried selectors keep their order; a selector that keeps missing drops behind"""
+    stats = SelectorStats(alpha=0.5)
+    candidates = ['div.old', 'div.new', 'div.fallback']
+    assert stats.ordered("Flipkart", "price", candidates) == candidates
+
+    for _ in range(3):
+        stats.record("Flipkart", "price", 'div.old', False)
+        stats.record("Flipkart", "price", 'div.new', True, candidates)
+    assert stats.ordered("Flipkart", "price", candidates) == ['div.new', 'div.fallback', 'div.old']
+
+    report = stats.stats()["Flipkart"]["price"]
+    assert report["fallback_hits"] == 3
+    assert report["selectors"][0]["selector"] == 'div.new'
+    assert report["selectors"][-1]["misses"] == 3
+    print("[PASS] Selectors ordered by recent hit rate")
+
+def test_scraper_learns_layout():
+    """After a layout change the scraper tries the matching container first"""
+    selector_stats.reset()
+    page = PAGE_BUILDERS["Reliance Digital"]("iphone", noise_blocks=1)
+    # Simulate a layout where only the fallback container class exists
+    page = page.replace('<li class="product-item">', '<li class="x"><div class="col-md-3">').replace('</li>', '</div></li>')
+    try:
+        for _ in range(10):
+            products = scraper.parse_reliance_html(page.encode('utf-8'))
+            assert 'error' not in products[0]
+        order = selector_stats.ordered("Reliance Digital", "container", scraper.RELIANCE_CONTAINER_PATTERNS)
+        assert order[0] == 'div.col-md-3'
+        assert selector_stats.stats()["Reliance Digital"]["container"]["fallback_hits"] == 10
+    finally:
+        selector_stats.reset()
+    print("[PASS] Scraper promotes the selector that matches the current layout")
+
+if __name__ == "__main__":
+    test_ordering_follows_hit_rate()
+    test_scraper_learns_layout()
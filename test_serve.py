@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the production server entry point
+"""
+
+import sys
+import os
+import signal
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+
+import requests
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(ROOT, 'backend'))
+
+import scraper
+import http_pool
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_server(server, port, workers=2, **env):
+    """Start serve.py answering from the recorded fixtures; returns the process once it is ready"""
+    env = dict(os.environ, PRICEPULSE_FIXTURES="replay:" + os.path.join(ROOT, 'benchmarks', 'fixtures'),
+               PRICEPULSE_HISTORY="0", PRICEPULSE_WATCHLIST="0", PRICEPULSE_CACHE_ENTRIES="0", **env)
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, 'backend', 'serve.py'), '--server', server,
+         '--bind', f"127.0.0.1:{port}", '--workers', str(workers), '--graceful-timeout', '10'],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 20
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f"http://127.0.0.1:{port}/health", timeout=1)
+            return process
+        except requests.ConnectionError:
+            time.sleep(0.1)
+    process.kill()
+    raise AssertionError(f"{server} did not start")
+
+def test_fork_resets_process_state():
+    """A forked child gets its own scraper pool and HTTP sessions"""
+    if not hasattr(os, 'fork'):
+        print("[SKIP] os.fork not available")
+        return
+    scraper.get_executor().submit(lambda: None).result()
+    http_pool.get_session("https://www.amazon.in")
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        ok = scraper._executor is None and not http_pool._sessions
+        ok = ok and scraper.get_executor().submit(lambda: 42).result(timeout=5) == 42
+        os.write(write_end, b"1" if ok else b"0")
+        os._exit(0)
+    os.close(write_end)
+    result = os.read(read_end, 1)
+    os.waitpid(pid, 0)
+    os.close(read_end)
+    assert result == b"1"
+    assert scraper._executor is not None and http_pool._sessions
+    print("[PASS] Forked workers start with fresh pools")
+
+def check_graceful_shutdown(server):
+    port = free_port()
+    # One request per second per host, so the second search waits about a second for its budget
+    process = start_server(server, port, workers=1, PRICEPULSE_RATE="1", PRICEPULSE_BURST="1",
+                           PRICEPULSE_RATE_JITTER="0")
+    try:
+        assert requests.get(f"http://127.0.0.1:{port}/compare?query=laptop", timeout=10).status_code == 200
+        responses = []
+        in_flight = threading.Thread(target=lambda: responses.append(
+            requests.get(f"http://127.0.0.1:{port}/compare?query=iphone 15", timeout=10)))
+        in_flight.start()
+        time.sleep(0.3)
+        process.send_signal(signal.SIGTERM)
+        in_flight.join()
+        assert process.wait(timeout=15) == 0
+    finally:
+        if process.poll() is None:
+            process.kill()
+    assert responses[0].status_code == 200 and "Amazon" in responses[0].json()
+    assert responses[0].elapsed.total_seconds() > 0.3  # it was still waiting when the signal arrived
+    print(f"[PASS] {server} finished the in-flight comparison before exiting")
+
+def test_graceful_shutdown():
+    """SIGTERM lets a comparison in flight finish, then the server exits cleanly"""
+    if os.name != 'posix':
+        print("[SKIP] signals are POSIX only")
+        return
+    servers = [server for server in ('gunicorn', 'waitress') if _installed(server)]
+    if not servers:
+        print("[SKIP] neither gunicorn nor waitress installed")
+        return
+    for server in servers:
+        check_graceful_shutdown(server)
+
+def test_workers_share_alerts():
+    """Alerts added through different gunicorn workers get distinct ids and are listed by every worker"""
+    if os.name != 'posix' or not _installed('gunicorn'):
+        print("[SKIP] gunicorn not installed")
+        return
+    port = free_port()
+    with tempfile.TemporaryDirectory() as directory:
+        process = start_server('gunicorn', port, workers=2, PRICEPULSE_ALERTS_DB=os.path.join(directory, "alerts.db"),
+                               PRICEPULSE_ALERT_SYNC="0")
+        try:
+            # Fresh connections, so the requests spread over both workers
+            added = [requests.post(f"http://127.0.0.1:{port}/alerts", json={"product": f"Phone {i}", "below": 1000},
+                                   headers={"Connection": "close"}, timeout=10) for i in range(12)]
+            listed = [len(requests.get(f"http://127.0.0.1:{port}/alerts", headers={"Connection": "close"},
+                                       timeout=10).json()["alerts"]) for _ in range(6)]
+        finally:
+            process.send_signal(signal.SIGTERM)
+            process.wait(timeout=15)
+    assert [response.status_code for response in added] == [201] * 12
+    assert len({response.json()["id"] for response in added}) == 12
+    assert listed == [12] * 6
+    print("[PASS] gunicorn workers share alerts")
+
+def _installed(module):
+    try:
+        __import__(module)
+        return True
+    except ImportError:
+        return False
+
+if __name__ == "__main__":
+    test_fork_resets_process_state()
+    test_graceful_shutdown()
+    test_workers_share_alerts()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test script to verify request coalescing
+"""
+
+import sys
+import os
+import asyncio
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+from singleflight import SingleFlight
+
+def test_threads_share_one_call():
+    """Concurrent threads with the same key run the work once"""
+    flights = SingleFlight()
+    calls = []
+
+    def work():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"Flipkart": []}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flights.do("k", work))) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(results) == 10 and all(result is results[0] for result in results)
+    assert flights.stats() == {"in_flight": 0, "leaders": 1, "followers": 9}
+    print("[PASS] Threads share one call")
+
+def test_async_and_threads_share_one_call():
+    """Coroutines attach to a call started by a thread, and errors are shared"""
+    flights = SingleFlight()
+    started = threading.Event()
+
+    def work():
+        started.set()
+        time.sleep(0.2)
+        return "result"
+
+    leader = threading.Thread(target=lambda: flights.do("k", work))
+    leader.start()
+    started.wait(5)
+
+    async def never_called():
+        raise AssertionError("follower should not run")
+
+    async def followers():
+        return await asyncio.gather(*(flights.do_async("k", never_called) for _ in range(5)))
+
+    assert asyncio.run(followers()) == ["result"] * 5
+    leader.join()
+
+    async def failing():
+        await asyncio.sleep(0.1)
+        raise ValueError("blocked")
+
+    async def failing_callers():
+        return await asyncio.gather(*(flights.do_async("x", failing) for _ in range(3)), return_exceptions=True)
+
+    errors = asyncio.run(failing_callers())
+    assert all(isinstance(error, ValueError) for error in errors)
+    assert flights.stats()["in_flight"] == 0
+    print("[PASS] Async callers share calls and errors")
+
+if __name__ == "__main__":
+    test_threads_share_one_call()
+    test_async_and_threads_share_one_call()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the backend starts without loading its heavy dependencies
+"""
+
+import sys
+import os
+import json
+import subprocess
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+BACKEND = os.path.join(ROOT, 'backend')
+
+# Loaded on first use of the engine that needs them
+LAZY_MODULES = ["scraper", "async_scraper", "api_client", "bs4", "requests", "aiohttp"]
+
+def run_python(code):
+    """Run code in a fresh interpreter from the backend directory and return what it prints as JSON"""
+    result = subprocess.run([sys.executable, '-c', code], cwd=BACKEND, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+def test_app_import_skips_scrapers():
+    """Importing the app loads no scraper, HTTP or parser library"""
+    loaded = run_python(
+        "import sys, json, app\n"
+        f"print(json.dumps([name for name in {LAZY_MODULES!r} if name in sys.modules]))"
+    )
+    assert loaded == [], loaded
+    print("[PASS] App imports without scrapers, requests, BeautifulSoup or aiohttp")
+
+def test_health_skips_scrapers():
+    """/health reports every platform's breaker without importing the scrapers"""
+    health = run_python(
+        "import sys, json, app\n"
+        "body = app.app.test_client().get('/health').get_json()\n"
+        f"print(json.dumps([sorted(body['circuit_breakers']), [name for name in {LAZY_MODULES!r} if name in sys.modules]]))"
+    )
+    assert health == [["Amazon", "Flipkart", "Reliance Digital"], []], health
+    print("[PASS] /health answers without loading the scrapers")
+
+def test_scrapers_load_on_first_use():
+    """The first call that needs the scrapers imports them"""
+    loaded = run_python(
+        "import sys, json, app\n"
+        "app.warm_up = lambda urls: None\n"
+        "app.warm_up_connections().join()\n"
+        "loaded = ['scraper' in sys.modules, 'bs4' in sys.modules, 'aiohttp' in sys.modules]\n"
+        "import scraper\n"
+        "print(json.dumps(loaded + [list(scraper.PLATFORM_SCRAPERS) == list(app.PLATFORMS)]))"
+    )
+    assert loaded == [True, True, False, True]
+    print("[PASS] Scrapers load with the first call that needs them")
+
+def test_api_clients_checked_on_first_use():
+    """API availability comes from importing the clients on first use, not from finding their file"""
+    checks = run_python(
+        "import sys, json, app\n"
+        "before = app.API_AVAILABLE\n"
+        "sys.modules['api_client'] = None\n"
+        "missing = app.api_available()\n"
+        "del sys.modules['api_client']\n"
+        "cached = app.api_available()\n"
+        "app.API_AVAILABLE = None\n"
+        "print(json.dumps([before, missing, cached, app.api_available(), 'api_client' in sys.modules]))"
+    )
+    assert checks == [None, False, False, True, True], checks
+    print("[PASS] API clients are imported and checked on first use")
+
+def test_backend_path_added_once():
+    """app.py adds the backend directory to sys.path only when it is missing"""
+    counts = run_python(
+        "import sys, os, json, importlib\n"
+        "import app\n"
+        "backend = os.path.dirname(os.path.abspath(app.__file__))\n"
+        "first = sys.path.count(backend)\n"
+        "importlib.reload(app)\n"
+        "print(json.dumps([first, sys.path.count(backend)]))"
+    )
+    assert counts == [1, 1], counts
+    print("[PASS] Backend directory is on sys.path exactly once")
+
+if __name__ == "__main__":
+    test_app_import_skips_scrapers()
+    test_health_skips_scrapers()
+    test_scrapers_load_on_first_use()
+    test_api_clients_checked_on_first_use()
+    test_backend_path_added_once()
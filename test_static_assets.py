@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the in-memory frontend, ETag revalidation and response compression
+"""
+
+import sys
+import os
+import gzip
+import json
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import backend.app as app_module
+from static_assets import StaticAssets, choose_encoding
+from result_cache import ResultCache
+from history import HistoryStore
+from suggest import SuggestionIndex
+from werkzeug.datastructures import Accept
+from werkzeug.http import parse_accept_header
+
+def test_frontend_served_from_memory():
+    """index.html is read once, precompressed, and revalidated with its ETag"""
+    client = app_module.app.test_client()
+    with open(os.path.join(os.path.dirname(__file__), 'frontend', 'index.html'), 'rb') as f:
+        page = f.read()
+
+    plain = client.get('/')
+    assert plain.status_code == 200 and plain.data == page
+    assert 'Content-Encoding' not in plain.headers
+    assert plain.headers['Cache-Control'].startswith('public, max-age=')
+    assert plain.headers['Vary'] == 'Accept-Encoding'
+
+    compressed = client.get('/', headers={'Accept-Encoding': 'gzip'})
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(compressed.data) == page
+    assert len(compressed.data) < len(page) / 2
+    assert compressed.headers['ETag'] != plain.headers['ETag']
+
+    # Either encoding's ETag, weak or strong, means the browser's copy is current
+    for etag in (plain.headers['ETag'], compressed.headers['ETag'], 'W/' + plain.headers['ETag'], '*'):
+        revalidated = client.get('/', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+        assert revalidated.status_code == 304 and revalidated.data == b''
+        assert revalidated.headers['ETag'] == compressed.headers['ETag']
+    assert client.get('/', headers={'If-None-Match': '"stale"'}).status_code == 200
+    print("[PASS] Frontend served from memory with gzip, ETag and 304")
+
+def test_assets_load_once():
+    """A file is read and compressed on first request only; missing files give None"""
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, 'asset_test.html')
+        with open(path, 'w') as f:
+            f.write("<p>first</p>" * 200)
+        assets = StaticAssets(root)
+        first = assets.get('asset_test.html', 'text/html')
+        with open(path, 'w') as f:
+            f.write("<p>second</p>")
+        assert assets.get('asset_test.html', 'text/html') is first
+        assert first.bodies[None] == b"<p>first</p>" * 200 and 'gzip' in first.bodies
+        assert assets.get('missing.html', 'text/html') is None
+    print("[PASS] Assets load once per process")
+
+def test_encoding_negotiation():
+    """Client preferences and q=0 are honoured; ties go to the first encoding offered"""
+    def accept(header):
+        return parse_accept_header(header, Accept)
+    assert choose_encoding(accept('gzip, deflate, br'), ('br', 'gzip')) == 'br'
+    assert choose_encoding(accept('br;q=0.5, gzip'), ('br', 'gzip')) == 'gzip'
+    assert choose_encoding(accept('gzip;q=0, *'), ('gzip',)) is None
+    assert choose_encoding(accept('identity'), ('br', 'gzip')) is None
+    assert choose_encoding(accept(''), ('gzip',)) is None
+    print("[PASS] Accept-Encoding negotiation")
+
+def test_compare_compressed():
+    """Large /compare results are gzipped for clients that accept it; the body is unchanged"""
+    results = {"Amazon": [{"name": f"Phone {i}", "price": f"₹{i},999", "link": f"https://www.amazon.in/dp/{i}"}
+                          for i in range(40)]}
+    saved = (app_module.comparison_cache, app_module.price_history, app_module.suggestion_index,
+             app_module.fetch_comparison)
+    app_module.comparison_cache = ResultCache()
+    app_module.price_history = HistoryStore(enabled=False)
+    app_module.suggestion_index = SuggestionIndex()
+    app_module.fetch_comparison = lambda query, use_api: results
+    try:
+        client = app_module.app.test_client()
+        plain = client.get('/compare?query=phone')
+        compressed = client.get('/compare?query=phone', headers={'Accept-Encoding': 'gzip'})
+        debug = client.get('/compare?query=phone&debug=1', headers={'Accept-Encoding': 'gzip'})
+        small = client.get('/compare', headers={'Accept-Encoding': 'gzip'})
+    finally:
+        (app_module.comparison_cache, app_module.price_history, app_module.suggestion_index,
+         app_module.fetch_comparison) = saved
+
+    assert 'Content-Encoding' not in plain.headers and 'Accept-Encoding' in plain.headers['Vary']
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(compressed.data)) == plain.get_json() == results
+    assert int(compressed.headers['Content-Length']) == len(compressed.data) < len(plain.data)
+    # The trace is added before the body is compressed
+    assert '_trace' in json.loads(gzip.decompress(debug.data))
+    # Error bodies under the size threshold are sent as they are
+    assert small.status_code == 400 and 'Content-Encoding' not in small.headers
+    print("[PASS] /compare results compressed on request")
+
+if __name__ == "__main__":
+    test_frontend_served_from_memory()
+    test_assets_load_once()
+    test_encoding_negotiation()
+    test_compare_compressed()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the streaming /compare endpoint
+"""
+
+import sys
+import os
+import json
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import scraper
+import backend.app as app_module
+from conftest import fake_platforms, fake_scraper
+
+def _stream(client, query):
+    """Return (events, seconds until each event arrived)"""
+    start = time.perf_counter()
+    response = client.get(f'/compare/stream?query={query}', buffered=False)
+    assert response.mimetype == 'application/x-ndjson'
+    events, arrivals = [], []
+    for line in response.response:
+        events.append(json.loads(line))
+        arrivals.append(time.perf_counter() - start)
+    response.close()
+    return events, arrivals
+
+def test_fastest_platform_streams_first():
+    """Each platform is sent as it finishes, then a summary; a repeat is served from cache"""
+    saved_backoff = scraper.RETRY_BACKOFF
+    scraper.RETRY_BACKOFF = 0.05
+    try:
+        with fake_platforms({
+            "Flipkart": fake_scraper("Flipkart", 0.8),
+            "Amazon": fake_scraper("Amazon", 0.1),
+            # Failures are retried, so this platform takes 3 x 0.15 s plus at most 0.15 s of backoff
+            "Reliance Digital": fake_scraper("Reliance Digital", 0.15, fail=True),
+        }), app_module.app.test_client() as client:
+            events, arrivals = _stream(client, "phone")
+            cached, _ = _stream(client, "phone")
+    finally:
+        scraper.RETRY_BACKOFF = saved_backoff
+
+    assert [event.get("platform") for event in events] == ["Amazon", "Reliance Digital", "Flipkart", None]
+    assert arrivals[0] < 0.4
+    assert events[1]["results"][0]["error"].startswith("Unable to connect")
+    summary = events[-1]
+    assert summary["event"] == "summary" and summary["cache"] == "MISS"
+    assert summary["platforms"] == 3 and summary["succeeded"] == 2 and "error" not in summary
+
+    assert cached[-1]["cache"] == "HIT"
+    assert [event.get("platform") for event in cached] == ["Flipkart", "Amazon", "Reliance Digital", None]
+    print(f"[PASS] First platform after {arrivals[0]:.2f}s, last after {arrivals[-1]:.2f}s")
+
+def test_summary_reports_total_failure():
+    """When every platform fails the summary carries the same error as /compare"""
+    with fake_platforms({
+        platform: fake_scraper(platform, 0, fail=True) for platform in scraper.PLATFORM_SCRAPERS
+    }), app_module.app.test_client() as client:
+        events, _ = _stream(client, "phone")
+    assert len(events) == 4
+    assert events[-1]["succeeded"] == 0
+    assert events[-1]["error"].startswith("Unable to fetch data from any e-commerce platform")
+    print("[PASS] Summary reports total failure")
+
+def test_stream_validates_query():
+    """/compare/stream rejects a missing query like /compare"""
+    with app_module.app.test_client() as client:
+        assert client.get('/compare/stream').status_code == 400
+        assert client.get('/compare/stream?query=%20').status_code == 400
+    print("[PASS] /compare/stream validates its query")
+
+def test_concurrent_streams_share_one_scrape():
+    """Streams and /compare requests for the same query in flight share one scrape per platform"""
+    calls = {}
+    lock = threading.Lock()
+
+    def counting(platform, delay):
+        scrape = fake_scraper(platform, delay)
+        def counted(query):
+            with lock:
+                calls[platform] = calls.get(platform, 0) + 1
+            return scrape(query)
+        return counted
+
+    streams, compared = [], []
+
+    def stream():
+        with app_module.app.test_client() as client:
+            streams.append(_stream(client, "trending phone"))
+
+    def compare():
+        with app_module.app.test_client() as client:
+            compared.append(client.get('/compare?query=trending phone').get_json())
+
+    with fake_platforms({
+        "Flipkart": counting("Flipkart", 0.4),
+        "Amazon": counting("Amazon", 0.1),
+        "Reliance Digital": counting("Reliance Digital", 0.2),
+    }), app_module.app.test_client() as client:
+        threads = [threading.Thread(target=stream) for _ in range(5)]
+        threads[0].start()
+        time.sleep(0.05)
+        threads += [threading.Thread(target=compare)]
+        for thread in threads[1:]:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        cached, _ = _stream(client, "trending phone")
+
+    assert calls == {"Flipkart": 1, "Amazon": 1, "Reliance Digital": 1}
+    for events, arrivals in streams:
+        # Followers get each platform as it finishes, not only once the whole scrape is done
+        assert [event.get("platform") for event in events] == ["Amazon", "Reliance Digital", "Flipkart", None]
+        assert arrivals[0] < 0.3
+        assert events[-1]["cache"] == "MISS" and events[-1]["succeeded"] == 3
+    assert compared[0]["Amazon"][0]["name"] == "Amazon trending phone"
+    assert cached[-1]["cache"] == "HIT"
+    print("[PASS] Concurrent streams share one scrape")
+
+def test_api_stream_is_cached():
+    """A stream using the API clients caches the result for the next request"""
+    calls = []
+
+    def fake_api(query):
+        calls.append(query)
+        return {"Amazon": [{"name": f"Amazon {query}", "price": "₹1,000", "link": "https://example.com"}]}
+
+    saved = (app_module.API_AVAILABLE, app_module.get_price_comparison_api)
+    app_module.API_AVAILABLE, app_module.get_price_comparison_api = True, fake_api
+    try:
+        with fake_platforms({}), app_module.app.test_client() as client:
+            first = [json.loads(line) for line in client.get('/compare/stream?query=phone&method=api').data.splitlines()]
+            second = [json.loads(line) for line in client.get('/compare/stream?query=phone&method=api').data.splitlines()]
+            cached = client.get('/compare?query=phone&method=api')
+    finally:
+        app_module.API_AVAILABLE, app_module.get_price_comparison_api = saved
+
+    assert calls == ["phone"]
+    assert first[-1]["cache"] == "MISS" and second[-1]["cache"] == "HIT"
+    assert second[0]["results"] == first[0]["results"]
+    assert cached.headers["X-Cache"] == "HIT"
+    print("[PASS] API streams are cached")
+
+if __name__ == "__main__":
+    test_fastest_platform_streams_first()
+    test_summary_reports_total_failure()
+    test_stream_validates_query()
+    test_concurrent_streams_share_one_scrape()
+    test_api_stream_is_cached()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script to verify search suggestions
+"""
+
+import sys
+import os
+import random
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import scraper
+import backend.app as app_module
+from suggest import SuggestionIndex
+from conftest import fake_platforms
+
+def test_ranks_by_popularity_and_updates():
+    """Suggestions come most popular first and follow new searches at once"""
+    index = SuggestionIndex(scan_limit=1)
+    for query, searches in (("iPhone 15", 3), ("iphone 14", 2), ("iPad Air", 1), ("samsung tv", 5)):
+        for _ in range(searches):
+            index.record_query(query)
+    index.add_products({
+        "Amazon": [{"name": "Apple iPhone 15 (128 GB) - Black", "price": "₹69,999"}],
+        "Flipkart": [{"name": "iPhone 15 Pro Max " + "x" * 80 + "...", "price": "₹1,59,900"},
+                     {"error": "Unable to connect to Flipkart."}],
+    })
+
+    texts = lambda prefix, limit=10: [suggestion["text"] for suggestion in index.suggest(prefix, limit)]
+    assert texts("i") == ["iPhone 15", "iphone 14", "iPad Air", "iPhone 15 Pro Max " + "x" * 80]
+    assert texts("IPH", 2) == ["iPhone 15", "iphone 14"]
+    assert texts("apple") == ["Apple iPhone 15 (128 GB) - Black"]
+    assert texts("") == [] and texts("nokia") == []
+
+    # "i" and "iph" are cached now; three more searches move iPad Air to the top
+    for _ in range(3):
+        index.record_query("ipad air")
+    assert texts("i", 2) == ["iPad Air", "iPhone 15"]
+    # A product that is searched for keeps the typed spelling
+    index.record_query("apple iphone 15 (128 gb) - black")
+    assert index.suggest("apple")[0] == {"query": "apple iphone 15 (128 gb) - black",
+                                         "text": "apple iphone 15 (128 gb) - black", "score": 1.2, "searched": True}
+    print("[PASS] Suggestions ranked by popularity")
+
+def test_cached_prefixes_match_brute_force():
+    """Cached top-k lists stay identical to ranking every match from scratch"""
+    rng = random.Random(11)
+    words = ["iphone", "ipad", "samsung", "galaxy", "sony", "tv", "laptop", "lenovo", "15", "14", "pro"]
+    index = SuggestionIndex(scan_limit=3, top_k=5)
+    scores = {}
+    for step in range(3000):
+        query = " ".join(rng.sample(words, rng.randint(1, 3)))
+        index.record_query(query)
+        scores[query] = scores.get(query, 0) + 1
+        if step % 50 == 0:
+            for prefix in ("i", "ip", "s", "sa", "l", "1", "p", "iphone 1"):
+                expected = sorted((key for key in scores if key.startswith(prefix)),
+                                  key=lambda key: (-scores[key], key))[:5]
+                assert [suggestion["query"] for suggestion in index.suggest(prefix)] == expected, prefix
+    assert index.stats()["cached_prefixes"] >= 6
+    print("[PASS] Cached prefixes match a full ranking")
+
+def test_suggest_latency():
+    """Lookups over 100k terms take well under a millisecond"""
+    rng = random.Random(5)
+    index = SuggestionIndex()
+    index.seed(((f"product {rng.randrange(10 ** 6)} {rng.choice('abcdefgh')}", rng.randint(1, 50))
+                for _ in range(100000)))
+    prefixes = [f"product {rng.randrange(10 ** 6)}"[:rng.randint(1, 12)] for _ in range(2000)]
+    for prefix in prefixes:
+        index.suggest(prefix)
+    start = time.perf_counter()
+    for prefix in prefixes:
+        index.suggest(prefix)
+    per_lookup_ms = (time.perf_counter() - start) / len(prefixes) * 1000
+    assert per_lookup_ms < 0.5, per_lookup_ms
+    print(f"[PASS] Suggest lookup {per_lookup_ms * 1000:.0f} us over {index.stats()['terms']:,} terms")
+
+def test_suggest_route():
+    """/compare feeds /suggest, and cached queries are listed first"""
+    with fake_platforms({
+        platform: (lambda query: [{"name": f"Apple {query.title()} (128 GB)", "price": "₹69,999"}])
+        for platform in scraper.PLATFORM_SCRAPERS
+    }), app_module.app.test_client() as client:
+        app_module.suggestion_index.seed([("iphone 14", 10)])
+        assert client.get('/compare?query=iPhone 15').status_code == 200
+        suggested = client.get('/suggest?prefix=iph').get_json()
+        products = client.get('/suggest?prefix=apple&limit=1').get_json()
+        assert client.get('/suggest?prefix=iph&limit=0').status_code == 400
+        stats = client.get('/stats/suggest').get_json()
+
+    assert [(item["text"], item["cached"]) for item in suggested["suggestions"]] == [
+        ("iPhone 15", True), ("iphone 14", False)
+    ]
+    assert products["suggestions"][0]["text"] == "Apple Iphone 15 (128 GB)"
+    assert stats["terms"] == 3 and stats["lookups"] == 2
+    print("[PASS] /suggest serves searched queries, cached first")
+
+if __name__ == "__main__":
+    test_ranks_by_popularity_and_updates()
+    test_cached_prefixes_match_brute_force()
+    test_suggest_latency()
+    test_suggest_route()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test script to verify request tracing and the sampling profiler
+"""
+
+import sys
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+sys.path.append(os.path.join(os.path.dirname(__file__), 'benchmarks'))
+
+import scraper
+import tracing
+import backend.app as app_module
+from tracing import SamplingProfiler, span, start_trace, end_trace, current_trace
+from result_cache import ResultCache
+from history import HistoryStore
+from suggest import SuggestionIndex
+from circuit_breaker import BreakerRegistry
+from rate_limiter import RateLimiter
+from standin import StandInServer
+
+def test_spans_follow_the_context_into_threads():
+    """Spans opened on a pool join the trace of the context that submitted them"""
+    assert span('idle') is span('other')  # untraced work shares one no-op span
+    trace = start_trace("GET /compare")
+    try:
+        with span('cache'):
+            pass
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            def work(platform):
+                with span('fetch', platform):
+                    time.sleep(0.02)
+            futures = [pool.submit(copy_context().run, work, platform) for platform in ("Amazon", "Flipkart")]
+            for future in futures:
+                future.result()
+            # Without the copied context the pool thread is not traced
+            pool.submit(work, "Reliance Digital").result()
+    finally:
+        end_trace(trace)
+    assert current_trace() is None
+
+    names = [(item["name"], item["detail"]) for item in trace.to_dict()["spans"]]
+    assert names[0] == ("cache", None)
+    assert sorted(names[1:]) == [("fetch", "Amazon"), ("fetch", "Flipkart")]
+    header = trace.server_timing()
+    assert header.startswith("cache;dur=")
+    assert 'fetch;desc="Amazon";dur=' in header and header.split(", ")[-1].startswith("total;dur=")
+    assert list(trace.threads.values()) == [1]  # only the request thread is left
+    print("[PASS] Spans follow the request context into pool threads")
+
+def test_compare_reports_phases():
+    """/compare sends a Server-Timing header, and ?debug=1 embeds the trace"""
+    saved = (scraper.FLIPKART_URL, scraper.AMAZON_URL, scraper.RELIANCE_URL, scraper.rate_limiter,
+             scraper.platform_breakers, app_module.comparison_cache, app_module.price_history,
+             app_module.suggestion_index)
+    scraper.rate_limiter = RateLimiter(rate=0)
+    scraper.platform_breakers = BreakerRegistry()
+    app_module.comparison_cache = ResultCache()
+    app_module.price_history = HistoryStore(enabled=False)
+    app_module.suggestion_index = SuggestionIndex()
+    try:
+        with StandInServer(delays={"Amazon": 0.05}, noise_blocks=1) as server:
+            server.point_scraper(scraper)
+            with app_module.app.test_client() as client:
+                first = client.get('/compare?query=iphone&debug=1')
+                cached = client.get('/compare?query=iphone')
+    finally:
+        (scraper.FLIPKART_URL, scraper.AMAZON_URL, scraper.RELIANCE_URL, scraper.rate_limiter,
+         scraper.platform_breakers, app_module.comparison_cache, app_module.price_history,
+         app_module.suggestion_index) = saved
+
+    header = first.headers['Server-Timing']
+    for phase in ('cache;', 'fetch;desc="Amazon"', 'parse;desc="Flipkart"', 'extract;desc="Reliance Digital"',
+                  'rate-limit;desc="Amazon"', 'scrape;desc="Amazon"', 'cache-store;', 'total;'):
+        assert phase in header, phase
+    trace = first.get_json()["_trace"]
+    fetches = {item["detail"]: item for item in trace["spans"] if item["name"] == "fetch"}
+    assert fetches["Amazon"]["duration_ms"] >= 50
+    assert fetches["Amazon"]["thread"].startswith("pricepulse-scraper")
+    assert trace["total_ms"] >= fetches["Amazon"]["duration_ms"]
+    assert "_trace" not in cached.get_json()
+    assert cached.headers['Server-Timing'].startswith("cache;dur=") and "fetch" not in cached.headers['Server-Timing']
+    print("[PASS] /compare reports fetch, parse and extract time per platform")
+
+def test_profiler_keeps_slowest_requests():
+    """The profiler keeps folded stacks of the slowest requests only"""
+    saved = (tracing.PROFILE_SLOWEST, tracing._profiler, app_module.PROFILE_SLOWEST)
+    tracing.PROFILE_SLOWEST = app_module.PROFILE_SLOWEST = 2
+    tracing._profiler = profiler = SamplingProfiler(slowest=2, interval=0.002)
+    try:
+        for delay in (0.01, 0.08, 0.04):
+            trace = start_trace(f"sleep {delay}")
+            with span('work'):
+                time.sleep(delay)
+            end_trace(trace)
+        with app_module.app.test_client() as client:
+            listing = client.get('/debug/profiles').get_json()
+            folded = client.get('/debug/profiles/0')
+            missing = client.get('/debug/profiles/5')
+    finally:
+        tracing.PROFILE_SLOWEST, tracing._profiler, app_module.PROFILE_SLOWEST = saved
+
+    assert listing["enabled"] is True
+    assert [profile["request"] for profile in listing["profiles"]] == ["sleep 0.08", "sleep 0.04"]
+    assert missing.status_code == 404
+    # Folded stacks: root first, frames joined with ';', then the sample count
+    lines = folded.get_data(as_text=True).splitlines()
+    assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert any("test_profiler_keeps_slowest_requests (test_tracing.py" in line for line in lines)
+    assert profiler.sample_count > 0
+    print(f"[PASS] Profiler kept {len(listing['profiles'])} slowest requests, {profiler.sample_count} samples")
+
+if __name__ == "__main__":
+    test_spans_follow_the_context_into_threads()
+    test_compare_reports_phases()
+    test_profiler_keeps_slowest_requests()
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the watchlist tracker
+"""
+
+import sys
+import os
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
+
+import scraper
+from circuit_breaker import BreakerRegistry
+from conftest import fake_platforms
+from history import HistoryStore
+from watchlist import Watchlist
+
+class FakePlatforms:
+    """Scrapers that count calls and concurrent calls per platform"""
+
+    def __init__(self, delay=0.05, failing=()):
+        self.delay = delay
+        self.failing = set(failing)
+        self.calls = {}
+        self.active = {}
+        self.peak = {}
+        self.lock = threading.Lock()
+
+    def scraper_for(self, platform):
+        def scrape(query):
+            with self.lock:
+                self.calls[platform] = self.calls.get(platform, 0) + 1
+                self.active[platform] = self.active.get(platform, 0) + 1
+                self.peak[platform] = max(self.peak.get(platform, 0), self.active[platform])
+            time.sleep(self.delay)
+            with self.lock:
+                self.active[platform] -= 1
+            if platform in self.failing:
+                return [{"error": f"Unable to connect to {platform}. Check your internet connection."}]
+            return [{"name": f"{platform} {query}", "price": "₹1,000", "link": "https://example.com"}]
+        return scrape
+
+    def scrapers(self):
+        return {platform: self.scraper_for(platform) for platform in scraper.PLATFORM_SCRAPERS}
+
+def _in_database(fakes, test):
+    """Run test(path) against the fakes with a fresh watchlist database"""
+    with fake_platforms(fakes.scrapers(), BreakerRegistry(min_calls=1000)), \
+            tempfile.TemporaryDirectory() as directory:
+        return test(os.path.join(directory, "watchlist.db"))
+
+def test_schedule_respects_concurrency():
+    """Due items run with bounded per-platform concurrency and are rescheduled"""
+    fakes = FakePlatforms(delay=0.05)
+
+    def test(path):
+        watchlist = Watchlist(path, concurrency=2, jitter=0, history=HistoryStore(enabled=False))
+        for i in range(6):
+            watchlist.add(f"item {i}", interval=0.3)
+        watchlist.start()
+        time.sleep(0.5)
+        watchlist.stop()
+        return watchlist.stats()
+
+    stats = _in_database(fakes, test)
+    # Six items per platform, two at a time, each due again 0.3 s later
+    assert all(calls >= 12 for calls in fakes.calls.values()), fakes.calls
+    assert max(fakes.peak.values()) == 2, fakes.peak
+    assert stats["queries"] == 6 and stats["failures"] == 0
+    assert stats["platforms"]["Amazon"]["tracked"] == 6
+    assert stats["platforms"]["Amazon"]["required_rate"] == 20.0
+    assert 0 <= stats["lag_p50_s"] <= stats["lag_max_s"] < 0.3
+    print(f"[PASS] Watchlist ran {stats['runs']} scrapes, lag p95 {stats['lag_p95_s']}s")
+
+def test_failures_back_off():
+    """A failing platform is retried after an exponential backoff, not the interval"""
+    fakes = FakePlatforms(delay=0, failing={"Amazon"})
+
+    def test(path):
+        watchlist = Watchlist(path, concurrency=1, jitter=0, backoff_base=0.1, max_backoff=10,
+                              history=HistoryStore(enabled=False))
+        watchlist.add("phone", interval=60)
+        watchlist.start()
+        time.sleep(0.45)
+        watchlist.stop()
+        return watchlist.items()[0]["platforms"]
+
+    platforms = _in_database(fakes, test)
+    # Runs at 0, 0.1, 0.3 (then 0.7): three attempts, while the others ran once
+    assert fakes.calls["Amazon"] == 3 and fakes.calls["Flipkart"] == 1
+    assert platforms["Amazon"]["failures"] == 3 and platforms["Amazon"]["last_ok"] is False
+    assert platforms["Flipkart"]["failures"] == 0 and platforms["Flipkart"]["last_ok"] is True
+    print("[PASS] Failing platform backs off")
+
+def test_schedule_survives_restart():
+    """A new tracker on the same database resumes the persisted schedule"""
+    fakes = FakePlatforms(delay=0)
+
+    def test(path):
+        first = Watchlist(path, jitter=0, history=HistoryStore(enabled=False))
+        first.add("Galaxy S24", interval=120)
+        first.add("pixel 8", interval=60)
+        first.remove("pixel 8")
+        first.start()
+        time.sleep(0.2)
+        first.stop()
+
+        second = Watchlist(path, jitter=0, history=HistoryStore(enabled=False))
+        return first.items(), second.items()
+
+    before, after = _in_database(fakes, test)
+    assert after == before
+    assert len(after) == 1 and after[0]["query"] == "Galaxy S24"
+    assert all(platform["next_due"] > time.time() + 100 for platform in after[0]["platforms"].values())
+    print("[PASS] Schedule survives a restart")
+
+def test_remove_during_reschedule_sticks():
+    """A query removed while a finished run is being rescheduled stays removed after a restart"""
+    fakes = FakePlatforms(delay=0)
+
+    def test(path):
+        watchlist = Watchlist(path, platforms=["Amazon"], jitter=0, history=HistoryStore(enabled=False))
+        watchlist.add("phone", interval=60)
+        save_run = watchlist._save_run
+        removers = []
+
+        def slow_save_run(item):
+            # Try to remove the query between scheduling the next run and writing it
+            remover = threading.Thread(target=watchlist.remove, args=("phone",))
+            remover.start()
+            removers.append(remover)
+            time.sleep(0.1)
+            save_run(item)
+
+        watchlist._save_run = slow_save_run
+        watchlist.start()
+        time.sleep(0.2)
+        watchlist.stop()
+        for remover in removers:
+            remover.join()
+        return watchlist.items(), Watchlist(path, platforms=["Amazon"], history=HistoryStore(enabled=False)).items()
+
+    before, after = _in_database(fakes, test)
+    assert fakes.calls["Amazon"] == 1
+    assert before == [] and after == []
+    print("[PASS] Remove during a reschedule is not undone")
+
+def test_tracker_picks_up_other_workers_changes():
+    """Queries added or removed through a worker without the tracker reach the tracker"""
+    fakes = FakePlatforms(delay=0)
+
+    def test(path):
+        tracker = Watchlist(path, platforms=["Amazon"], jitter=0, sync_interval=0.05,
+                            history=HistoryStore(enabled=False))
+        other = Watchlist(path, platforms=["Amazon"], jitter=0, sync_interval=0.05,
+                          history=HistoryStore(enabled=False))
+        tracker.start()
+        other.add("phone", interval=60)
+        time.sleep(0.3)
+        scraped = fakes.calls.get("Amazon", 0)
+        listed = other.items()
+        other.remove("phone")
+        time.sleep(0.15)
+        tracked = tracker.stats()["queries"]
+        tracker.stop()
+        return scraped, listed, tracked
+
+    scraped, listed, tracked = _in_database(fakes, test)
+    assert scraped == 1
+    # The other worker sees the tracker's run
+    assert listed[0]["platforms"]["Amazon"]["last_ok"] is True
+    assert tracked == 0
+    print("[PASS] Tracker follows changes made by other workers")
+
+def test_reads_sync_at_most_every_interval():
+    """items() and stats() re-read the table only once the sync interval has passed"""
+    fakes = FakePlatforms(delay=0)
+
+    def test(path):
+        other = Watchlist(path, platforms=["Amazon"], history=HistoryStore(enabled=False))
+        other.add("tablet", interval=60)
+        watchlist = Watchlist(path, platforms=["Amazon"], sync_interval=60, history=HistoryStore(enabled=False))
+        syncs = []
+        sync = watchlist.sync
+        watchlist.sync = lambda: syncs.append(1) or sync()
+        other.add("phone", interval=60)
+        for _ in range(20):
+            watchlist.items()
+            watchlist.stats()
+        before = watchlist.stats()["queries"]
+        watchlist._synced_at -= 61
+        after = watchlist.stats()["queries"]
+        return len(syncs), before, after
+
+    syncs, before, after = _in_database(fakes, test)
+    # Synced when created, then not again until the interval passed
+    assert syncs == 1 and before == 1 and after == 2
+    print("[PASS] Reads sync at most once per interval")
+
+def test_stop_while_dispatching():
+    """A dispatcher that outlives stop()'s join leaves its item scheduled instead of failing"""
+    fakes = FakePlatforms(delay=0)
+
+    def test(path):
+        watchlist = Watchlist(path, platforms=["Amazon"], jitter=0, history=HistoryStore(enabled=False))
+        watchlist.add("phone", interval=60)
+        next_due = watchlist._next_due
+        stopped = threading.Event()
+
+        def slow_next_due(platform):
+            item = next_due(platform)
+            if item is not None:
+                stopped.wait(2)
+            return item
+
+        watchlist._next_due = slow_next_due
+        errors = []
+        saved_hook = threading.excepthook
+        threading.excepthook = lambda args: errors.append(args.exc_value)
+        try:
+            watchlist.start()
+            threads = list(watchlist._threads)
+            time.sleep(0.1)
+            watchlist.stop(timeout=0.05)
+            stopped.set()
+            for thread in threads:
+                thread.join(2)
+        finally:
+            threading.excepthook = saved_hook
+        return errors, watchlist.stats()
+
+    errors, stats = _in_database(fakes, test)
+    assert errors == []
+    assert fakes.calls == {}
+    assert stats["queries"] == 1 and stats["platforms"]["Amazon"]["in_flight"] == 0
+    assert stats["platforms"]["Amazon"]["overdue"] == 1
+    print("[PASS] stop() during a dispatch is clean")
+
+def test_watchlist_routes():
+    """/watchlist adds, lists and removes tracked queries"""
+    import backend.app as app_module
+    import watchlist as watchlist_module
+
+    with tempfile.TemporaryDirectory() as directory:
+        saved = watchlist_module._watchlist
+        watchlist_module._watchlist = Watchlist(os.path.join(directory, "watchlist.db"),
+                                                history=HistoryStore(enabled=False))
+        try:
+            with app_module.app.test_client() as client:
+                added = client.post('/watchlist', json={"query": "iPhone 15", "interval": 600})
+                assert client.post('/watchlist', json={"query": "x", "interval": -1}).status_code == 400
+                listed = client.get('/watchlist').get_json()
+                stats = client.get('/stats/watchlist').get_json()
+                assert client.delete('/watchlist?query=iphone%2015').status_code == 200
+                assert client.delete('/watchlist?query=iphone%2015').status_code == 404
+        finally:
+            watchlist_module._watchlist = saved
+
+    assert added.status_code == 201 and added.get_json()["query"] == "iphone 15"
+    assert listed[0]["query"] == "iPhone 15" and listed[0]["interval"] == 600
+    assert stats["queries"] == 1 and stats["platforms"]["Flipkart"]["overdue"] == 1
+    print("[PASS] /watchlist routes")
+
+if __name__ == "__main__":
+    test_schedule_respects_concurrency()
+    test_failures_back_off()
+    test_schedule_survives_restart()
+    test_remove_during_reschedule_sticks()
+    test_tracker_picks_up_other_workers_changes()
+    test_reads_sync_at_most_every_interval()
+    test_stop_while_dispatching()
+    test_watchlist_routes()